@@ -0,0 +1,4 @@
+"""
+效能基準測試套件
+以 `python -m benchmarks.<模組>` 從專案根目錄執行
+"""
@@ -0,0 +1,76 @@
+"""
+投影片配置基準測試 - 比較逐張 add_slide 與批次配置的擴展性
+
+用法:
+    python -m benchmarks.allocation_benchmark --sizes 1000,2000,5000,10000
+"""
+
+import argparse
+import logging
+import time
+from typing import Dict, Any
+
+from format_handler import FormatHandler
+from slide_manager import SlideManager
+from template_compiler import TemplateCompiler
+from document_parser import PowerPointDocumentParser
+
+
+def run_allocation_benchmark(template_file: str, slide_count: int, method: str) -> Dict[str, Any]:
+    """
+    配置指定數量的空白投影片並計時
+
+    Args:
+        template_file: PowerPoint 模板路徑
+        slide_count: 投影片數量
+        method: 'add_slide'（逐張加入）或 'bulk'（SlideManager.allocate_slides）
+
+    Returns:
+        Dict: 配置耗時
+    """
+    logger = logging.getLogger('benchmark')
+    format_handler = FormatHandler(logger)
+    slide_manager = SlideManager(format_handler, logger)
+    compiler = TemplateCompiler(PowerPointDocumentParser(format_handler, logger), format_handler, logger)
+
+    prs = compiler.compile(template_file).load_presentation()
+    layout = prs.slides[0].slide_layout
+
+    start = time.perf_counter()
+    if method == 'bulk':
+        slide_manager.allocate_slides(prs, layout, slide_count)
+    else:
+        for _ in range(slide_count):
+            prs.slides.add_slide(layout)
+    elapsed = time.perf_counter() - start
+
+    return {
+        'method': method,
+        'slides': slide_count,
+        'seconds': elapsed,
+        'per_slide_us': elapsed / slide_count * 1_000_000 if slide_count else 0.0
+    }
+
+
+def main():
+    """命令列入口"""
+    parser = argparse.ArgumentParser(description="投影片配置基準測試")
+    parser.add_argument('--template', default='證道資料.pptx', help="PowerPoint 模板路徑")
+    parser.add_argument('--sizes', default='1000,2000,5000,10000', help="投影片數量（逗號分隔）")
+    parser.add_argument('--add-slide-max', type=int, default=2000,
+                        help="逐張 add_slide 的最大測試數量（平方成長，過大會很慢）")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    print(f"📊 投影片配置擴展性: {args.template}")
+    for size in [int(value) for value in args.sizes.split(',')]:
+        methods = ['bulk'] if size > args.add_slide_max else ['add_slide', 'bulk']
+        for method in methods:
+            result = run_allocation_benchmark(args.template, size, method)
+            print(f"   {size:>6} 張 {result['method']:>9}: {result['seconds']:.2f} 秒 "
+                  f"({result['per_slide_us']:.0f} µs/張)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+投影片複製基準測試 - 比較 XML 複製與逐一形狀重建的效能
+
+用法:
+    python -m benchmarks.clone_benchmark --slides 1000 --template 證道資料.pptx
+"""
+
+import argparse
+import io
+import logging
+import time
+from typing import Dict, Any
+
+from format_handler import FormatHandler
+from slide_manager import SlideManager
+from template_compiler import TemplateCompiler
+from document_parser import PowerPointDocumentParser
+
+
+def run_clone_benchmark(template_file: str, slide_count: int, clone_mode: str) -> Dict[str, Any]:
+    """
+    以指定方式複製模板第一張投影片並計時
+
+    Args:
+        template_file: PowerPoint 模板路徑
+        slide_count: 要產生的投影片數
+        clone_mode: 'xml' 或 'shape'
+
+    Returns:
+        Dict: 複製與保存耗時
+    """
+    logger = logging.getLogger('benchmark')
+    format_handler = FormatHandler(logger)
+    slide_manager = SlideManager(format_handler, logger, clone_mode)
+    compiler = TemplateCompiler(PowerPointDocumentParser(format_handler, logger), format_handler, logger)
+
+    prs = compiler.compile(template_file).load_presentation()
+    template_slide = prs.slides[0]
+    layout = template_slide.slide_layout
+
+    start = time.perf_counter()
+    for _ in range(slide_count):
+        new_slide = prs.slides.add_slide(layout)
+        slide_manager._copy_slide_completely(template_slide, new_slide)
+    clone_time = time.perf_counter() - start
+
+    output = io.BytesIO()
+    start = time.perf_counter()
+    prs.save(output)
+    save_time = time.perf_counter() - start
+
+    return {
+        'clone_mode': clone_mode,
+        'slides': slide_count,
+        'clone_seconds': clone_time,
+        'per_slide_ms': clone_time / slide_count * 1000 if slide_count else 0.0,
+        'save_seconds': save_time,
+        'output_bytes': output.tell()
+    }
+
+
+def main():
+    """命令列入口"""
+    parser = argparse.ArgumentParser(description="投影片複製基準測試")
+    parser.add_argument('--template', default='證道資料.pptx', help="PowerPoint 模板路徑")
+    parser.add_argument('--slides', type=int, default=1000, help="產生的投影片數")
+    parser.add_argument('--modes', default='shape,xml', help="要比較的複製方式（逗號分隔）")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    print(f"📊 複製 {args.slides} 張投影片: {args.template}")
+    for clone_mode in args.modes.split(','):
+        result = run_clone_benchmark(args.template, args.slides, clone_mode.strip())
+        print(f"   {result['clone_mode']:>5}: 複製 {result['clone_seconds']:.2f} 秒 "
+              f"({result['per_slide_ms']:.2f} ms/張), 保存 {result['save_seconds']:.2f} 秒, "
+              f"{result['output_bytes'] / 1024 / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+匯入時間檢查 - 以 `python -X importtime` 量測各模組的匯入成本
+
+每個模組在全新的直譯器中匯入，檢查：
+  * 沒有在匯入時載入 python-pptx / python-docx / lxml
+  * 匯入時沒有建立 logs/ 等檔案
+  * 累計匯入時間不超過空直譯器（python -c pass）啟動匯入時間的倍數
+
+匯入時間以相對於同一台機器上空直譯器的倍數比較，不受機器快慢影響；
+需要絕對預算時可另外指定 --budget-ms。
+
+用法:
+    python -m benchmarks.import_benchmark --max-ratio 20
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Any, Optional
+
+
+# 要檢查的模組（匯入時不應有副作用）
+MODULES = ('logger_config', 'tracing', 'metrics', 'format_handler', 'section_rules', 'section_store',
+           'document_io', 'document_parser', 'parse_cache', 'package_writer', 'incremental', 'render_plan',
+           'slide_cloner', 'slide_manager', 'template_compiler', 'document_converter')
+
+# 匯入時不應載入的重量級相依套件
+FORBIDDEN_IMPORTS = ('pptx', 'docx', 'lxml')
+
+# 模組累計匯入時間相對於空直譯器啟動匯入時間的倍數上限
+# （載入 python-pptx + lxml 約為數十倍，遠超過此上限）
+DEFAULT_MAX_RATIO = 20.0
+DEFAULT_RUNS = 5
+
+
+def _subprocess_env() -> Dict[str, str]:
+    """可匯入專案模組的環境變數"""
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [project_root, env.get('PYTHONPATH')]))
+    return env
+
+
+def measure_baseline(runs: int = DEFAULT_RUNS) -> float:
+    """
+    量測空直譯器（python -c pass）啟動時的匯入時間
+
+    Args:
+        runs: 量測次數（取最小值）
+
+    Returns:
+        float: 最外層模組累計匯入時間的總和（毫秒）
+    """
+    env = _subprocess_env()
+    timings = []
+    for _ in range(runs):
+        completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'pass'],
+                                   env=env, capture_output=True, text=True, check=True)
+        timings.append(_top_level_total(completed.stderr))
+    return min(timings) / 1000.0
+
+
+def measure_import(module: str, runs: int = DEFAULT_RUNS) -> Dict[str, Any]:
+    """
+    在全新直譯器中匯入模組並量測
+
+    Args:
+        module: 模組名稱
+        runs: 量測次數（取最小值）
+
+    Returns:
+        Dict: 累計匯入時間（毫秒）、載入的禁止套件與匯入時建立的檔案
+    """
+    env = _subprocess_env()
+
+    timings = []
+    imported: List[str] = []
+    created: List[str] = []
+
+    for _ in range(runs):
+        # 在空目錄中執行，才能發現匯入時建立的檔案或目錄
+        with tempfile.TemporaryDirectory(prefix='import_check_') as work_dir:
+            completed = subprocess.run(
+                [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                cwd=work_dir, env=env, capture_output=True, text=True)
+            if completed.returncode != 0:
+                raise RuntimeError(f"匯入 {module} 失敗:\n{completed.stderr}")
+
+            created = sorted(os.listdir(work_dir))
+            module_time, imported = _parse_importtime(completed.stderr, module)
+            if module_time is not None:
+                timings.append(module_time)
+
+    return {
+        'module': module,
+        'import_ms': min(timings) / 1000.0 if timings else 0.0,
+        'forbidden': sorted({name.split('.')[0] for name in imported
+                             if name.split('.')[0] in FORBIDDEN_IMPORTS}),
+        'created_files': created
+    }
+
+
+def _top_level_total(stderr: str) -> int:
+    """-X importtime 輸出中最外層模組的累計時間總和（微秒）"""
+    total = 0
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # 巢狀匯入的名稱前有額外縮排
+        if not name[1:].startswith(' '):
+            total += int(cumulative)
+    return total
+
+
+def _parse_importtime(stderr: str, module: str):
+    """
+    解析 -X importtime 的輸出
+
+    Returns:
+        Tuple: (模組的累計時間（微秒）, 所有被匯入的模組名稱)
+    """
+    module_time: Optional[int] = None
+    imported = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        name = name.strip()
+        imported.append(name)
+        if name == module:
+            module_time = int(cumulative)
+    return module_time, imported
+
+
+def check_imports(modules: List[str], max_ratio: float = DEFAULT_MAX_RATIO, runs: int = DEFAULT_RUNS,
+                  budget_ms: Optional[float] = None, baseline_ms: Optional[float] = None) -> List[Dict[str, Any]]:
+    """
+    檢查多個模組的匯入成本
+
+    Args:
+        modules: 模組名稱列表
+        max_ratio: 累計匯入時間相對於空直譯器啟動匯入時間的倍數上限
+        runs: 每個模組的量測次數
+        budget_ms: 額外的絕對預算（毫秒，None 則不檢查）
+        baseline_ms: 空直譯器的啟動匯入時間（None 則自動量測）
+
+    Returns:
+        List[Dict]: 每個模組的量測結果（ratio 為相對倍數，problems 列出未通過的項目）
+    """
+    if baseline_ms is None:
+        baseline_ms = measure_baseline(runs)
+
+    results = []
+    for module in modules:
+        result = measure_import(module, runs)
+        result['ratio'] = result['import_ms'] / baseline_ms if baseline_ms > 0 else 0.0
+        problems = []
+        if result['forbidden']:
+            problems.append(f"匯入時載入了 {', '.join(result['forbidden'])}")
+        if result['created_files']:
+            problems.append(f"匯入時建立了 {', '.join(result['created_files'])}")
+        if result['ratio'] > max_ratio:
+            problems.append(f"匯入時間為空直譯器的 {result['ratio']:.1f} 倍，超過上限 {max_ratio:.0f} 倍")
+        if budget_ms is not None and result['import_ms'] > budget_ms:
+            problems.append(f"匯入時間 {result['import_ms']:.1f}ms 超過預算 {budget_ms:.0f}ms")
+        result['problems'] = problems
+        results.append(result)
+    return results
+
+
+def main():
+    """命令列入口"""
+    parser = argparse.ArgumentParser(description="模組匯入時間檢查")
+    parser.add_argument('--modules', default=','.join(MODULES), help="要檢查的模組（逗號分隔）")
+    parser.add_argument('--max-ratio', type=float, default=DEFAULT_MAX_RATIO,
+                        help="累計匯入時間相對於空直譯器啟動匯入時間的倍數上限")
+    parser.add_argument('--budget-ms', type=float, default=None,
+                        help="額外的絕對匯入時間預算（毫秒，預設不檢查）")
+    parser.add_argument('--runs', type=int, default=DEFAULT_RUNS, help="量測次數（取最小值）")
+    args = parser.parse_args()
+
+    modules = [module.strip() for module in args.modules.split(',') if module.strip()]
+    baseline_ms = measure_baseline(args.runs)
+    results = check_imports(modules, args.max_ratio, args.runs, args.budget_ms, baseline_ms)
+
+    print(f"📊 模組匯入時間 (空直譯器 {baseline_ms:.1f}ms, 上限 {args.max_ratio:.0f} 倍, "
+          f"{args.runs} 次取最小值)")
+    for result in results:
+        status = '❌' if result['problems'] else '✅'
+        print(f"   {status} {result['module']:<20} {result['import_ms']:7.1f} ms "
+              f"({result['ratio']:5.1f} 倍)")
+        for problem in result['problems']:
+            print(f"      - {problem}")
+
+    failed = [result for result in results if result['problems']]
+    if failed:
+        print(f"\n❌ {len(failed)} 個模組未通過匯入檢查")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+章節切分基準測試 - 比較規則引擎與原本單一「N.」正則表達式的切分速度
+
+以合成段落（約一成為章節標題）重複切分，確認：
+  * 預設規則集的切分結果與原本的正則表達式完全相同
+  * 預設規則集與全部內建規則的速度不比原本慢超過門檻
+
+用法:
+    python -m benchmarks.section_rules_benchmark --paragraphs 200000 --threshold 0.15
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from typing import Dict, List, Any, Tuple
+
+from document_parser import SectionBuilder
+from section_rules import SectionRuleSet
+
+
+LEGACY_PATTERN = re.compile(r'^(\d+)\.\s*(.*)')
+
+DEFAULT_PARAGRAPHS = 200000
+DEFAULT_REPEATS = 5
+DEFAULT_THRESHOLD = 0.15
+
+WORDS = ('神', '恩典', '信心', '禱告', '聖經', '教會', '弟兄姊妹', '愛', '盼望', '喜樂')
+
+
+def generate_paragraphs(count: int, seed: int = 0) -> List[Tuple[str, str]]:
+    """
+    產生合成段落（約一成為「N. 標題」，其餘為內文）
+
+    Returns:
+        List[Tuple]: (段落文本, 段落樣式)
+    """
+    rng = random.Random(seed)
+    paragraphs = []
+    number = 0
+    for index in range(count):
+        text = ''.join(rng.choice(WORDS) for _ in range(rng.randint(5, 30))) + '。'
+        if index % 10 == 0:
+            number += 1
+            text = f"{number}. {text}"
+        paragraphs.append((text, 'Normal'))
+    return paragraphs
+
+
+def split_sections(rules, paragraphs: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+    """以 SectionBuilder 切分章節"""
+    builder = SectionBuilder(rules)
+    sections = []
+    empty_formatting: List[Dict[str, Any]] = []
+    for text, style in paragraphs:
+        completed = builder.add(text, empty_formatting, style)
+        if completed is not None:
+            sections.append(completed)
+    last_section = builder.finish()
+    if last_section is not None:
+        sections.append(last_section)
+    return sections
+
+
+def time_split(rules, paragraphs: List[Tuple[str, str]], repeats: int) -> float:
+    """重複切分並返回最短時間（秒）"""
+    durations = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        split_sections(rules, paragraphs)
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+def run_benchmark(paragraph_count: int, repeats: int) -> Dict[str, Any]:
+    """
+    執行章節切分基準測試
+
+    Args:
+        paragraph_count: 段落數
+        repeats: 重複次數（取最小值）
+
+    Returns:
+        Dict: 各規則集的時間與結果是否一致
+    """
+    paragraphs = generate_paragraphs(paragraph_count)
+    candidates = {
+        'legacy_pattern': LEGACY_PATTERN,
+        'default_rules': SectionRuleSet(),
+        'all_builtin_rules': SectionRuleSet.all_builtin(heading_styles=('Heading 1',))
+    }
+
+    baseline_sections = split_sections(LEGACY_PATTERN, paragraphs)
+    results = {}
+    for name, rules in candidates.items():
+        results[name] = {
+            'seconds': time_split(rules, paragraphs, repeats),
+            'identical': split_sections(rules, paragraphs) == baseline_sections
+        }
+
+    return {'paragraphs': paragraph_count, 'sections': len(baseline_sections), 'results': results}
+
+
+def main():
+    """命令列入口"""
+    parser = argparse.ArgumentParser(description="章節切分規則引擎基準測試")
+    parser.add_argument('--paragraphs', type=int, default=DEFAULT_PARAGRAPHS, help="段落數")
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS, help="重複次數（取最小值）")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="相對原本正則表達式容許的變慢比例（預設 0.15）")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.paragraphs, args.repeats)
+    baseline = report['results']['legacy_pattern']['seconds']
+
+    print(f"📊 章節切分 ({report['paragraphs']} 段落, {report['sections']} 章節, "
+          f"重複 {args.repeats} 次取最小值)")
+    failures = []
+    for name, result in report['results'].items():
+        ratio = result['seconds'] / baseline if baseline > 0 else 1.0
+        slow = ratio > 1 + args.threshold
+        status = '❌' if slow or not result['identical'] else '✅'
+        print(f"   {status} {name:<20} {result['seconds']:8.3f} 秒 ({ratio:.2f}x)"
+              f"{'' if result['identical'] else '  結果不一致'}")
+        if slow or not result['identical']:
+            failures.append(name)
+
+    if failures:
+        print(f"\n❌ {len(failures)} 個規則集未通過")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
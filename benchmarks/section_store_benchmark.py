@@ -0,0 +1,116 @@
+"""
+欄式章節儲存基準測試 - 比較 dict 結構與 DocumentStore 的常駐記憶體
+
+以合成的大型證道文件解析一次，再分別量測：
+  * 原本的 dict 結構（段落與章節共用每段落的運行格式列表）
+  * DocumentStore（單一文字緩衝區 + 陣列 + 樣式表）
+並確認兩者內容相同。
+
+用法:
+    python -m benchmarks.section_store_benchmark --sections 2000
+"""
+
+import argparse
+import gc
+import os
+import pickle
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, List, Any
+
+from benchmarks.synthetic import generate_word_document
+
+
+def build_dict_representation(store) -> Dict[str, List[Dict[str, Any]]]:
+    """由 DocumentStore 還原原本的 dict 結構（段落與章節共用格式列表）"""
+    paragraphs = store.paragraphs.to_dicts()
+    sections = []
+    for index in range(store.section_count()):
+        start = store.section_paragraph_start[index]
+        end = store.section_paragraph_start[index + 1]
+        sections.append({
+            'number': store.section_number[index],
+            'title': store.section_title(index),
+            'content': store.section_content(index),
+            'text_only': store.section_text_only(index),
+            'formatting': [paragraphs[p]['formatting'] for p in range(start, end)]
+        })
+    return {'paragraphs': paragraphs, 'sections': sections}
+
+
+def measure_allocation(factory) -> Any:
+    """量測 factory() 建立的物件所佔用的記憶體（位元組）"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    value = factory()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return value, after - before
+
+
+def run_benchmark(sections: int, paragraphs_per_section: int, runs_per_paragraph: int) -> Dict[str, Any]:
+    """
+    執行欄式儲存基準測試
+
+    Args:
+        sections: 合成文件的章節數
+        paragraphs_per_section: 每章節的內文段落數
+        runs_per_paragraph: 每段落的運行數
+
+    Returns:
+        Dict: 兩種結構的記憶體用量、讀取時間與內容是否相同
+    """
+    from document_parser import WordDocumentParser
+    from format_handler import FormatHandler
+
+    with tempfile.TemporaryDirectory(prefix='section_store_') as work_dir:
+        word_file = os.path.join(work_dir, 'sermon.docx')
+        generate_word_document(word_file, sections, paragraphs_per_section, runs_per_paragraph)
+        result = WordDocumentParser(FormatHandler()).parse_document(word_file)
+
+    store = result['sections'].store
+    blob = pickle.dumps(store, protocol=pickle.HIGHEST_PROTOCOL)
+
+    dicts, dict_bytes = measure_allocation(lambda: build_dict_representation(store))
+    restored, store_bytes = measure_allocation(lambda: pickle.loads(blob))
+
+    start = time.perf_counter()
+    for section in restored.sections:
+        section['formatting']
+    materialize_seconds = time.perf_counter() - start
+
+    return {
+        'sections': store.section_count(),
+        'stats': store.get_stats(),
+        'dict_bytes': dict_bytes,
+        'store_bytes': store_bytes,
+        'materialize_seconds': materialize_seconds,
+        'identical': restored.sections == dicts['sections'] and restored.paragraphs == dicts['paragraphs']
+    }
+
+
+def main():
+    """命令列入口"""
+    parser = argparse.ArgumentParser(description="欄式章節儲存記憶體基準測試")
+    parser.add_argument('--sections', type=int, default=2000, help="章節數")
+    parser.add_argument('--paragraphs-per-section', type=int, default=3, help="每章節的內文段落數")
+    parser.add_argument('--runs-per-paragraph', type=int, default=4, help="每段落的運行數")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.sections, args.paragraphs_per_section, args.runs_per_paragraph)
+    stats = report['stats']
+
+    print(f"📊 欄式章節儲存 ({report['sections']} 章節, {stats['paragraphs']} 段落, "
+          f"{stats['runs']} 運行, {stats['run_styles']} 種運行格式)")
+    print(f"   dict 結構:      {report['dict_bytes'] / 1024:10.1f} KB")
+    print(f"   DocumentStore:  {report['store_bytes'] / 1024:10.1f} KB "
+          f"({report['store_bytes'] / max(report['dict_bytes'], 1):.1%})")
+    print(f"   建立所有章節格式檢視: {report['materialize_seconds'] * 1000:.1f} ms")
+    print(f"   內容一致: {'✅' if report['identical'] else '❌'}")
+
+
+if __name__ == "__main__":
+    main()
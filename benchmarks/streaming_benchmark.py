@@ -0,0 +1,134 @@
+"""
+串流輸出基準測試 - 比較保存前保留所有投影片與逐張串流寫入的記憶體用量
+
+以合成的證道文件與模板，在不同章節數下分別以一般與串流模式轉換，
+每次轉換在獨立的子程序中執行並回報常駐記憶體峰值，最後確認兩種模式的投影片內容相同。
+Linux 的子程序會沿用父程序的記憶體峰值，因此合成文件也在子程序中產生，主程序保持精簡。
+使用串流 Word 解析器，避免解析階段的記憶體峰值掩蓋投影片階段的差異。
+
+用法:
+    python -m benchmarks.streaming_benchmark --sizes 1000,5000,20000
+"""
+
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import zipfile
+from typing import Dict, Any
+
+from benchmarks.synthetic import generate_word_document, generate_template
+
+
+def convert_once(word_file: str, template_file: str, output_file: str, streaming: bool) -> Dict[str, Any]:
+    """
+    在目前的程序中轉換一次（由子程序呼叫）
+
+    Returns:
+        Dict: 投影片數、耗時與常駐記憶體峰值（位元組）
+    """
+    from document_converter import DocumentConverter
+
+    logging.disable(logging.WARNING)
+    converter = DocumentConverter(logger_level='ERROR', log_to_file=False, word_parser_type='word_stream')
+    result = converter.convert_document(word_file, template_file, output_file, streaming=streaming)
+    if not result['success']:
+        raise RuntimeError(result['error'])
+
+    metrics = result['metrics']
+    return {
+        'slides': result['slides_created'],
+        'seconds': metrics['wall_time'],
+        'peak_rss_bytes': metrics['peak_rss_bytes']
+    }
+
+
+def run_module(arguments) -> str:
+    """以子程序執行此模組，返回標準輸出的最後一行"""
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [project_root, env.get('PYTHONPATH')]))
+
+    completed = subprocess.run([sys.executable, '-m', 'benchmarks.streaming_benchmark'] + list(arguments),
+                               cwd=project_root, env=env, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"子程序執行失敗:\n{completed.stderr}")
+    lines = completed.stdout.strip().splitlines()
+    return lines[-1] if lines else ''
+
+
+def run_streaming_benchmark(word_file: str, template_file: str, output_file: str,
+                            streaming: bool) -> Dict[str, Any]:
+    """
+    在獨立的子程序中轉換一次
+
+    Args:
+        word_file: Word 檔案路徑
+        template_file: PowerPoint 模板路徑
+        output_file: 輸出路徑
+        streaming: 是否串流輸出
+
+    Returns:
+        Dict: 投影片數、耗時與常駐記憶體峰值（位元組）
+    """
+    arguments = ['--worker', word_file, template_file, output_file]
+    if streaming:
+        arguments.append('--streaming')
+    return json.loads(run_module(arguments))
+
+
+def read_slide_parts(pptx_file: str) -> Dict[str, bytes]:
+    """輸出檔中所有投影片部件與其關聯的內容"""
+    with zipfile.ZipFile(pptx_file) as archive:
+        return {name: archive.read(name) for name in archive.namelist()
+                if name.startswith('ppt/slides/')}
+
+
+def main():
+    """命令列入口"""
+    parser = argparse.ArgumentParser(description="串流輸出記憶體基準測試")
+    parser.add_argument('--sizes', default='1000,5000', help="章節數（逗號分隔）")
+    parser.add_argument('--paragraphs-per-section', type=int, default=3, help="每章節的內文段落數")
+    parser.add_argument('--runs-per-paragraph', type=int, default=4, help="每段落的運行數")
+    parser.add_argument('--worker', nargs=3, metavar=('WORD', 'TEMPLATE', 'OUTPUT'), help=argparse.SUPPRESS)
+    parser.add_argument('--streaming', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--generate', nargs=2, metavar=('WORD', 'SECTIONS'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(convert_once(*args.worker, args.streaming)))
+        return
+    if args.generate:
+        generate_word_document(args.generate[0], int(args.generate[1]),
+                               args.paragraphs_per_section, args.runs_per_paragraph)
+        return
+
+    with tempfile.TemporaryDirectory(prefix='streaming_') as work_dir:
+        template_file = os.path.join(work_dir, 'template.pptx')
+        generate_template(template_file)
+
+        print("📊 串流輸出常駐記憶體峰值")
+        for size in [int(value) for value in args.sizes.split(',')]:
+            word_file = os.path.join(work_dir, f'sermon_{size}.docx')
+            run_module(['--generate', word_file, str(size),
+                        '--paragraphs-per-section', str(args.paragraphs_per_section),
+                        '--runs-per-paragraph', str(args.runs_per_paragraph)])
+
+            outputs = {}
+            for streaming in (False, True):
+                output_file = os.path.join(work_dir, f'out_{size}_{int(streaming)}.pptx')
+                result = run_streaming_benchmark(word_file, template_file, output_file, streaming)
+                outputs[streaming] = output_file
+                label = '串流' if streaming else '一般'
+                print(f"   {size:>6} 章節 {label}: {result['peak_rss_bytes'] / 1024 / 1024:8.1f} MB, "
+                      f"{result['seconds']:.2f} 秒 ({result['slides']} 張)")
+
+            identical = read_slide_parts(outputs[False]) == read_slide_parts(outputs[True])
+            print(f"   {size:>6} 章節 投影片內容一致: {'✅' if identical else '❌'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+"""
+轉換基準測試套件 - 以合成資料比較新舊轉換流程並保存歷史紀錄
+
+用法:
+    python -m benchmarks.suite --sizes small,medium --repeats 3
+    python -m benchmarks.suite --compare --threshold 0.15
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Callable
+
+from benchmarks.synthetic import generate_word_document, generate_template
+from parse_cache import CACHE_DIR_ENV
+
+
+DEFAULT_HISTORY_FILE = os.path.join('benchmarks', 'history.json')
+DEFAULT_THRESHOLD = 0.10
+
+# 文件大小設定：章節數、每章節段落數、每段落運行數、表格數
+SIZES = {
+    'small': {'sections': 20, 'paragraphs_per_section': 2, 'runs_per_paragraph': 3, 'tables': 1},
+    'medium': {'sections': 100, 'paragraphs_per_section': 3, 'runs_per_paragraph': 4, 'tables': 5},
+    'large': {'sections': 400, 'paragraphs_per_section': 4, 'runs_per_paragraph': 6, 'tables': 20}
+}
+
+# 模板設定：文本框數、圖片數、圖片邊長
+TEMPLATES = {
+    'simple': {'text_shapes': 1, 'images': 1, 'image_size': 256},
+    'rich': {'text_shapes': 3, 'images': 3, 'image_size': 1024}
+}
+
+
+Runner = Callable[[str, str, str], Dict[str, Any]]
+
+
+def _converter_runner(work_dir: str) -> Runner:
+    """新架構：DocumentConverter（使用工作目錄內獨立的解析快取）"""
+    from document_converter import DocumentConverter
+    from parse_cache import ParseCache
+    parse_cache = ParseCache(os.path.join(work_dir, 'parse_cache'))
+    converter = DocumentConverter(logger_level="WARNING", log_to_file=False, parse_cache=parse_cache)
+
+    def run(word_file: str, template_file: str, output_file: str) -> Dict[str, Any]:
+        # 每次都重新解析，避免量到解析快取命中
+        parse_cache.clear()
+        return converter.convert_document(word_file, template_file, output_file)
+    return run
+
+
+def _legacy_converter_runner(work_dir: str) -> Runner:
+    """舊版：word_to_ppt_converter.convert_word_to_ppt"""
+    import word_to_ppt_converter
+    return word_to_ppt_converter.convert_word_to_ppt
+
+
+def _word_reader_runner(work_dir: str) -> Runner:
+    """舊版：word_reader.replace_slides_with_word_sections"""
+    import word_reader
+    return word_reader.replace_slides_with_word_sections
+
+
+# 實作名稱 -> 以工作目錄建立執行函數 (word_file, template_file, output_file) -> 結果
+IMPLEMENTATIONS: Dict[str, Callable[[str], Runner]] = {
+    'converter': _converter_runner,
+    'legacy_converter': _legacy_converter_runner,
+    'word_reader': _word_reader_runner
+}
+
+
+def run_suite(sizes: List[str], templates: List[str], implementations: List[str],
+              repeats: int = 3, work_dir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    執行基準測試套件
+
+    Args:
+        sizes: 文件大小名稱（見 SIZES）
+        templates: 模板名稱（見 TEMPLATES）
+        implementations: 要測試的實作（見 IMPLEMENTATIONS）
+        repeats: 每個組合的重複次數（取最小值作為結果）
+        work_dir: 合成檔案目錄（None 則使用暫存目錄）
+
+    Returns:
+        Dict: 一次執行的紀錄（環境資訊與各組合結果）
+    """
+    with contextlib.ExitStack() as stack:
+        if work_dir is None:
+            work_dir = stack.enter_context(tempfile.TemporaryDirectory(prefix='ppt_bench_'))
+        os.makedirs(work_dir, exist_ok=True)
+        # 其他程式碼建立的解析快取也使用獨立目錄，結束時還原環境變數
+        stack.callback(_restore_env, CACHE_DIR_ENV, os.environ.get(CACHE_DIR_ENV))
+        os.environ[CACHE_DIR_ENV] = os.path.join(work_dir, 'parse_cache')
+
+        runners = {implementation: IMPLEMENTATIONS[implementation](work_dir)
+                   for implementation in implementations}
+        results = []
+        for template_name in templates:
+            template_file = os.path.join(work_dir, f"template_{template_name}.pptx")
+            generate_template(template_file, **TEMPLATES[template_name])
+
+            for size in sizes:
+                word_file = os.path.join(work_dir, f"sermon_{size}.docx")
+                if not os.path.exists(word_file):
+                    generate_word_document(word_file, **SIZES[size])
+
+                for implementation in implementations:
+                    output_file = os.path.join(work_dir, f"out_{implementation}_{size}_{template_name}.pptx")
+                    results.append(_time_implementation(
+                        implementation, runners[implementation], size, template_name, word_file,
+                        template_file, output_file, repeats))
+
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeats': repeats,
+        'results': results
+    }
+
+
+def _restore_env(name: str, value: Optional[str]):
+    """還原環境變數（原本不存在時刪除）"""
+    if value is None:
+        os.environ.pop(name, None)
+    else:
+        os.environ[name] = value
+
+
+def _time_implementation(implementation: str, run: Runner, size: str, template_name: str,
+                         word_file: str, template_file: str, output_file: str,
+                         repeats: int) -> Dict[str, Any]:
+    """重複執行單一組合並計時"""
+    durations = []
+    outcome: Dict[str, Any] = {}
+
+    for _ in range(repeats):
+        start = time.perf_counter()
+        # 舊版函數會直接 print，基準測試時不顯示
+        with contextlib.redirect_stdout(io.StringIO()):
+            outcome = run(word_file, template_file, output_file)
+        durations.append(time.perf_counter() - start)
+
+    return {
+        'implementation': implementation,
+        'size': size,
+        'template': template_name,
+        'sections': SIZES[size]['sections'],
+        'success': bool(outcome.get('success')),
+        'slides': outcome.get('slides_created', outcome.get('total_slides_created')),
+        'seconds': min(durations),
+        'mean': statistics.mean(durations),
+        'output_bytes': os.path.getsize(output_file) if os.path.exists(output_file) else None
+    }
+
+
+def result_key(result: Dict[str, Any]) -> str:
+    """結果的比較鍵（實作/大小/模板）"""
+    return f"{result['implementation']}/{result['size']}/{result['template']}"
+
+
+def compare_runs(baseline: Dict[str, Any], current: Dict[str, Any],
+                 threshold: float = DEFAULT_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    比較兩次執行，找出變慢超過門檻的組合
+
+    Args:
+        baseline: 基準紀錄
+        current: 本次紀錄
+        threshold: 容許的變慢比例（0.1 代表 10%）
+
+    Returns:
+        List[Dict]: 每個共同組合的比較結果（regression 為是否超過門檻）
+    """
+    baseline_results = {result_key(r): r for r in baseline['results'] if r['success']}
+    comparisons = []
+
+    for result in current['results']:
+        key = result_key(result)
+        previous = baseline_results.get(key)
+        if previous is None or not result['success'] or previous['seconds'] <= 0:
+            continue
+        ratio = result['seconds'] / previous['seconds']
+        comparisons.append({
+            'key': key,
+            'baseline': previous['seconds'],
+            'current': result['seconds'],
+            'ratio': ratio,
+            'regression': ratio > 1 + threshold
+        })
+
+    return comparisons
+
+
+def load_history(history_file: str) -> List[Dict[str, Any]]:
+    """讀取歷史紀錄（檔案不存在時返回空列表）"""
+    try:
+        with open(history_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return []
+
+
+def save_history(history_file: str, history: List[Dict[str, Any]]):
+    """保存歷史紀錄"""
+    directory = os.path.dirname(history_file)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(history_file, 'w', encoding='utf-8') as f:
+        json.dump(history, f, ensure_ascii=False, indent=2)
+
+
+def _git_commit() -> Optional[str]:
+    """目前的 git commit（無法取得時返回 None）"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _split(value: str) -> List[str]:
+    """逗號分隔的參數"""
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def main():
+    """命令列入口"""
+    parser = argparse.ArgumentParser(description="Word 轉 PowerPoint 基準測試套件")
+    parser.add_argument('--sizes', default='small,medium', help=f"文件大小（{','.join(SIZES)}）")
+    parser.add_argument('--templates', default='simple', help=f"模板（{','.join(TEMPLATES)}）")
+    parser.add_argument('--implementations', default=','.join(IMPLEMENTATIONS),
+                        help=f"實作（{','.join(IMPLEMENTATIONS)}）")
+    parser.add_argument('--repeats', type=int, default=3, help="每個組合的重複次數")
+    parser.add_argument('--work-dir', default=None, help="合成檔案目錄（預設為暫存目錄）")
+    parser.add_argument('--history', default=DEFAULT_HISTORY_FILE, help="歷史紀錄 JSON 檔案")
+    parser.add_argument('--no-save', action='store_true', help="不寫入歷史紀錄")
+    parser.add_argument('--compare', action='store_true', help="與歷史紀錄中最近一次執行比較")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="比較模式中視為變慢的比例（預設 0.10）")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    current = run_suite(_split(args.sizes), _split(args.templates), _split(args.implementations),
+                        args.repeats, args.work_dir)
+
+    print(f"📊 基準測試結果 ({current['commit'] or 'unknown'}, 重複 {args.repeats} 次取最小值)")
+    for result in current['results']:
+        status = '✅' if result['success'] else '❌'
+        print(f"   {status} {result_key(result):<40} {result['seconds']:8.3f} 秒 "
+              f"(平均 {result['mean']:.3f}, {result['slides']} 張)")
+
+    history = load_history(args.history)
+    regressions = []
+
+    if args.compare:
+        if not history:
+            print("⚠️  沒有歷史紀錄可比較")
+        else:
+            comparisons = compare_runs(history[-1], current, args.threshold)
+            print(f"\n🔍 與 {history[-1].get('commit') or history[-1]['timestamp']} 比較 "
+                  f"(門檻 {args.threshold:.0%}):")
+            for comparison in comparisons:
+                flag = '🐢 變慢' if comparison['regression'] else '  '
+                print(f"   {flag} {comparison['key']:<40} {comparison['baseline']:.3f} → "
+                      f"{comparison['current']:.3f} 秒 ({comparison['ratio']:.2f}x)")
+            regressions = [c for c in comparisons if c['regression']]
+
+    if not args.no_save:
+        history.append(current)
+        save_history(args.history, history)
+        print(f"\n💾 已寫入歷史紀錄: {args.history}")
+
+    if regressions:
+        print(f"\n❌ {len(regressions)} 個組合變慢超過 {args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
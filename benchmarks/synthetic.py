@@ -0,0 +1,156 @@
+"""
+合成測試資料 - 產生可重現的證道 Word 文件與 PowerPoint 模板
+
+相同參數與種子產生的內容完全相同，讓不同版本的基準測試結果可以互相比較。
+"""
+
+import io
+import random
+import struct
+import zlib
+from typing import Dict, Any
+
+from docx import Document
+from docx.shared import Pt, RGBColor
+from pptx import Presentation
+from pptx.util import Inches, Pt as PptPt
+
+
+# 用於組成段落的詞彙（證道資料常見的用字）
+WORDS = ('神', '恩典', '信心', '禱告', '聖經', '教會', '弟兄姊妹', '愛', '盼望', '喜樂',
+         '平安', '生命', '真理', '主耶穌', '救恩', '順服', '謙卑', '智慧', '見證', '讚美')
+
+RUN_COLORS = (RGBColor(0x00, 0x00, 0x00), RGBColor(0xC0, 0x00, 0x00), RGBColor(0x1F, 0x4E, 0x79))
+
+# 空白版面配置（預設模板的第 7 個版面）
+BLANK_LAYOUT_INDEX = 6
+
+
+def generate_word_document(file_path: str, sections: int = 50, paragraphs_per_section: int = 3,
+                           runs_per_paragraph: int = 4, tables: int = 0, seed: int = 0) -> Dict[str, Any]:
+    """
+    產生合成的證道 Word 文件
+
+    每個段落以「N. 標題」開頭，內文段落由多個不同格式的運行組成，
+    表格平均分散在各段落之間。
+
+    Args:
+        file_path: 輸出路徑
+        sections: 段落（章節）數
+        paragraphs_per_section: 每個章節的內文段落數
+        runs_per_paragraph: 每個段落的運行數
+        tables: 表格數
+        seed: 亂數種子
+
+    Returns:
+        Dict: 產生的參數與輸出路徑
+    """
+    rng = random.Random(seed)
+    doc = Document()
+    table_every = max(1, sections // tables) if tables else 0
+    tables_added = 0
+
+    for number in range(1, sections + 1):
+        doc.add_paragraph(f"{number}. {_sentence(rng, 3)}")
+
+        for _ in range(paragraphs_per_section):
+            paragraph = doc.add_paragraph()
+            for run_index in range(runs_per_paragraph):
+                run = paragraph.add_run(_sentence(rng, rng.randint(3, 8)))
+                run.font.size = Pt(rng.choice((14, 16, 18)))
+                run.font.bold = run_index % 3 == 0
+                run.font.italic = run_index % 4 == 1
+                run.font.color.rgb = rng.choice(RUN_COLORS)
+
+        if table_every and tables_added < tables and number % table_every == 0:
+            _add_table(doc, rng)
+            tables_added += 1
+
+    doc.save(file_path)
+    return {
+        'path': file_path,
+        'sections': sections,
+        'paragraphs_per_section': paragraphs_per_section,
+        'runs_per_paragraph': runs_per_paragraph,
+        'tables': tables_added
+    }
+
+
+def generate_template(file_path: str, text_shapes: int = 1, images: int = 1,
+                      image_size: int = 256, seed: int = 0) -> Dict[str, Any]:
+    """
+    產生合成的 PowerPoint 模板（單張投影片）
+
+    第一個文本框為主文本框，其餘文本框帶有裝飾文字；圖片為不易壓縮的 PNG，
+    用來模擬背景照片等大型媒體。
+
+    Args:
+        file_path: 輸出路徑
+        text_shapes: 文本框數（至少 1）
+        images: 圖片數
+        image_size: 圖片邊長（像素）
+        seed: 亂數種子
+
+    Returns:
+        Dict: 產生的參數與輸出路徑
+    """
+    rng = random.Random(seed)
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[BLANK_LAYOUT_INDEX])
+
+    for index in range(images):
+        png = make_png(image_size, image_size, rng)
+        offset = Inches(0.2 * index)
+        slide.shapes.add_picture(io.BytesIO(png), offset, offset,
+                                 Inches(10) - offset, Inches(7.5) - offset)
+
+    for index in range(max(1, text_shapes)):
+        textbox = slide.shapes.add_textbox(Inches(0.5), Inches(1 + index * 0.5), Inches(9), Inches(6))
+        run = textbox.text_frame.paragraphs[0].add_run()
+        run.text = '主文本' if index == 0 else _sentence(rng, 2)
+        run.font.size = PptPt(28 if index == 0 else 14)
+
+    prs.save(file_path)
+    return {
+        'path': file_path,
+        'text_shapes': max(1, text_shapes),
+        'images': images,
+        'image_size': image_size
+    }
+
+
+def make_png(width: int, height: int, rng: random.Random) -> bytes:
+    """
+    產生 RGB PNG 圖片（隨機像素，壓縮後大小接近原始大小）
+
+    Args:
+        width: 寬度
+        height: 高度
+        rng: 亂數產生器
+
+    Returns:
+        bytes: PNG 檔案內容
+    """
+    row_bytes = width * 3
+    raw = b''.join(b'\x00' + rng.randbytes(row_bytes) for _ in range(height))
+
+    def chunk(chunk_type: bytes, data: bytes) -> bytes:
+        return (struct.pack('>I', len(data)) + chunk_type + data +
+                struct.pack('>I', zlib.crc32(chunk_type + data) & 0xFFFFFFFF))
+
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header) +
+            chunk(b'IDAT', zlib.compress(raw, 6)) + chunk(b'IEND', b''))
+
+
+def _sentence(rng: random.Random, word_count: int) -> str:
+    """組成句子"""
+    return ''.join(rng.choice(WORDS) for _ in range(word_count)) + '。'
+
+
+def _add_table(doc, rng: random.Random, rows: int = 3, cols: int = 3):
+    """加入表格"""
+    table = doc.add_table(rows=rows, cols=cols)
+    for row in table.rows:
+        for cell in row.cells:
+            cell.text = _sentence(rng, 2)
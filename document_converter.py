@@ -3,28 +3,61 @@
 使用策略模式和工廠模式實現靈活的文件轉換
 """
 
-from typing import Dict, List, Any, Optional, Callable
+from typing import Dict, List, Any, Optional, Callable, Tuple, Union, BinaryIO
 from abc import ABC, abstractmethod
-from pptx import Presentation
+from contextlib import contextmanager, ExitStack
+import io
 import os
+import threading
+import time
 from pathlib import Path
 
 # 導入我們的模組
 from format_handler import FormatHandler
 from document_parser import DocumentParserFactory, WordDocumentParser, PowerPointDocumentParser
 from slide_manager import SlideManager, SlideAnalyzer
+from parse_cache import ParseCache, get_default_parse_cache
+from template_compiler import TemplateCompiler
+from package_writer import StreamingPackageWriter
+from document_io import (
+    FORMAT_DOCX, FORMAT_PPTX, FORMAT_TEXT, MEMORY_NAME, DocumentData, detect_format, load_document_data
+)
+from section_rules import SectionRuleSet
+from metrics import build_conversion_metrics, build_style_interning_stats, aggregate_metrics, metrics_for_log
+from text_parser import ProverbTextParser
+from incremental import (
+    ConversionManifest, SlidePackageSplicer, IncrementalUpdateError,
+    get_manifest_path, hash_file, hash_section, plan_incremental_update
+)
 from logger_config import (
     LoggerConfig, ErrorHandler, PerformanceMonitor, 
     ConversionError, DocumentError, create_result_dict, get_logger
 )
 
 
+def _display_name(target: Union[str, DocumentData, BinaryIO, None]) -> Optional[str]:
+    """日誌與追蹤使用的來源或輸出名稱（記憶體內容與檔案物件沒有路徑）"""
+    if target is None or isinstance(target, str):
+        return target
+    if isinstance(target, DocumentData):
+        return target.name
+    name = getattr(target, 'name', None)
+    return name if isinstance(name, str) else MEMORY_NAME
+
+
 class ConversionStrategy(ABC):
     """轉換策略抽象基類"""
     
+    # 策略接受的源文件格式（DocumentConverter 依內容驗證檔案時使用）
+    source_formats: Tuple[str, ...] = (FORMAT_DOCX,)
+    # 是否接受目錄作為來源（一次轉換目錄中的所有檔案）
+    accepts_directory = False
+    
     @abstractmethod
-    def convert(self, source_file: str, template_file: str, output_file: Optional[str] = None,
-               progress_callback: Optional[Callable] = None) -> Dict[str, Any]:
+    def convert(self, source_file: Union[str, DocumentData], template_file: Union[str, DocumentData],
+               output_file: Union[str, BinaryIO, None] = None,
+               progress_callback: Optional[Callable] = None, incremental: bool = False,
+               streaming: bool = False) -> Dict[str, Any]:
         """執行轉換"""
         pass
 
@@ -32,9 +65,13 @@ class ConversionStrategy(ABC):
 class WordToPowerPointStrategy(ConversionStrategy):
     """Word 轉 PowerPoint 策略"""
     
+    operation_name = "Word轉PowerPoint"
+    source_label = "Word 文檔"
+    
     def __init__(self, format_handler: FormatHandler, slide_manager: SlideManager,
                  word_parser: WordDocumentParser, ppt_parser: PowerPointDocumentParser,
-                 error_handler: ErrorHandler, performance_monitor: PerformanceMonitor):
+                 error_handler: ErrorHandler, performance_monitor: PerformanceMonitor,
+                 template_compiler: Optional[TemplateCompiler] = None):
         """
         初始化 Word 轉 PowerPoint 策略
         
@@ -45,6 +82,7 @@ class WordToPowerPointStrategy(ConversionStrategy):
             ppt_parser: PowerPoint 解析器
             error_handler: 錯誤處理器
             performance_monitor: 性能監控器
+            template_compiler: 模板編譯器（None 則自動建立，編譯結果於程序內共用）
         """
         self.format_handler = format_handler
         self.slide_manager = slide_manager
@@ -52,55 +90,61 @@ class WordToPowerPointStrategy(ConversionStrategy):
         self.ppt_parser = ppt_parser
         self.error_handler = error_handler
         self.performance_monitor = performance_monitor
+        self.template_compiler = template_compiler or TemplateCompiler(ppt_parser, format_handler)
         self.logger = get_logger(self.__class__.__name__)
     
-    def convert(self, source_file: str, template_file: str, output_file: Optional[str] = None,
-               progress_callback: Optional[Callable] = None) -> Dict[str, Any]:
+    def convert(self, source_file: Union[str, DocumentData], template_file: Union[str, DocumentData],
+               output_file: Union[str, BinaryIO, None] = None,
+               progress_callback: Optional[Callable] = None, incremental: bool = False,
+               streaming: bool = False) -> Dict[str, Any]:
         """
         執行 Word 轉 PowerPoint 轉換
         
         Args:
-            source_file: Word 檔案路徑
-            template_file: PowerPoint 模板路徑
-            output_file: 輸出檔案路徑
+            source_file: Word 檔案路徑或記憶體中的內容（DocumentData）
+            template_file: PowerPoint 模板路徑或記憶體中的內容（DocumentData）
+            output_file: 輸出檔案路徑或可寫入的二進位檔案物件（檔案物件不支援增量轉換與串流輸出）
             progress_callback: 進度回調函數 (current, total, message)
+            incremental: 是否增量轉換（依輸出檔旁的清單只重新渲染變更的章節，
+                並於轉換後更新清單）
+            streaming: 是否串流輸出（每張投影片完成後立即寫入輸出檔並釋放，
+                記憶體用量不隨投影片數增加；增量轉換沿用上次輸出時不適用）
             
         Returns:
-            Dict: 轉換結果
+            Dict: 轉換結果（增量轉換時 incremental 為沿用、重新渲染、取代與移除的投影片數）
         """
-        operation_name = "Word轉PowerPoint"
+        operation_name = self.operation_name
         self.performance_monitor.start_timing(operation_name)
+        cpu_start = time.process_time()
+        style_stats_start = self.format_handler.get_style_stats()
+        stage_times: Dict[str, float] = {}
         
         try:
             self.error_handler.log_operation_start(operation_name, {
-                'source': source_file,
-                'template': template_file,
-                'output': output_file
+                'source': _display_name(source_file),
+                'template': _display_name(template_file),
+                'output': _display_name(output_file)
             })
             
-            # 1. 解析 Word 文檔
+            # 1. 解析源文件
             if progress_callback:
-                progress_callback(1, 5, "解析 Word 文檔...")
+                progress_callback(1, 5, f"解析 {self.source_label}...")
             
-            try:
-                word_data = self.word_parser.parse_document(source_file)
-                sections = word_data['sections']
-                self.logger.info(f"成功解析 Word 文檔，找到 {len(sections)} 個段落")
-            except Exception as e:
-                raise DocumentError(f"解析 Word 文檔失敗: {str(e)}", "WORD_PARSE_ERROR")
+            with self._stage(stage_times, 'parse', source=os.path.basename(_display_name(source_file))) as span:
+                sections = self._parse_source(source_file)
+                if span is not None:
+                    span.set_attribute('sections', len(sections))
+            self.logger.info(f"成功解析{self.source_label}，找到 {len(sections)} 個段落")
             
             # 2. 載入 PowerPoint 模板
             if progress_callback:
                 progress_callback(2, 5, "載入 PowerPoint 模板...")
             
             try:
-                if not os.path.exists(template_file):
-                    raise DocumentError(f"模板檔案不存在: {template_file}", "TEMPLATE_NOT_FOUND")
-                
-                prs = Presentation(template_file)
-                if len(prs.slides) == 0:
-                    raise DocumentError("模板中沒有投影片", "EMPTY_TEMPLATE")
-                
+                with self._stage(stage_times, 'template_load',
+                                 template=os.path.basename(_display_name(template_file))):
+                    compiled_template = self._compile_template(template_file)
+                    prs = compiled_template.load_presentation()
                 template_slide = prs.slides[0]
                 self.logger.info(f"成功載入模板，包含 {len(prs.slides)} 張投影片")
             except DocumentError:
@@ -112,7 +156,8 @@ class WordToPowerPointStrategy(ConversionStrategy):
             if progress_callback:
                 progress_callback(3, 5, "分析模板結構...")
             
-            template_analysis = self.ppt_parser.analyze_template_slide(template_slide)
+            with self._stage(stage_times, 'template_analysis'):
+                template_analysis = compiled_template.get_template_analysis()
             self.logger.debug(f"模板分析結果: {template_analysis['summary']}")
             
             # 4. 執行轉換
@@ -124,28 +169,81 @@ class WordToPowerPointStrategy(ConversionStrategy):
                 if progress_callback:
                     progress_callback(overall_progress, 5, f"轉換投影片: {message}")
             
-            conversion_result = self.slide_manager.replace_slides_with_sections(
-                prs, sections, template_slide, slide_progress)
+            if output_file is None:
+                if isinstance(source_file, DocumentData) or isinstance(template_file, DocumentData):
+                    raise ConversionError("記憶體中的輸入必須指定輸出檔案或檔案物件")
+                output_file = self._generate_output_filename(template_file, source_file)
+            
+            # 輸出到檔案物件時一律完整轉換並一次寫入
+            to_path = isinstance(output_file, str)
+            incremental = incremental and to_path
+            streaming = streaming and to_path
+            
+            section_hashes = [hash_section(section) for section in sections] if incremental else []
+            update = (self._plan_incremental_update(output_file, section_hashes, compiled_template)
+                      if incremental else None)
+            
+            # 確保輸出目錄存在
+            if to_path:
+                Path(output_file).parent.mkdir(parents=True, exist_ok=True)
+            output_start = 0 if to_path else output_file.tell()
+            
+            slide_writer = None
+            if streaming and update is None:
+                if StreamingPackageWriter.is_supported(prs):
+                    slide_writer = StreamingPackageWriter(output_file, prs, compiled_template.package,
+                                                          self.logger)
+                else:
+                    self.logger.warning("目前的 python-pptx 版本不支援串流輸出，改為完整保存")
             
-            if not conversion_result['success']:
-                raise ConversionError(f"投影片轉換失敗: {conversion_result.get('error', '未知錯誤')}")
+            try:
+                with self.performance_monitor.span('slides', sections=len(sections)):
+                    if update is None:
+                        conversion_result = self.slide_manager.replace_slides_with_sections(
+                            prs, sections, template_slide, slide_progress, compiled_template,
+                            slide_writer=slide_writer)
+                    else:
+                        conversion_result = self._render_changed_sections(
+                            prs, sections, update, template_slide, compiled_template, slide_progress)
+                
+                if not conversion_result['success']:
+                    raise ConversionError(f"投影片轉換失敗: {conversion_result.get('error', '未知錯誤')}")
+            except BaseException:
+                if slide_writer is not None:
+                    slide_writer.abort()
+                raise
             
             # 5. 保存檔案
             if progress_callback:
                 progress_callback(5, 5, "保存檔案...")
             
-            if output_file is None:
-                output_file = self._generate_output_filename(template_file)
-            
-            # 確保輸出目錄存在
-            output_path = Path(output_file)
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            prs.save(output_file)
+            with self._stage(stage_times, 'save', output=os.path.basename(_display_name(output_file))):
+                if slide_writer is not None:
+                    slide_writer.finish(prs)
+                    slide_records = self._slide_records(prs)
+                elif update is None:
+                    compiled_template.save_presentation(prs, output_file, self.logger)
+                    slide_records = self._slide_records(prs)
+                else:
+                    slide_records = self._splice_output(prs, output_file, update, compiled_template)
+                if incremental:
+                    self._save_manifest(output_file, section_hashes, conversion_result['skipped_sections'],
+                                        slide_records, compiled_template)
             
             # 記錄成功
             duration = self.performance_monitor.end_timing(operation_name)
             
+            timings = conversion_result.get('timings', {})
+            stage_times['slide_clone'] = timings.get('clone', 0.0)
+            stage_times['content_replace'] = timings.get('replace', 0.0)
+            # 串流輸出時投影片在轉換階段就已寫入
+            stage_times['save'] += timings.get('write', 0.0)
+            metrics = build_conversion_metrics(
+                stage_times, duration, time.process_time() - cpu_start,
+                timings.get('slides', []),
+                os.path.getsize(output_file) if to_path else output_file.tell() - output_start,
+                build_style_interning_stats(style_stats_start, self.format_handler.get_style_stats()))
+            
             result = create_result_dict(
                 success=True,
                 total_sections=len(sections),
@@ -154,10 +252,14 @@ class WordToPowerPointStrategy(ConversionStrategy):
                 skipped_sections=conversion_result.get('skipped_sections', []),
                 format_issues=conversion_result.get('format_issues', []),
                 processing_time=duration,
-                template_analysis=template_analysis
+                template_analysis=template_analysis,
+                metrics=metrics,
+                incremental=conversion_result.get('incremental')
             )
             
-            self.error_handler.log_operation_success(operation_name, result)
+            # slide_times 僅供批次彙總，不寫入日誌
+            self.error_handler.log_operation_success(
+                operation_name, {**result, 'metrics': metrics_for_log(metrics)})
             
             # 記錄警告（如果有）
             if result['skipped_sections']:
@@ -180,17 +282,331 @@ class WordToPowerPointStrategy(ConversionStrategy):
                 processing_time=duration
             )
     
-    def _generate_output_filename(self, template_file: str) -> str:
+    def _compile_template(self, template_file: Union[str, DocumentData]):
+        """編譯模板檔案或記憶體中的模板"""
+        if isinstance(template_file, DocumentData):
+            return self.template_compiler.compile_data(template_file)
+        return self.template_compiler.compile(template_file)
+    
+    def _parse_source(self, source_file: Union[str, DocumentData]) -> List[Dict[str, Any]]:
+        """
+        解析源文件為章節列表
+        
+        Raises:
+            DocumentError: 解析失敗時拋出
+        """
+        try:
+            if isinstance(source_file, DocumentData):
+                return self.word_parser.parse_data(source_file)['sections']
+            return self.word_parser.parse_document(source_file)['sections']
+        except Exception as e:
+            raise DocumentError(f"解析 Word 文檔失敗: {str(e)}", "WORD_PARSE_ERROR")
+    
+    def _manifest_options(self) -> str:
+        """影響渲染結果的轉換選項（記錄於增量轉換清單）"""
+        return f"clone_mode={self.slide_manager.clone_mode}"
+    
+    def _plan_incremental_update(self, output_file: str, section_hashes: List[str],
+                                 compiled_template) -> Optional[Dict[str, Any]]:
+        """
+        依上次的清單規劃增量更新
+        
+        Returns:
+            Optional[Dict]: 增量更新規劃（沒有可用的清單時返回 None，改為完整轉換）
+        """
+        manifest = ConversionManifest.load(output_file)
+        if manifest is None or not section_hashes:
+            return None
+        if not manifest.is_compatible(compiled_template.content_hash, self._manifest_options(), output_file):
+            self.logger.info("模板、轉換選項或輸出檔已變更，完整重新轉換")
+            return None
+        
+        update = plan_incremental_update(manifest.slides, section_hashes)
+        update['previous'] = manifest.slides
+        # 模板投影片（演示文稿的第一張）保留給第一個章節；第一個章節沿用時仍以它渲染佔位，之後捨棄
+        render = update['render']
+        update['delta_indexes'] = render if not render or render[0] == 0 else [0] + render
+        
+        self.logger.info(f"增量轉換: 沿用 {len(section_hashes) - len(render)} 張、"
+                         f"重新渲染 {len(render)} 張（取代 {update['replaced']} 張）、"
+                         f"移除 {update['removed']} 張投影片")
+        return update
+    
+    def _render_changed_sections(self, prs, sections: List[Dict[str, Any]], update: Dict[str, Any],
+                                 template_slide, compiled_template,
+                                 progress_callback: Optional[Callable] = None) -> Dict[str, Any]:
+        """
+        只渲染變更或新增的章節（結果的 skipped_sections 索引對應原本的章節）
+        
+        incremental 的 rendered 包含取代內容變更章節的 replaced 張；removed 只計入已刪除的章節。
+        """
+        delta_indexes = update['delta_indexes']
+        if delta_indexes:
+            result = self.slide_manager.replace_slides_with_sections(
+                prs, [sections[index] for index in delta_indexes], template_slide,
+                progress_callback, compiled_template)
+        else:
+            result = {'success': True, 'slides_created': 0, 'skipped_sections': [], 'format_issues': [],
+                      'timings': {'clone': 0.0, 'replace': 0.0, 'slides': []}, 'error': None}
+        
+        render = set(update['render'])
+        if delta_indexes and delta_indexes[0] not in render:
+            # 第一個章節只是佔位渲染（之後捨棄），不計入每張投影片的耗時分佈
+            placeholder_failed = any(item['index'] == 0 for item in result['skipped_sections'])
+            if not placeholder_failed and result['timings']['slides']:
+                result['timings']['slides'].pop(0)
+        
+        skipped = []
+        for item in result['skipped_sections']:
+            index = delta_indexes[item['index']]
+            if index in render:
+                skipped.append({**item, 'index': index})
+        
+        result['skipped_sections'] = skipped
+        result['slides_created'] = len(sections) - len(skipped)
+        result['incremental'] = {
+            'reused': len(sections) - len(render),
+            'rendered': len(render),
+            'replaced': update['replaced'],
+            'removed': update['removed']
+        }
+        return result
+    
+    @staticmethod
+    def _slide_records(prs) -> List[Dict[str, Any]]:
+        """依順序每張投影片的部件名稱與投影片 ID（不載入投影片，串流輸出後也適用）"""
+        rels = prs.part.rels
+        return [{'partname': str(rels[sldId.rId].target_part.partname), 'slide_id': sldId.id}
+                for sldId in prs.slides._sldIdLst]
+    
+    def _splice_output(self, prs, output_file: str, update: Dict[str, Any],
+                       compiled_template) -> List[Dict[str, Any]]:
+        """
+        將重新渲染的投影片拼接進上次的輸出檔
+        
+        Returns:
+            List[Dict]: 依順序每張投影片的部件名稱與投影片 ID
+        
+        Raises:
+            ConversionError: 拼接失敗時拋出（並刪除清單，下次改為完整轉換）
+        """
+        if update['unchanged']:
+            self.logger.info("所有章節皆未變更，沿用現有的輸出檔")
+            return [{'partname': slide['partname'], 'slide_id': slide['slide_id']}
+                    for slide in update['previous']]
+        
+        delta_blob = None
+        delta_partnames = {}
+        if update['delta_indexes']:
+            buffer = io.BytesIO()
+            compiled_template.save_presentation(prs, buffer, self.logger)
+            delta_blob = buffer.getvalue()
+            delta_partnames = {index: str(slide.part.partname)
+                               for index, slide in zip(update['delta_indexes'], prs.slides)}
+        
+        order = [('base', entry['partname']) if entry['partname'] is not None
+                 else ('delta', delta_partnames[entry['index']])
+                 for entry in update['order']]
+        
+        try:
+            return SlidePackageSplicer(output_file, self.logger).splice(order, output_file, delta_blob)
+        except IncrementalUpdateError as e:
+            self._remove_manifest(output_file)
+            raise ConversionError(f"增量更新輸出檔失敗（下次將完整轉換）: {e}")
+    
+    def _save_manifest(self, output_file: str, section_hashes: List[str],
+                       skipped_sections: List[Dict[str, Any]], slide_records: List[Dict[str, Any]],
+                       compiled_template):
+        """寫入增量轉換清單（轉換失敗的章節不記錄雜湊，下次必定重新渲染）"""
+        skipped = {item['index'] for item in skipped_sections}
+        slides = [{'hash': None if index in skipped else digest, **record}
+                  for index, (digest, record) in enumerate(zip(section_hashes, slide_records))]
+        manifest = ConversionManifest(compiled_template.content_hash, self._manifest_options(),
+                                      hash_file(output_file), slides)
+        try:
+            manifest.save(output_file)
+        except OSError as e:
+            self.logger.warning(f"寫入增量轉換清單失敗: {e}")
+    
+    def _remove_manifest(self, output_file: str):
+        """刪除增量轉換清單"""
+        try:
+            os.remove(get_manifest_path(output_file))
+        except OSError:
+            pass
+    
+    @contextmanager
+    def _stage(self, stage_times: Dict[str, float], stage: str, **attributes):
+        """記錄轉換階段的耗時，並建立同名的追蹤區段"""
+        start = time.perf_counter()
+        try:
+            with self.performance_monitor.span(stage, **attributes) as span:
+                yield span
+        finally:
+            stage_times[stage] = time.perf_counter() - start
+    
+    def _generate_output_filename(self, template_file: str, source_file: Optional[str] = None) -> str:
         """生成輸出檔案名"""
         template_path = Path(template_file)
         return str(template_path.parent / f"{template_path.stem}_轉換版{template_path.suffix}")
 
 
+class TextToPowerPointStrategy(WordToPowerPointStrategy):
+    """◇ 分項純文字轉 PowerPoint 策略（例如 清晨箴言/YYYYMMDD.txt）"""
+    
+    operation_name = "純文字轉PowerPoint"
+    source_label = "純文字檔"
+    source_formats = (FORMAT_TEXT,)
+    accepts_directory = True
+    
+    def __init__(self, format_handler: FormatHandler, slide_manager: SlideManager,
+                 text_parser: ProverbTextParser, ppt_parser: PowerPointDocumentParser,
+                 error_handler: ErrorHandler, performance_monitor: PerformanceMonitor,
+                 template_compiler: Optional[TemplateCompiler] = None,
+                 file_pattern: str = '*.txt'):
+        """
+        初始化純文字轉 PowerPoint 策略
+        
+        Args:
+            format_handler: 格式處理器
+            slide_manager: 投影片管理器
+            text_parser: 純文字解析器（決定每個 ◇ 項目一張或依字數合併）
+            ppt_parser: PowerPoint 解析器
+            error_handler: 錯誤處理器
+            performance_monitor: 性能監控器
+            template_compiler: 模板編譯器（None 則自動建立，編譯結果於程序內共用）
+            file_pattern: 來源為目錄時要轉換的檔案（例如 '2025*.txt' 只轉換 2025 年）
+        """
+        super().__init__(format_handler, slide_manager, None, ppt_parser, error_handler,
+                         performance_monitor, template_compiler)
+        self.text_parser = text_parser
+        self.file_pattern = file_pattern
+    
+    def convert(self, source_file: Union[str, DocumentData], template_file: Union[str, DocumentData],
+               output_file: Union[str, BinaryIO, None] = None,
+               progress_callback: Optional[Callable] = None, incremental: bool = False,
+               streaming: bool = False) -> Dict[str, Any]:
+        """
+        執行純文字轉 PowerPoint 轉換
+        
+        Args:
+            source_file: 純文字檔路徑、包含每日純文字檔的目錄，或記憶體中的內容（DocumentData）
+            template_file: PowerPoint 模板路徑或記憶體中的內容（DocumentData）
+            output_file: 輸出檔案路徑或可寫入的二進位檔案物件（來源為目錄時為輸出目錄）
+            progress_callback: 進度回調函數 (current, total, message)
+            incremental: 是否增量轉換（只重新渲染變更的 ◇ 項目）
+            streaming: 是否串流輸出投影片
+            
+        Returns:
+            Dict: 轉換結果
+        """
+        if isinstance(source_file, str) and os.path.isdir(source_file):
+            return self.convert_directory(source_file, template_file, output_file, progress_callback,
+                                          incremental, streaming)
+        return super().convert(source_file, template_file, output_file, progress_callback, incremental,
+                               streaming)
+    
+    def convert_directory(self, source_dir: str, template_file: Union[str, DocumentData],
+                          output_dir: Optional[str] = None,
+                          progress_callback: Optional[Callable] = None,
+                          incremental: bool = False, streaming: bool = False) -> Dict[str, Any]:
+        """
+        轉換目錄中的所有純文字檔，每個檔案輸出一份演示文稿
+        
+        模板只編譯一次，每個檔案從編譯結果建立演示文稿。
+        
+        Args:
+            source_dir: 純文字檔目錄
+            template_file: PowerPoint 模板路徑或記憶體中的內容（DocumentData）
+            output_dir: 輸出目錄（None 則為「<來源目錄>_投影片」）
+            progress_callback: 進度回調函數 (current, total, message)
+            incremental: 是否增量轉換每個檔案
+            streaming: 是否串流輸出每個檔案的投影片
+            
+        Returns:
+            Dict: 轉換結果（files 為每個檔案的結果）
+        """
+        operation_name = f"{self.operation_name}(目錄)"
+        self.performance_monitor.start_timing(operation_name)
+        
+        source_files = sorted(str(path) for path in Path(source_dir).glob(self.file_pattern)
+                              if path.is_file())
+        if output_dir is None:
+            output_dir = str(Path(source_dir).resolve()) + '_投影片'
+        
+        try:
+            if not source_files:
+                raise DocumentError(f"目錄中沒有符合 {self.file_pattern} 的檔案: {source_dir}",
+                                    "SOURCE_NOT_FOUND")
+            
+            # 預先編譯模板，之後每個檔案直接使用快取
+            self._compile_template(template_file)
+            
+            results = []
+            for index, text_file in enumerate(source_files):
+                if progress_callback:
+                    progress_callback(index + 1, len(source_files), f"轉換 {os.path.basename(text_file)}")
+                output_file = os.path.join(output_dir, f"{Path(text_file).stem}.pptx")
+                result = super().convert(text_file, template_file, output_file, incremental=incremental,
+                                         streaming=streaming)
+                result['source_file'] = text_file
+                results.append(result)
+            
+            duration = self.performance_monitor.end_timing(operation_name)
+            successful = [r for r in results if r['success']]
+            
+            return create_result_dict(
+                success=len(successful) == len(results),
+                error=None if len(successful) == len(results) else f"{len(results) - len(successful)} 個檔案轉換失敗",
+                total_files=len(results),
+                converted_files=len(successful),
+                slides_created=sum(r['slides_created'] for r in successful),
+                output_dir=output_dir,
+                files=results,
+                processing_time=duration,
+                metrics=(aggregate_metrics([r['metrics'] for r in successful], duration)
+                         if successful else None)
+            )
+        
+        except Exception as e:
+            duration = self.performance_monitor.end_timing(operation_name)
+            error_info = self.error_handler.handle_error(e, operation_name)
+            return create_result_dict(
+                success=False,
+                error=str(e),
+                error_info=error_info,
+                processing_time=duration
+            )
+    
+    def _parse_source(self, source_file: Union[str, DocumentData]) -> List[Dict[str, Any]]:
+        """
+        串流解析純文字檔為章節列表
+        
+        Raises:
+            DocumentError: 解析失敗時拋出
+        """
+        try:
+            if isinstance(source_file, DocumentData):
+                return self.text_parser.parse_data(source_file)['sections']
+            return list(self.text_parser.iter_sections(source_file))
+        except Exception as e:
+            raise DocumentError(f"解析純文字檔失敗: {str(e)}", "TEXT_PARSE_ERROR")
+    
+    def _generate_output_filename(self, template_file: str, source_file: Optional[str] = None) -> str:
+        """生成輸出檔案名（與純文字檔同名的 .pptx）"""
+        if source_file is None:
+            return super()._generate_output_filename(template_file)
+        return str(Path(source_file).with_suffix('.pptx'))
+
+
 class DocumentConverter:
     """主要文件轉換器 - 使用策略模式"""
     
     def __init__(self, strategy: Optional[ConversionStrategy] = None, 
-                 logger_level: str = "INFO", log_to_file: bool = True):
+                 logger_level: str = "INFO", log_to_file: bool = True,
+                 word_parser_type: str = "word", parse_cache: Optional[ParseCache] = None,
+                 clone_mode: str = "xml", section_rules: Optional[SectionRuleSet] = None,
+                 tracing: bool = False):
         """
         初始化文件轉換器
         
@@ -198,6 +614,12 @@ class DocumentConverter:
             strategy: 轉換策略
             logger_level: 日誌級別
             log_to_file: 是否記錄到檔案
+            word_parser_type: Word 解析器類型（'word' 使用 python-docx，'word_stream' 使用串流解析；
+                轉換時仍會先解析完整份文件再渲染投影片）
+            parse_cache: Word 解析快取（分析、預覽與轉換共用）
+            clone_mode: 投影片複製方式（'xml' 直接複製 XML，'shape' 逐一形狀重建）
+            section_rules: Word 章節切分規則集（None 則只依「N.」編號切分）
+            tracing: 是否保留追蹤區段（供 export_trace 匯出；預設不保留以免長時間使用時累積）
         """
         # 設置日誌
         from logger_config import LogLevel
@@ -218,16 +640,22 @@ class DocumentConverter:
         # 初始化組件
         self.format_handler = FormatHandler(self.logger)
         self.error_handler = ErrorHandler(self.logger)
-        self.performance_monitor = PerformanceMonitor(self.logger)
+        self.performance_monitor = PerformanceMonitor(self.logger, tracing=tracing)
         
         # 解析器
-        self.word_parser = DocumentParserFactory.create_parser('word', self.format_handler, self.logger)
+        self.parse_cache = parse_cache
+        self.word_parser = DocumentParserFactory.create_parser(
+            word_parser_type, self.format_handler, self.logger, parse_cache, section_rules)
         self.ppt_parser = DocumentParserFactory.create_parser('powerpoint', self.format_handler, self.logger)
         
         # 投影片管理器
-        self.slide_manager = SlideManager(self.format_handler, self.logger)
+        self.slide_manager = SlideManager(self.format_handler, self.logger, clone_mode,
+                                          tracer=self.performance_monitor.tracer)
         self.slide_analyzer = SlideAnalyzer(self.logger)
         
+        # 模板編譯器（編譯結果於程序內共用）
+        self.template_compiler = TemplateCompiler(self.ppt_parser, self.format_handler, self.logger)
+        
         # 設置策略
         self._strategy = strategy or self._create_default_strategy()
     
@@ -238,7 +666,8 @@ class DocumentConverter:
     
     def convert_document(self, source_file: str, template_file: str, 
                         output_file: Optional[str] = None,
-                        progress_callback: Optional[Callable] = None) -> Dict[str, Any]:
+                        progress_callback: Optional[Callable] = None,
+                        incremental: bool = False, streaming: bool = False) -> Dict[str, Any]:
         """
         轉換文檔
         
@@ -247,6 +676,8 @@ class DocumentConverter:
             template_file: 模板文件路徑
             output_file: 輸出文件路徑
             progress_callback: 進度回調函數
+            incremental: 是否增量轉換（只重新渲染與上次輸出相比有變更的章節）
+            streaming: 是否串流輸出（每張投影片完成後立即寫入輸出檔，適合數千張投影片的文件）
             
         Returns:
             Dict: 轉換結果
@@ -256,12 +687,82 @@ class DocumentConverter:
             self._validate_files(source_file, template_file)
             
             # 執行轉換
-            return self._strategy.convert(source_file, template_file, output_file, progress_callback)
+            return self._strategy.convert(source_file, template_file, output_file, progress_callback,
+                                          incremental=incremental, streaming=streaming)
+            
+        except Exception as e:
+            error_info = self.error_handler.handle_error(e, "文檔轉換")
+            return create_result_dict(success=False, error=str(e), error_info=error_info)
+    
+    def convert_bytes(self, source, template, output: Optional[BinaryIO] = None,
+                      progress_callback: Optional[Callable] = None,
+                      source_name: Optional[str] = None, template_name: Optional[str] = None) -> Dict[str, Any]:
+        """
+        轉換記憶體中的文檔，不需寫入暫存檔
+        
+        來源與模板的格式依內容判斷（ZIP 檔頭與 [Content_Types].xml），與名稱無關。
+        增量轉換與串流輸出需要輸出檔案路徑，因此不適用。
+        
+        Args:
+            source: 源文件內容（bytes / bytearray / memoryview、可讀取的二進位檔案物件、路徑或 DocumentData）
+            template: 模板內容（同上）
+            output: 可寫入的二進位檔案物件（None 則轉換結果以 output_data 返回）
+            progress_callback: 進度回調函數
+            source_name: 源文件顯示名稱（日誌與錯誤訊息使用；純文字檔依此判斷日期）
+            template_name: 模板顯示名稱
+            
+        Returns:
+            Dict: 轉換結果（未指定 output 時 output_data 為輸出內容的 memoryview）
+        """
+        try:
+            source_data = load_document_data(source, source_name)
+            template_data = load_document_data(template, template_name)
+            self._validate_data(source_data, template_data)
+            
+            buffer = io.BytesIO() if output is None else None
+            result = self._strategy.convert(source_data, template_data,
+                                            buffer if output is None else output, progress_callback)
+            if output is None:
+                result['output_file'] = None
+                if result['success']:
+                    result['output_data'] = buffer.getbuffer()
+            return result
             
         except Exception as e:
             error_info = self.error_handler.handle_error(e, "文檔轉換")
             return create_result_dict(success=False, error=str(e), error_info=error_info)
     
+    def plan_conversion(self, source_file: str, template_file: str) -> Dict[str, Any]:
+        """
+        乾跑轉換：解析文件並建立渲染規劃，不修改模板也不產生輸出檔案
+        
+        Args:
+            source_file: 源文件路徑
+            template_file: 模板文件路徑
+            
+        Returns:
+            Dict: 包含 render_plan（純資料）的結果
+        """
+        try:
+            self._validate_files(source_file, template_file)
+            
+            sections = self.word_parser.parse_document(source_file)['sections']
+            compiled_template = self.template_compiler.compile(template_file)
+            template_slide = compiled_template.load_presentation().slides[0]
+            
+            render_plan = self.slide_manager.build_render_plan(
+                template_slide, sections, compiled_template)
+            
+            return create_result_dict(
+                success=True,
+                total_sections=len(sections),
+                render_plan=render_plan
+            )
+            
+        except Exception as e:
+            error_info = self.error_handler.handle_error(e, "轉換規劃")
+            return create_result_dict(success=False, error=str(e), error_info=error_info)
+    
     def analyze_document(self, file_path: str) -> Dict[str, Any]:
         """
         分析文檔結構
@@ -273,14 +774,14 @@ class DocumentConverter:
             Dict: 分析結果
         """
         try:
-            if file_path.lower().endswith('.docx'):
+            document_format = detect_format(file_path)
+            if document_format == FORMAT_DOCX:
                 return self.word_parser.parse_document(file_path)
-            elif file_path.lower().endswith('.pptx'):
-                ppt_data = self.ppt_parser.parse_document(file_path)
-                # 添加結構分析
-                prs = Presentation(file_path)
-                structure_analysis = self.slide_analyzer.analyze_presentation_structure(prs)
-                ppt_data['structure_analysis'] = structure_analysis
+            elif document_format == FORMAT_PPTX:
+                # 只開檔一次：同一份形狀記錄同時用於文本提取與結構分析
+                slide_records = self.ppt_parser.read_slide_records(file_path)
+                ppt_data = self.ppt_parser.parse_slide_records(file_path, slide_records)
+                ppt_data['structure_analysis'] = self.slide_analyzer.analyze_slide_records(slide_records)
                 return ppt_data
             else:
                 raise ValueError(f"不支持的檔案格式: {file_path}")
@@ -300,7 +801,7 @@ class DocumentConverter:
             Dict: 預覽信息
         """
         try:
-            if not source_file.lower().endswith('.docx'):
+            if detect_format(source_file) != FORMAT_DOCX:
                 raise ValueError("只支持 Word 文檔預覽")
             
             word_data = self.word_parser.parse_document(source_file)
@@ -335,6 +836,29 @@ class DocumentConverter:
             error_info = self.error_handler.handle_error(e, "轉換預覽")
             return create_result_dict(success=False, error=str(e), error_info=error_info)
     
+    def export_trace(self, file_path: str) -> str:
+        """
+        匯出轉換過程的追蹤區段（Chrome trace-event JSON，需以 tracing=True 建立轉換器）
+        
+        Args:
+            file_path: 輸出檔案路徑
+            
+        Returns:
+            str: 輸出檔案路徑
+        """
+        return self.performance_monitor.export_chrome_trace(file_path)
+    
+    def get_parse_cache_stats(self) -> Dict[str, Any]:
+        """
+        獲取解析快取統計
+        
+        Returns:
+            Dict: 快取統計（未啟用快取時返回 {'enabled': False}）
+        """
+        if self.parse_cache is None:
+            return {'enabled': False}
+        return {'enabled': True, **self.parse_cache.get_stats()}
+    
     def _create_default_strategy(self) -> ConversionStrategy:
         """創建預設轉換策略"""
         return WordToPowerPointStrategy(
@@ -343,7 +867,31 @@ class DocumentConverter:
             self.word_parser,
             self.ppt_parser,
             self.error_handler,
-            self.performance_monitor
+            self.performance_monitor,
+            self.template_compiler
+        )
+    
+    def create_text_strategy(self, max_chars_per_slide: Optional[int] = None,
+                             file_pattern: str = '*.txt') -> 'TextToPowerPointStrategy':
+        """
+        創建 ◇ 分項純文字轉換策略（共用本轉換器的投影片管理器與模板編譯器）
+        
+        Args:
+            max_chars_per_slide: 每張投影片的字數上限（None 則每個 ◇ 項目一張投影片）
+            file_pattern: 來源為目錄時要轉換的檔案
+            
+        Returns:
+            TextToPowerPointStrategy: 純文字轉換策略
+        """
+        return TextToPowerPointStrategy(
+            self.format_handler,
+            self.slide_manager,
+            ProverbTextParser(max_chars_per_slide, self.logger),
+            self.ppt_parser,
+            self.error_handler,
+            self.performance_monitor,
+            self.template_compiler,
+            file_pattern
         )
     
     def _validate_files(self, source_file: str, template_file: str):
@@ -354,11 +902,23 @@ class DocumentConverter:
         if not os.path.exists(template_file):
             raise DocumentError(f"模板文件不存在: {template_file}", "TEMPLATE_NOT_FOUND")
         
-        if not source_file.lower().endswith('.docx'):
+        is_directory = os.path.isdir(source_file)
+        if is_directory and not self._strategy.accepts_directory:
+            raise DocumentError(f"不支援以目錄作為源文件: {source_file}", "UNSUPPORTED_SOURCE_FORMAT")
+        
+        if not is_directory and detect_format(source_file) not in self._strategy.source_formats:
             raise DocumentError(f"不支援的源文件格式: {source_file}", "UNSUPPORTED_SOURCE_FORMAT")
         
-        if not template_file.lower().endswith('.pptx'):
+        if detect_format(template_file) != FORMAT_PPTX:
             raise DocumentError(f"不支援的模板格式: {template_file}", "UNSUPPORTED_TEMPLATE_FORMAT")
+    
+    def _validate_data(self, source_data: DocumentData, template_data: DocumentData):
+        """驗證記憶體中的源文件與模板格式"""
+        if source_data.format not in self._strategy.source_formats:
+            raise DocumentError(f"不支援的源文件格式: {source_data.name}", "UNSUPPORTED_SOURCE_FORMAT")
+        
+        if template_data.format != FORMAT_PPTX:
+            raise DocumentError(f"不支援的模板格式: {template_data.name}", "UNSUPPORTED_TEMPLATE_FORMAT")
 
 
 class ConverterFactory:
@@ -370,14 +930,20 @@ class ConverterFactory:
         創建轉換器
         
         Args:
-            converter_type: 轉換器類型
-            **kwargs: 其他參數
+            converter_type: 轉換器類型（'word_to_ppt' 或 'text_to_ppt'）
+            **kwargs: 其他參數（text_to_ppt 另可指定 max_chars_per_slide 與 file_pattern）
             
         Returns:
             DocumentConverter: 轉換器實例
         """
         if converter_type.lower() == "word_to_ppt":
             return DocumentConverter(**kwargs)
+        elif converter_type.lower() == "text_to_ppt":
+            max_chars_per_slide = kwargs.pop('max_chars_per_slide', None)
+            file_pattern = kwargs.pop('file_pattern', '*.txt')
+            converter = DocumentConverter(**kwargs)
+            converter.set_strategy(converter.create_text_strategy(max_chars_per_slide, file_pattern))
+            return converter
         else:
             raise ValueError(f"不支持的轉換器類型: {converter_type}")
     
@@ -390,23 +956,82 @@ class ConverterFactory:
 class BatchConverter:
     """批次轉換器"""
     
-    def __init__(self, **kwargs):
-        """初始化批次轉換器"""
+    def __init__(self, parallel: bool = False, max_workers: Optional[int] = None, **kwargs):
+        """
+        初始化批次轉換器
+        
+        Args:
+            parallel: 是否使用多程序並行轉換
+            max_workers: 並行工作程序數（None 則依 CPU 核心數與檔案數決定）
+            **kwargs: DocumentConverter 的參數（並行模式下需可序列化）
+        """
         self.converter = DocumentConverter(**kwargs)
         self.logger = self.converter.logger
+        self.parallel = parallel
+        self.max_workers = max_workers
+        self.converter_kwargs = kwargs
+        self.last_metrics: Optional[Dict[str, Any]] = None
     
     def convert_multiple(self, file_pairs: List[Dict[str, str]], 
-                        progress_callback: Optional[Callable] = None) -> List[Dict[str, Any]]:
+                        progress_callback: Optional[Callable] = None,
+                        parallel: Optional[bool] = None,
+                        max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         批次轉換多個文檔
         
         Args:
             file_pairs: 文件對列表，每個包含 source, template, output
-            progress_callback: 進度回調函數
+            progress_callback: 進度回調函數 (current, total, message)
+            parallel: 是否並行（None 則使用初始化時的設定）
+            max_workers: 並行工作程序數（None 則使用初始化時的設定）
             
         Returns:
-            List[Dict]: 轉換結果列表
+            List[Dict]: 轉換結果列表（順序與 file_pairs 相同）
+        """
+        use_parallel = self.parallel if parallel is None else parallel
+        workers = self._resolve_worker_count(len(file_pairs), max_workers or self.max_workers)
+        batch_start = time.perf_counter()
+        
+        if use_parallel and workers > 1:
+            results = self._convert_parallel(file_pairs, progress_callback, workers)
+        else:
+            results = self._convert_sequential(file_pairs, progress_callback)
+        
+        successful = sum(1 for r in results if r['success'])
+        self.logger.info(f"批次轉換完成: {successful}/{len(file_pairs)} 成功")
+        
+        # 並行時各檔案耗時互相重疊，總耗時以主程序量測為準
+        self.last_metrics = self.aggregate_metrics(results, time.perf_counter() - batch_start)
+        if self.last_metrics is not None:
+            slides = self.last_metrics['slides']
+            self.logger.info(
+                f"批次指標: CPU {self.last_metrics['cpu_time']:.2f}秒, "
+                f"投影片 {slides['count']} 張 (p50={slides['p50'] * 1000:.2f}ms, "
+                f"p99={slides['p99'] * 1000:.2f}ms)")
+        
+        return results
+    
+    @staticmethod
+    def aggregate_metrics(results: List[Dict[str, Any]],
+                          wall_time: Optional[float] = None) -> Optional[Dict[str, Any]]:
         """
+        彙總批次中成功轉換的 metrics
+        
+        Args:
+            results: convert_multiple 的結果列表
+            wall_time: 批次實際總耗時（秒，None 則以各檔案耗時相加）
+            
+        Returns:
+            Optional[Dict]: 彙總後的 metrics（沒有任何成功結果時返回 None）
+        """
+        metrics_list = [r['metrics'] for r in results if r.get('success') and r.get('metrics')]
+        if not metrics_list:
+            return None
+        return aggregate_metrics(metrics_list, wall_time)
+    
+    def _convert_sequential(self, file_pairs: List[Dict[str, str]],
+                            progress_callback: Optional[Callable] = None) -> List[Dict[str, Any]]:
+        """逐一轉換"""
         results = []
         total = len(file_pairs)
         
@@ -425,23 +1050,291 @@ class BatchConverter:
                 results.append(result)
                 
             except Exception as e:
-                error_result = create_result_dict(
-                    success=False,
-                    error=str(e),
-                    source_file=file_pair['source']
-                )
-                results.append(error_result)
-                self.logger.error(f"批次轉換失敗: {file_pair['source']} - {e}")
+                results.append(self._create_error_result(file_pair, e))
         
-        successful = sum(1 for r in results if r['success'])
-        self.logger.info(f"批次轉換完成: {successful}/{total} 成功")
+        return results
+    
+    def _convert_parallel(self, file_pairs: List[Dict[str, str]],
+                          progress_callback: Optional[Callable], workers: int) -> List[Dict[str, Any]]:
+        """
+        以程序池並行轉換
+        
+        工作程序在初始化時預先載入 python-pptx/python-docx 並編譯清單中的模板；
+        各工作程序的進度經由佇列匯總，在主程序以 progress_callback 回報。
+        """
+        from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+        import multiprocessing
+        
+        total = len(file_pairs)
+        results: List[Optional[Dict[str, Any]]] = [None] * total
+        completed = [False] * total
+        templates = sorted({file_pair['template'] for file_pair in file_pairs})
+        
+        self.logger.info(f"並行批次轉換: {total} 個檔案, {workers} 個工作程序")
+        
+        with ExitStack() as stack:
+            # 只有需要回報進度時才啟動 Manager 程序
+            progress_queue = None
+            if progress_callback:
+                progress_queue = stack.enter_context(multiprocessing.Manager()).Queue()
+            
+            # 以 LoggerConfig.enable_queue_logging(multiprocess=True) 啟用時，工作程序的記錄由主程序寫出
+            log_queue = LoggerConfig.get_worker_log_queue()
+            
+            executor = stack.enter_context(ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_batch_worker,
+                initargs=(self.converter_kwargs, templates, log_queue)))
+            futures = {
+                executor.submit(_convert_in_worker, index, file_pair, progress_queue): index
+                for index, file_pair in enumerate(file_pairs)
+            }
+            pending = set(futures)
+            
+            while pending:
+                done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                
+                for future in done:
+                    index = futures[future]
+                    try:
+                        results[index] = future.result()
+                    except Exception as e:
+                        results[index] = self._create_error_result(file_pairs[index], e)
+                    completed[index] = True
+                
+                if progress_callback:
+                    self._report_parallel_progress(
+                        progress_queue, completed, file_pairs, progress_callback, bool(done))
         
         return results
+    
+    def _report_parallel_progress(self, progress_queue, completed: List[bool],
+                                  file_pairs: List[Dict[str, str]], progress_callback: Callable,
+                                  files_finished: bool):
+        """匯總工作程序的進度並回報（沒有新進度也沒有檔案完成時不回報）"""
+        import queue
+        
+        message = None
+        while True:
+            try:
+                index, _, _, step_message = progress_queue.get_nowait()
+            except queue.Empty:
+                break
+            if not completed[index]:
+                message = f"{os.path.basename(file_pairs[index]['source'])}: {step_message}"
+        
+        if message is None and not files_finished:
+            return
+        
+        done_count = sum(completed)
+        progress_callback(done_count, len(file_pairs),
+                          message or f"已完成 {done_count}/{len(file_pairs)} 個檔案")
+    
+    def _resolve_worker_count(self, file_count: int, max_workers: Optional[int]) -> int:
+        """決定工作程序數"""
+        workers = max_workers or os.cpu_count() or 1
+        return max(1, min(workers, file_count))
+    
+    def _create_error_result(self, file_pair: Dict[str, str], error: Exception) -> Dict[str, Any]:
+        """建立失敗結果"""
+        self.logger.error(f"批次轉換失敗: {file_pair['source']} - {error}")
+        return create_result_dict(
+            success=False,
+            error=str(error),
+            source_file=file_pair['source']
+        )
+
+
+# 並行批次轉換的工作程序狀態
+_worker_converter: Optional[DocumentConverter] = None
+
+
+def _init_batch_worker(converter_kwargs: Dict[str, Any], templates: List[str], log_queue=None):
+    """工作程序初始化：配置日誌、預先載入函式庫並編譯模板"""
+    global _worker_converter
+    LoggerConfig.configure_worker_logging(log_queue)
+    
+    import docx  # noqa: F401  預先載入，避免第一個工作計入載入時間
+    import pptx  # noqa: F401
+    
+    _worker_converter = DocumentConverter(**converter_kwargs)
+    for template_file in templates:
+        try:
+            _worker_converter.template_compiler.compile(template_file)
+        except Exception as e:
+            _worker_converter.logger.warning(f"預先編譯模板失敗: {template_file} - {e}")
+
+
+def _convert_in_worker(index: int, file_pair: Dict[str, str], progress_queue=None) -> Dict[str, Any]:
+    """在工作程序中轉換單一檔案"""
+    progress_callback = None
+    if progress_queue is not None:
+        def progress_callback(current, total, message):
+            progress_queue.put((index, current, total, message))
+    
+    result = _worker_converter.convert_document(
+        file_pair['source'],
+        file_pair['template'],
+        file_pair.get('output'),
+        progress_callback
+    )
+    result['source_file'] = file_pair['source']
+    return result
+
+
+class ConverterPool:
+    """轉換器池 - 執行緒安全地重複使用已初始化的 DocumentConverter"""
+    
+    def __init__(self, max_size: int = 4, **converter_kwargs):
+        """
+        初始化轉換器池
+        
+        Args:
+            max_size: 最多建立的轉換器數（同時進行的轉換數上限）
+            **converter_kwargs: 建立 DocumentConverter 的參數
+        """
+        if max_size < 1:
+            raise ValueError(f"轉換器池大小必須至少為 1: {max_size}")
+        
+        self.max_size = max_size
+        self.converter_kwargs = converter_kwargs
+        self._idle: List[DocumentConverter] = []
+        self._created = 0
+        self._acquisitions = 0
+        self._closed = False
+        self._condition = threading.Condition()
+    
+    @contextmanager
+    def acquire(self, timeout: Optional[float] = None):
+        """
+        取得轉換器（with 陳述式結束時歸還）
+        
+        有閒置的轉換器時直接使用；未達上限時建立新的；否則等待其他執行緒歸還。
+        
+        Args:
+            timeout: 等待秒數（None 則一直等待）
+            
+        Yields:
+            DocumentConverter: 獨佔使用的轉換器
+            
+        Raises:
+            ConversionError: 轉換器池已關閉或等待逾時
+        """
+        converter = self._checkout(timeout)
+        try:
+            yield converter
+        finally:
+            self._checkin(converter)
+    
+    def close(self):
+        """關閉轉換器池：釋放閒置的轉換器，使用中的轉換器歸還時釋放"""
+        with self._condition:
+            self._closed = True
+            self._created -= len(self._idle)
+            self._idle.clear()
+            self._condition.notify_all()
+    
+    @property
+    def closed(self) -> bool:
+        """轉換器池是否已關閉"""
+        return self._closed
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        獲取轉換器池統計
+        
+        Returns:
+            Dict: 已建立、閒置、使用中的轉換器數與取用次數
+        """
+        with self._condition:
+            return {
+                'max_size': self.max_size,
+                'created': self._created,
+                'idle': len(self._idle),
+                'in_use': self._created - len(self._idle),
+                'acquisitions': self._acquisitions,
+                'closed': self._closed
+            }
+    
+    def __enter__(self) -> 'ConverterPool':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def _checkout(self, timeout: Optional[float]) -> DocumentConverter:
+        """取出或建立轉換器"""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise ConversionError("轉換器池已關閉", "POOL_CLOSED")
+                if self._idle:
+                    self._acquisitions += 1
+                    return self._idle.pop()
+                if self._created < self.max_size:
+                    # 先佔用名額，於鎖外建立轉換器
+                    self._created += 1
+                    self._acquisitions += 1
+                    break
+                
+                remaining = deadline - time.monotonic() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    raise ConversionError("等待可用的轉換器逾時", "POOL_TIMEOUT")
+                self._condition.wait(remaining)
+        
+        try:
+            return DocumentConverter(**self.converter_kwargs)
+        except Exception:
+            with self._condition:
+                self._created -= 1
+                self._condition.notify()
+            raise
+    
+    def _checkin(self, converter: DocumentConverter):
+        """歸還轉換器"""
+        # 追蹤區段只保留單次使用的內容，避免長時間重複使用時持續累積
+        converter.performance_monitor.tracer.clear()
+        
+        with self._condition:
+            if self._closed:
+                self._created -= 1
+            else:
+                self._idle.append(converter)
+            self._condition.notify()
+
+
+_default_pool: Optional[ConverterPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def get_default_converter_pool() -> ConverterPool:
+    """
+    獲取便利函數共用的轉換器池（首次使用時建立，共用程序內的解析快取）
+    
+    Returns:
+        ConverterPool: 共用的轉換器池
+    """
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None or _default_pool.closed:
+            _default_pool = ConverterPool(parse_cache=get_default_parse_cache())
+        return _default_pool
+
+
+def close_default_converter_pool():
+    """關閉便利函數共用的轉換器池（之後的呼叫會建立新的轉換器池）"""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is not None:
+            _default_pool.close()
+            _default_pool = None
 
 
 # 便利函數
 def convert_word_to_ppt(word_file: str, ppt_template: str, output_file: Optional[str] = None,
-                       progress_callback: Optional[Callable] = None) -> Dict[str, Any]:
+                       progress_callback: Optional[Callable] = None,
+                       incremental: bool = False, streaming: bool = False) -> Dict[str, Any]:
     """
     便利函數：Word 轉 PowerPoint
     
@@ -450,12 +1343,34 @@ def convert_word_to_ppt(word_file: str, ppt_template: str, output_file: Optional
         ppt_template: PowerPoint 模板路徑
         output_file: 輸出檔案路徑
         progress_callback: 進度回調函數
+        incremental: 是否增量轉換（只重新渲染與上次輸出相比有變更的章節）
+        streaming: 是否串流輸出（每張投影片完成後立即寫入輸出檔）
+        
+    Returns:
+        Dict: 轉換結果
+    """
+    with get_default_converter_pool().acquire() as converter:
+        return converter.convert_document(word_file, ppt_template, output_file, progress_callback,
+                                          incremental=incremental, streaming=streaming)
+
+
+def convert_word_bytes_to_ppt(word_data, ppt_template, progress_callback: Optional[Callable] = None,
+                              word_name: Optional[str] = None) -> Dict[str, Any]:
+    """
+    便利函數：轉換記憶體中的 Word 文檔，輸出內容以 output_data（memoryview）返回
+    
+    Args:
+        word_data: Word 文檔內容（bytes / memoryview、可讀取的二進位檔案物件或路徑）
+        ppt_template: PowerPoint 模板內容或路徑
+        progress_callback: 進度回調函數
+        word_name: Word 文檔顯示名稱
         
     Returns:
         Dict: 轉換結果
     """
-    converter = ConverterFactory.create_converter()
-    return converter.convert_document(word_file, ppt_template, output_file, progress_callback)
+    with get_default_converter_pool().acquire() as converter:
+        return converter.convert_bytes(word_data, ppt_template, progress_callback=progress_callback,
+                                       source_name=word_name)
 
 
 def analyze_document_structure(file_path: str) -> Dict[str, Any]:
@@ -468,5 +1383,5 @@ def analyze_document_structure(file_path: str) -> Dict[str, Any]:
     Returns:
         Dict: 分析結果
     """
-    converter = ConverterFactory.create_converter()
-    return converter.analyze_document(file_path)
\ No newline at end of file
+    with get_default_converter_pool().acquire() as converter:
+        return converter.analyze_document(file_path)
\ No newline at end of file
@@ -0,0 +1,150 @@
+"""
+文件輸入模組 - 以內容（ZIP 檔頭與 [Content_Types].xml）判斷文件格式，不依賴副檔名
+轉換可直接使用記憶體中的內容（bytes、memoryview 或檔案物件），不需寫入暫存檔
+"""
+
+from typing import Optional, Union, BinaryIO
+import codecs
+import io
+import os
+import zipfile
+
+
+FORMAT_DOCX = 'docx'
+FORMAT_PPTX = 'pptx'
+FORMAT_TEXT = 'text'
+
+ZIP_MAGIC = b'PK\x03\x04'
+CONTENT_TYPES_NAME = '[Content_Types].xml'
+CT_NS = 'http://schemas.openxmlformats.org/package/2006/content-types'
+
+# 主文件內容類型 → 格式（與 python-docx / python-pptx 接受的類型相同）
+MAIN_CONTENT_TYPES = {
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml': FORMAT_DOCX,
+    'application/vnd.openxmlformats-officedocument.presentationml.presentation.main+xml': FORMAT_PPTX,
+    'application/vnd.ms-powerpoint.presentation.macroEnabled.main+xml': FORMAT_PPTX
+}
+
+# 判斷純文字時讀取的位元組數
+TEXT_SNIFF_BYTES = 64 * 1024
+TEXT_ENCODING = 'utf-8-sig'
+
+MEMORY_NAME = '<memory>'
+
+
+class DocumentData:
+    """記憶體中的文件內容與偵測到的格式"""
+
+    def __init__(self, data: bytes, name: str = MEMORY_NAME, format: Optional[str] = None):
+        """
+        初始化文件內容
+
+        Args:
+            data: 文件內容
+            name: 顯示名稱（日誌、錯誤訊息與純文字檔的日期判斷使用）
+            format: 文件格式（None 則依內容偵測；無法辨識時為 None）
+        """
+        self.data = data
+        self.name = name
+        self.format = format if format is not None else detect_format(data)
+
+    def open(self) -> BinaryIO:
+        """以檔案物件讀取內容"""
+        return io.BytesIO(self.data)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __repr__(self) -> str:
+        return f"DocumentData({self.name!r}, format={self.format!r}, size={len(self.data)})"
+
+
+def load_document_data(source: Union[DocumentData, bytes, bytearray, memoryview, BinaryIO, str],
+                       name: Optional[str] = None) -> DocumentData:
+    """
+    讀取文件內容
+
+    Args:
+        source: DocumentData、bytes / bytearray / memoryview、可讀取的二進位檔案物件或檔案路徑
+        name: 顯示名稱（None 則使用檔案路徑或檔案物件的 name 屬性）
+
+    Returns:
+        DocumentData: 文件內容
+
+    Raises:
+        TypeError: 不支援的來源類型
+        OSError: 讀取檔案失敗時拋出
+    """
+    if isinstance(source, DocumentData):
+        return source
+    if isinstance(source, bytes):
+        return DocumentData(source, name or MEMORY_NAME)
+    if isinstance(source, (bytearray, memoryview)):
+        return DocumentData(bytes(source), name or MEMORY_NAME)
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            return DocumentData(f.read(), name or os.fspath(source))
+    if hasattr(source, 'read'):
+        data = source.read()
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            raise TypeError("檔案物件必須以二進位模式開啟")
+        source_name = getattr(source, 'name', None)
+        return DocumentData(bytes(data), name or (source_name if isinstance(source_name, str) else MEMORY_NAME))
+    raise TypeError(f"不支援的文件來源類型: {type(source).__name__}")
+
+
+def detect_format(source: Union[bytes, str]) -> Optional[str]:
+    """
+    依內容判斷文件格式
+
+    ZIP 套件依 [Content_Types].xml 中主文件的內容類型判斷 Word 或 PowerPoint；
+    不是 ZIP 且可解碼為 UTF-8 的內容視為純文字。
+
+    Args:
+        source: 文件內容或檔案路徑
+
+    Returns:
+        Optional[str]: FORMAT_DOCX / FORMAT_PPTX / FORMAT_TEXT；無法辨識時返回 None
+    """
+    if isinstance(source, (str, os.PathLike)):
+        try:
+            with open(source, 'rb') as f:
+                head = f.read(TEXT_SNIFF_BYTES)
+                if head.startswith(ZIP_MAGIC):
+                    f.seek(0)
+                    return _detect_package_format(f)
+        except OSError:
+            return None
+        return FORMAT_TEXT if _is_text(head) else None
+
+    if source[:len(ZIP_MAGIC)] == ZIP_MAGIC:
+        return _detect_package_format(io.BytesIO(source))
+    return FORMAT_TEXT if _is_text(source[:TEXT_SNIFF_BYTES]) else None
+
+
+def _detect_package_format(stream: BinaryIO) -> Optional[str]:
+    """Office 套件的主文件格式"""
+    from lxml import etree
+
+    try:
+        with zipfile.ZipFile(stream) as package:
+            root = etree.fromstring(package.read(CONTENT_TYPES_NAME))
+    except (zipfile.BadZipFile, KeyError, etree.XMLSyntaxError):
+        return None
+
+    for override in root.iterchildren(f'{{{CT_NS}}}Override'):
+        document_format = MAIN_CONTENT_TYPES.get(override.get('ContentType'))
+        if document_format is not None:
+            return document_format
+    return None
+
+
+def _is_text(head: bytes) -> bool:
+    """內容開頭是否為 UTF-8 純文字（截斷在多位元組字元中間時仍視為文字）"""
+    if b'\x00' in head:
+        return False
+    try:
+        codecs.getincrementaldecoder(TEXT_ENCODING)().decode(head, final=False)
+    except UnicodeDecodeError:
+        return False
+    return True
@@ -3,13 +3,16 @@
 提供統一的文件讀取、解析和結構化處理介面
 """
 
-from typing import Dict, List, Any, Optional
-from docx import Document
-from pptx import Presentation
+from typing import Dict, List, Any, Optional, Iterator, TYPE_CHECKING
 import os
-import re
 import logging
 from format_handler import FormatHandler
+from section_rules import SectionRuleSet
+from section_store import DocumentStore
+from document_io import FORMAT_DOCX, FORMAT_PPTX, DocumentData, detect_format, load_document_data
+
+if TYPE_CHECKING:
+    from docx.document import Document
 
 
 class DocumentParseError(Exception):
@@ -17,20 +20,115 @@ class DocumentParseError(Exception):
     pass
 
 
+class SectionBuilder:
+    """編號段落建構器 - 逐段落累積章節，供單次遍歷使用"""
+    
+    def __init__(self, section_rules):
+        """
+        初始化段落建構器
+        
+        Args:
+            section_rules: 章節切分規則集（SectionRuleSet）；也接受舊式正則表達式
+                （group 1 為編號，group 2 為標題）
+        """
+        if not isinstance(section_rules, SectionRuleSet):
+            section_rules = _LegacyPatternRules(section_rules)
+        self.section_rules = section_rules
+        self.current_section = None
+        # 熱迴圈中直接呼叫編譯好的 match，只有符合時才交給規則集解析
+        self._pattern_match = section_rules.pattern.match
+        self._heading_styles = section_rules.heading_styles
+    
+    def add(self, text: str, formatting: List[Dict[str, Any]],
+            style: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        加入一個非空段落
+        
+        Args:
+            text: 去除首尾空白的段落文本
+            formatting: 段落格式信息
+            style: 段落樣式名稱（供依樣式切分的規則使用）
+            
+        Returns:
+            Optional[Dict]: 若此段落開始新章節，返回已完成的前一個章節
+        """
+        completed = None
+        match = self._pattern_match(text)
+        
+        if match is not None or (style is not None and style in self._heading_styles):
+            completed = self.current_section
+            number, section_title, _ = self.section_rules.resolve(match, text, style)
+            if number is None:
+                # ◇ 或標題樣式等沒有編號的規則，依序自動編號
+                number = completed['number'] + 1 if completed is not None else 1
+            self.current_section = {
+                'number': number,
+                'title': section_title,
+                'content': [text],
+                'text_only': section_title,
+                'formatting': [formatting]
+            }
+        elif self.current_section is not None:
+            self.current_section['content'].append(text)
+            self.current_section['formatting'].append(formatting)
+            if self.current_section['text_only']:
+                self.current_section['text_only'] += '\n' + text
+            else:
+                self.current_section['text_only'] = text
+        else:
+            # 創建前言段落
+            self.current_section = {
+                'number': 0,
+                'title': '前言',
+                'content': [text],
+                'text_only': text,
+                'formatting': [formatting]
+            }
+        
+        return completed
+    
+    def finish(self) -> Optional[Dict[str, Any]]:
+        """結束建構並返回最後一個章節"""
+        last_section = self.current_section
+        self.current_section = None
+        return last_section
+
+
+class _LegacyPatternRules:
+    """將舊式章節正則表達式包裝為規則集介面"""
+
+    heading_styles = frozenset()
+
+    def __init__(self, pattern):
+        self.pattern = pattern
+
+    def resolve(self, match, text: str, style: Optional[str] = None):
+        return int(match.group(1)), match.group(2) or "", 'legacy'
+
+
 class WordDocumentParser:
     """Word 文件解析器"""
     
-    def __init__(self, format_handler: FormatHandler, logger: Optional[logging.Logger] = None):
+    # 解析結果結構變更時遞增，使舊的快取項目失效
+    PARSER_VERSION = 1
+    
+    def __init__(self, format_handler: FormatHandler, logger: Optional[logging.Logger] = None,
+                 parse_cache=None, section_rules: Optional[SectionRuleSet] = None):
         """
         初始化 Word 文件解析器
         
         Args:
             format_handler: 格式處理器
             logger: 日誌記錄器
+            parse_cache: 解析快取（ParseCache，None 則不使用快取）
+            section_rules: 章節切分規則集（None 則只依「N.」編號切分）
         """
         self.format_handler = format_handler
         self.logger = logger or logging.getLogger(__name__)
-        self.number_pattern = re.compile(r'^(\d+)\.\s*(.*)')
+        self.parse_cache = parse_cache
+        self.section_rules = section_rules or SectionRuleSet()
+        # 所有規則合併後的單一正則表達式
+        self.number_pattern = self.section_rules.pattern
     
     def parse_document(self, file_path: str) -> Dict[str, Any]:
         """
@@ -45,17 +143,68 @@ class WordDocumentParser:
         Raises:
             DocumentParseError: 解析失敗時拋出
         """
-        if not self._validate_file(file_path, '.docx'):
+        if not self._validate_file(file_path, FORMAT_DOCX):
             raise DocumentParseError(f"無效的 Word 文檔: {file_path}")
         
-        try:
-            doc = Document(file_path)
+        if self.parse_cache is None:
+            return self._parse(file_path)
+        
+        cache_key = self.parse_cache.make_key(file_path, self._get_parser_id())
+        return self._parse_cached(cache_key, file_path)
+    
+    def parse_data(self, source, name: Optional[str] = None) -> Dict[str, Any]:
+        """
+        解析記憶體中的 Word 文檔內容（不需寫入暫存檔）
+        
+        Args:
+            source: DocumentData、bytes / memoryview 或可讀取的二進位檔案物件
+            name: 顯示名稱（作為結果的 file_path）
+            
+        Returns:
+            Dict: 與 parse_document 相同的結果
             
-            # 解析基本內容
-            basic_content = self._extract_basic_content(doc)
+        Raises:
+            DocumentParseError: 內容不是 Word 文檔或解析失敗時拋出
+        """
+        document = load_document_data(source, name)
+        if document.format != FORMAT_DOCX:
+            raise DocumentParseError(f"無效的 Word 文檔: {document.name}")
+        
+        if self.parse_cache is None:
+            return self._parse(document.name, document.open())
+        
+        cache_key = self.parse_cache.make_data_key(document.data, self._get_parser_id())
+        return self._parse_cached(cache_key, document.name, document)
+    
+    def _parse_cached(self, cache_key: str, file_path: str,
+                      document: Optional[DocumentData] = None) -> Dict[str, Any]:
+        """經過快取解析（document 為 None 時從 file_path 讀取）"""
+        cached = self.parse_cache.get(cache_key)
+        if cached is not None:
+            cached['file_path'] = file_path
+            return cached
+        
+        result = self._parse(file_path, document.open() if document is not None else None)
+        self.parse_cache.put(cache_key, result)
+        return result
+    
+    def _parse(self, file_path: str, stream=None) -> Dict[str, Any]:
+        """
+        解析 Word 文檔（不經過快取）
+        
+        Args:
+            file_path: Word 文檔路徑（提供 stream 時只作為結果的 file_path）
+            stream: 文檔內容的二進位檔案物件（None 則開啟 file_path）
+        """
+        from docx import Document
+        
+        try:
+            doc = Document(stream if stream is not None else file_path)
             
-            # 解析編號段落
-            sections = self._parse_numbered_sections(doc)
+            # 單次遍歷：基本內容與編號段落
+            ingested = self._ingest_document(doc)
+            basic_content = ingested['basic_content']
+            sections = ingested['sections']
             
             # 提取元數據
             metadata = self._extract_metadata(doc)
@@ -74,6 +223,18 @@ class WordDocumentParser:
             self.logger.error(f"解析 Word 文檔失敗: {e}")
             raise DocumentParseError(f"解析 Word 文檔失敗: {e}")
     
+    def iter_sections(self, file_path: str) -> Iterator[Dict[str, Any]]:
+        """
+        逐一產生章節
+        
+        Args:
+            file_path: Word 文檔路徑
+            
+        Yields:
+            Dict: 章節資料
+        """
+        yield from self.parse_document(file_path)['sections']
+    
     def parse_numbered_sections(self, file_path: str) -> Dict[str, Any]:
         """
         解析編號段落（向後兼容的方法）
@@ -100,97 +261,89 @@ class WordDocumentParser:
                 'error': str(e)
             }
     
-    def _validate_file(self, file_path: str, extension: str) -> bool:
-        """驗證檔案"""
-        return (os.path.exists(file_path) and 
-                file_path.lower().endswith(extension))
+    def _validate_file(self, file_path: str, expected_format: str) -> bool:
+        """驗證檔案（依內容判斷格式，不檢查副檔名）"""
+        return os.path.isfile(file_path) and detect_format(file_path) == expected_format
     
-    def _extract_basic_content(self, doc: Document) -> Dict[str, Any]:
-        """提取基本內容"""
+    def _get_parser_id(self) -> str:
+        """解析器識別，作為快取鍵的一部分"""
+        return f"{self.__class__.__name__}:{self.PARSER_VERSION}:{self.section_rules.signature}"
+    
+    def _ingest_document(self, doc: 'Document') -> Dict[str, Any]:
+        """
+        單次遍歷段落，同時建立基本內容與編號段落
+
+        每個段落只讀取一次 ``paragraph.text`` 與格式信息，
+        產生的段落記錄同時供基本內容和章節切分使用。
+
+        Args:
+            doc: Word 文檔物件
+
+        Returns:
+            Dict: 包含 basic_content 和 sections 的字典
+        """
         paragraphs = []
-        tables = []
         full_text = []
-        
-        # 提取段落
+        builder = SectionBuilder(self.section_rules)
+        sections = []
+
         for paragraph in doc.paragraphs:
-            if paragraph.text.strip():
-                paragraph_data = {
-                    'text': paragraph.text,
-                    'style': paragraph.style.name if paragraph.style else None,
-                    'formatting': self.format_handler.extract_word_formatting(paragraph)
-                }
-                paragraphs.append(paragraph_data)
-                full_text.append(paragraph.text)
-        
-        # 提取表格
+            record = self._read_paragraph_record(paragraph)
+            if record is None:
+                continue
+
+            paragraphs.append({
+                'text': record['raw_text'],
+                'style': record['style'],
+                'formatting': record['formatting']
+            })
+            full_text.append(record['raw_text'])
+
+            completed = builder.add(record['text'], record['formatting'], record['style'])
+            if completed is not None:
+                sections.append(completed)
+
+        last_section = builder.finish()
+        if last_section is not None:
+            sections.append(last_section)
+
+        # 段落與章節轉為欄式儲存，逐段落的 dict 在此之後即可釋放
+        store = DocumentStore.build(paragraphs, sections)
+
+        basic_content = {
+            'paragraphs': store.paragraphs,
+            'tables': self._extract_tables(doc),
+            'text': '\n'.join(full_text)
+        }
+
+        return {'basic_content': basic_content, 'sections': store.sections}
+
+    def _read_paragraph_record(self, paragraph) -> Optional[Dict[str, Any]]:
+        """讀取段落記錄（空白段落返回 None）"""
+        raw_text = paragraph.text
+        text = raw_text.strip()
+        if not text:
+            return None
+
+        return {
+            'raw_text': raw_text,
+            'text': text,
+            'style': paragraph.style.name if paragraph.style else None,
+            'formatting': self.format_handler.extract_word_formatting(paragraph)
+        }
+
+    def _extract_tables(self, doc: 'Document') -> List[List[List[str]]]:
+        """提取表格"""
+        tables = []
         for table in doc.tables:
             table_data = []
             for row in table.rows:
                 row_data = [cell.text.strip() for cell in row.cells]
                 table_data.append(row_data)
             tables.append(table_data)
-        
-        return {
-            'paragraphs': paragraphs,
-            'tables': tables,
-            'text': '\n'.join(full_text)
-        }
-    
-    def _parse_numbered_sections(self, doc: Document) -> List[Dict[str, Any]]:
-        """解析編號段落"""
-        sections = []
-        current_section = None
-        
-        for paragraph in doc.paragraphs:
-            text = paragraph.text.strip()
-            if not text:
-                continue
-            
-            # 提取格式信息
-            paragraph_formatting = self.format_handler.extract_word_formatting(paragraph)
-            
-            match = self.number_pattern.match(text)
-            if match:
-                # 保存前一個段落
-                if current_section is not None:
-                    sections.append(current_section)
-                
-                # 開始新段落
-                section_number = int(match.group(1))
-                section_title = match.group(2) if match.group(2) else ""
-                
-                current_section = {
-                    'number': section_number,
-                    'title': section_title,
-                    'content': [text],
-                    'text_only': section_title,
-                    'formatting': [paragraph_formatting]
-                }
-            else:
-                if current_section is not None:
-                    current_section['content'].append(text)
-                    current_section['formatting'].append(paragraph_formatting)
-                    if current_section['text_only']:
-                        current_section['text_only'] += '\n' + text
-                    else:
-                        current_section['text_only'] = text
-                else:
-                    # 創建前言段落
-                    current_section = {
-                        'number': 0,
-                        'title': '前言',
-                        'content': [text],
-                        'text_only': text,
-                        'formatting': [paragraph_formatting]
-                    }
-        
-        # 保存最後一個段落
-        if current_section is not None:
-            sections.append(current_section)
-        
-        return sections
+        return tables
     
-    def _extract_metadata(self, doc: Document) -> Dict[str, Any]:
+    def _extract_metadata(self, doc: 'Document') -> Dict[str, Any]:
         """提取元數據"""
         try:
             core_props = doc.core_properties
@@ -235,13 +388,53 @@ class PowerPointDocumentParser:
         Raises:
             DocumentParseError: 解析失敗時拋出
         """
-        if not self._validate_file(file_path, '.pptx'):
+        return self.parse_slide_records(file_path, self.read_slide_records(file_path))
+    
+    def read_slide_records(self, file_path: str) -> List[Dict[str, Any]]:
+        """
+        開啟 PowerPoint 文檔一次，建立每張投影片的形狀記錄
+        
+        記錄同時供文本提取（parse_slide_records）與結構統計
+        （SlideAnalyzer.analyze_slide_records）使用，不必重複開檔與走訪形狀。
+        
+        Args:
+            file_path: PowerPoint 文檔路徑
+            
+        Returns:
+            List[Dict]: 每張投影片的記錄（見 build_slide_record）
+            
+        Raises:
+            DocumentParseError: 解析失敗時拋出
+        """
+        if not self._validate_file(file_path, FORMAT_PPTX):
             raise DocumentParseError(f"無效的 PowerPoint 文檔: {file_path}")
         
+        from pptx import Presentation
+        
         try:
             prs = Presentation(file_path)
+            return [self.build_slide_record(slide, slide_num)
+                    for slide_num, slide in enumerate(prs.slides, 1)]
+        except Exception as e:
+            self.logger.error(f"解析 PowerPoint 文檔失敗: {e}")
+            raise DocumentParseError(f"解析 PowerPoint 文檔失敗: {e}")
+    
+    def parse_slide_records(self, file_path: str, slide_records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        由形狀記錄建立解析結果（與 parse_document 相同結構）
+        
+        Args:
+            file_path: PowerPoint 文檔路徑
+            slide_records: read_slide_records 的結果
             
-            slides = self._parse_slides(prs)
+        Returns:
+            Dict: 包含文檔內容的字典
+            
+        Raises:
+            DocumentParseError: 解析失敗時拋出
+        """
+        try:
+            slides = self._parse_slides(slide_records)
             
             return {
                 'file_path': file_path,
@@ -256,6 +449,51 @@ class PowerPointDocumentParser:
             self.logger.error(f"解析 PowerPoint 文檔失敗: {e}")
             raise DocumentParseError(f"解析 PowerPoint 文檔失敗: {e}")
     
+    @classmethod
+    def build_slide_record(cls, slide, slide_number: int) -> Dict[str, Any]:
+        """
+        走訪投影片的形狀一次，建立形狀記錄
+        
+        Args:
+            slide: 投影片物件
+            slide_number: 投影片編號（從 1 開始）
+            
+        Returns:
+            Dict: 投影片記錄，包含：
+                - slide_number: 投影片編號
+                - layout_name: 版面配置名稱
+                - shapes: 每個形狀的記錄：
+                    - text: 形狀文本（形狀沒有 text 屬性時為 None）
+                    - has_text_frame: 形狀是否有 text_frame
+                    - has_shape_type / shape_type: 形狀類型（只在文本提取或結構統計需要時讀取）
+                    - table_data: 表格數據（不是表格時為 None）
+        """
+        shapes = []
+        for shape in slide.shapes:
+            text = getattr(shape, 'text', None)
+            has_text_frame = hasattr(shape, 'text_frame')
+            
+            record = {'text': text, 'has_text_frame': has_text_frame,
+                      'has_shape_type': False, 'shape_type': None, 'table_data': None}
+            
+            # 有文本的形狀需要類型說明；非文本形狀需要類型統計
+            is_text_shape = has_text_frame and text is not None
+            if (text is not None and text.strip()) or not is_text_shape:
+                if hasattr(shape, 'shape_type'):
+                    record['has_shape_type'] = True
+                    record['shape_type'] = shape.shape_type
+            
+            if hasattr(shape, 'has_table') and shape.has_table:
+                record['table_data'] = cls._extract_table_data(shape.table)
+            
+            shapes.append(record)
+        
+        return {
+            'slide_number': slide_number,
+            'layout_name': slide.slide_layout.name if slide.slide_layout else 'Unknown',
+            'shapes': shapes
+        }
+    
     def analyze_template_slide(self, slide) -> Dict[str, Any]:
         """
         分析模板投影片的格式特徵
@@ -331,25 +569,24 @@ class PowerPointDocumentParser:
         
         return analysis
     
-    def _validate_file(self, file_path: str, extension: str) -> bool:
-        """驗證檔案"""
-        return (os.path.exists(file_path) and 
-                file_path.lower().endswith(extension))
+    def _validate_file(self, file_path: str, expected_format: str) -> bool:
+        """驗證檔案（依內容判斷格式，不檢查副檔名）"""
+        return os.path.isfile(file_path) and detect_format(file_path) == expected_format
     
-    def _parse_slides(self, prs: Presentation) -> List[Dict[str, Any]]:
+    def _parse_slides(self, slide_records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """解析投影片"""
         slides = []
         
-        for slide_num, slide in enumerate(prs.slides, 1):
+        for record in slide_records:
             slide_data = {
-                'slide_number': slide_num,
+                'slide_number': record['slide_number'],
                 'title': '',
                 'content': [],
                 'text_runs': [],
-                'layout_name': slide.slide_layout.name if slide.slide_layout else 'Unknown'
+                'layout_name': record['layout_name']
             }
             
-            slide_text = self._extract_slide_text(slide, slide_data)
+            slide_text = self._extract_slide_text(record['shapes'], slide_data)
             slide_data['content'] = slide_text
             slide_data['full_text'] = '\n'.join(slide_text)
             
@@ -361,17 +598,18 @@ class PowerPointDocumentParser:
         
         return slides
     
-    def _extract_slide_text(self, slide, slide_data: Dict[str, Any]) -> List[str]:
+    def _extract_slide_text(self, shape_records: List[Dict[str, Any]],
+                            slide_data: Dict[str, Any]) -> List[str]:
         """提取投影片文本"""
         slide_text = []
         
-        for shape in slide.shapes:
-            if hasattr(shape, "text") and shape.text.strip():
-                text_content = shape.text.strip()
+        for shape in shape_records:
+            if shape['text'] is not None and shape['text'].strip():
+                text_content = shape['text'].strip()
                 slide_text.append(text_content)
                 slide_data['text_runs'].append({
                     'text': text_content,
-                    'shape_type': str(shape.shape_type) if hasattr(shape, 'shape_type') else 'Unknown'
+                    'shape_type': str(shape['shape_type']) if shape['has_shape_type'] else 'Unknown'
                 })
                 
                 # 嘗試識別標題
@@ -382,19 +620,19 @@ class PowerPointDocumentParser:
                     slide_data['title'] = text_content
             
             # 處理表格內容
-            if hasattr(shape, 'has_table') and shape.has_table:
-                table_data = self._extract_table_data(shape.table)
-                if table_data:
-                    slide_data['text_runs'].append({
-                        'text': f"[表格: {len(table_data)}行]",
-                        'shape_type': 'Table',
-                        'table_data': table_data
-                    })
-                    slide_text.extend([cell for row in table_data for cell in row if cell])
+            table_data = shape['table_data']
+            if table_data:
+                slide_data['text_runs'].append({
+                    'text': f"[表格: {len(table_data)}行]",
+                    'shape_type': 'Table',
+                    'table_data': table_data
+                })
+                slide_text.extend([cell for row in table_data for cell in row if cell])
         
         return slide_text
     
-    def _extract_table_data(self, table) -> List[List[str]]:
+    @staticmethod
+    def _extract_table_data(table) -> List[List[str]]:
         """提取表格數據"""
         table_data = []
         for row in table.rows:
@@ -432,14 +670,17 @@ class DocumentParserFactory:
     
     @staticmethod
     def create_parser(file_type: str, format_handler: FormatHandler, 
-                     logger: Optional[logging.Logger] = None):
+                     logger: Optional[logging.Logger] = None, parse_cache=None,
+                     section_rules: Optional[SectionRuleSet] = None):
         """
         創建文件解析器
         
         Args:
-            file_type: 文件類型 ('word' 或 'powerpoint')
+            file_type: 文件類型 ('word'、'word_stream' 或 'powerpoint')
             format_handler: 格式處理器
             logger: 日誌記錄器
+            parse_cache: Word 解析快取（僅 Word 解析器使用）
+            section_rules: 章節切分規則集（僅 Word 解析器使用）
             
         Returns:
             文件解析器實例
@@ -448,7 +689,10 @@ class DocumentParserFactory:
             ValueError: 不支持的文件類型
         """
         if file_type.lower() in ['word', 'docx']:
-            return WordDocumentParser(format_handler, logger)
+            return WordDocumentParser(format_handler, logger, parse_cache, section_rules)
+        elif file_type.lower() in ['word_stream', 'docx_stream']:
+            from docx_stream_parser import StreamingWordDocumentParser
+            return StreamingWordDocumentParser(format_handler, logger, parse_cache, section_rules)
         elif file_type.lower() in ['powerpoint', 'pptx']:
             return PowerPointDocumentParser(format_handler, logger)
         else:
@@ -458,7 +702,7 @@ class DocumentParserFactory:
     def create_parser_from_file(file_path: str, format_handler: FormatHandler,
                                logger: Optional[logging.Logger] = None):
         """
-        根據檔案路徑創建解析器
+        根據檔案內容（而非副檔名）創建解析器
         
         Args:
             file_path: 檔案路徑
@@ -468,9 +712,10 @@ class DocumentParserFactory:
         Returns:
             文件解析器實例
         """
-        if file_path.lower().endswith('.docx'):
+        file_format = detect_format(file_path)
+        if file_format == FORMAT_DOCX:
             return WordDocumentParser(format_handler, logger)
-        elif file_path.lower().endswith('.pptx'):
+        elif file_format == FORMAT_PPTX:
             return PowerPointDocumentParser(format_handler, logger)
         else:
             raise ValueError(f"不支持的檔案格式: {file_path}")
\ No newline at end of file
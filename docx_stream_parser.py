@@ -0,0 +1,386 @@
+"""
+串流 Word 解析模組 - 以 zipfile + lxml 直接串流讀取 document.xml
+不建立 python-docx 的物件模型，逐段落處理；輸出與 WordDocumentParser 相同（SectionList）
+"""
+
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+from datetime import datetime, timezone
+import zipfile
+import logging
+from lxml import etree
+from format_handler import FormatHandler
+from document_parser import WordDocumentParser, SectionBuilder, DocumentParseError
+from section_rules import SectionRuleSet
+from section_store import DocumentStore, SectionView
+from document_io import FORMAT_DOCX
+
+
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+W = '{%s}' % W_NS
+
+DOCUMENT_PART = 'word/document.xml'
+STYLES_PART = 'word/styles.xml'
+CORE_PROPS_PART = 'docProps/core.xml'
+
+CORE_PROPS_NS = {
+    'cp': 'http://schemas.openxmlformats.org/package/2006/metadata/core-properties',
+    'dc': 'http://purl.org/dc/elements/1.1/',
+    'dcterms': 'http://purl.org/dc/terms/'
+}
+
+# 與 python-docx BabelFish 相同的內建樣式名稱對照
+_UI_STYLE_NAMES = {'caption': 'Caption', 'footer': 'Footer', 'header': 'Header'}
+_UI_STYLE_NAMES.update({f'heading {i}': f'Heading {i}' for i in range(1, 10)})
+
+_OFF_VALUES = ('0', 'false', 'off')
+
+
+class StreamingWordDocumentParser(WordDocumentParser):
+    """串流 Word 文件解析器 - 輸出與 WordDocumentParser 相同的資料結構"""
+
+    def __init__(self, format_handler: FormatHandler, logger: Optional[logging.Logger] = None,
+                 parse_cache=None, section_rules: Optional[SectionRuleSet] = None):
+        """
+        初始化串流 Word 文件解析器
+
+        Args:
+            format_handler: 格式處理器
+            logger: 日誌記錄器
+            parse_cache: 解析快取（ParseCache，None 則不使用快取）
+            section_rules: 章節切分規則集（None 則只依「N.」編號切分）
+        """
+        super().__init__(format_handler, logger, parse_cache, section_rules)
+        # 延遲載入 python-docx 的值類型，使格式資料與 python-docx 後端一致
+        from docx.shared import Pt, RGBColor
+        from docx.enum.text import WD_UNDERLINE
+        self._pt = Pt
+        self._rgb_color = RGBColor
+        self._underline = WD_UNDERLINE
+
+    def _parse(self, file_path: str, stream=None) -> Dict[str, Any]:
+        """串流解析 Word 文檔（輸出與 WordDocumentParser 相同結構；提供 stream 時從 stream 讀取）"""
+        try:
+            paragraphs = []
+            tables = []
+            full_text = []
+            sections = []
+            builder = SectionBuilder(self.section_rules)
+
+            with zipfile.ZipFile(stream if stream is not None else file_path) as package:
+                for block_type, block in self._iter_body_blocks(package):
+                    if block_type == 'table':
+                        tables.append(block)
+                        continue
+
+                    paragraphs.append({
+                        'text': block['raw_text'],
+                        'style': block['style'],
+                        'formatting': block['formatting']
+                    })
+                    full_text.append(block['raw_text'])
+
+                    completed = builder.add(block['text'], block['formatting'], block['style'])
+                    if completed is not None:
+                        sections.append(completed)
+
+                metadata = self._read_core_properties(package)
+
+            last_section = builder.finish()
+            if last_section is not None:
+                sections.append(last_section)
+
+            store = DocumentStore.build(paragraphs, sections)
+
+            return {
+                'file_path': file_path,
+                'basic_content': {
+                    'paragraphs': store.paragraphs,
+                    'tables': tables,
+                    'text': '\n'.join(full_text)
+                },
+                'sections': store.sections,
+                'metadata': metadata,
+                'total_sections': len(sections),
+                'success': True,
+                'error': None
+            }
+
+        except Exception as e:
+            self.logger.error(f"串流解析 Word 文檔失敗: {e}")
+            raise DocumentParseError(f"串流解析 Word 文檔失敗: {e}")
+
+    def iter_sections(self, file_path: str) -> Iterator[SectionView]:
+        """
+        逐一產生章節（與 parse_document 的 sections 項目相同型別）
+
+        每個章節以只含該章節段落的 DocumentStore 保存，不收集表格與全文。
+
+        Args:
+            file_path: Word 文檔路徑
+
+        Yields:
+            SectionView: 章節資料
+
+        Raises:
+            DocumentParseError: 解析失敗時拋出
+        """
+        if not self._validate_file(file_path, FORMAT_DOCX):
+            raise DocumentParseError(f"無效的 Word 文檔: {file_path}")
+
+        builder = SectionBuilder(self.section_rules)
+        # 尚未交出的章節段落（目前段落開始新章節時，前面的段落都屬於已完成的章節）
+        pending = []
+
+        try:
+            with zipfile.ZipFile(file_path) as package:
+                for block_type, block in self._iter_body_blocks(package, include_tables=False):
+                    pending.append({
+                        'text': block['raw_text'],
+                        'style': block['style'],
+                        'formatting': block['formatting']
+                    })
+                    completed = builder.add(block['text'], block['formatting'], block['style'])
+                    if completed is not None:
+                        yield self._section_view(pending, completed)
+        except DocumentParseError:
+            raise
+        except (zipfile.BadZipFile, KeyError, etree.XMLSyntaxError) as e:
+            self.logger.error(f"串流解析 Word 文檔失敗: {e}")
+            raise DocumentParseError(f"串流解析 Word 文檔失敗: {e}")
+
+        last_section = builder.finish()
+        if last_section is not None:
+            yield self._section_view(pending, last_section)
+
+    @staticmethod
+    def _section_view(pending: List[Dict[str, Any]], section: Dict[str, Any]) -> SectionView:
+        """以章節的段落建立單一章節的 DocumentStore，並從 pending 移除這些段落"""
+        count = len(section['content'])
+        store = DocumentStore.build(pending[:count], [section])
+        del pending[:count]
+        return store.sections[0]
+
+    def _iter_body_blocks(self, package: zipfile.ZipFile,
+                          include_tables: bool = True) -> Iterator[Tuple[str, Any]]:
+        """
+        串流讀取 document.xml 的本文區塊
+
+        只處理 w:body 的直接子元素（與 doc.paragraphs / doc.tables 相同範圍），
+        每個區塊處理完即清除，使記憶體用量不隨文件大小增長。
+
+        Yields:
+            Tuple[str, Any]: ('paragraph', 段落記錄) 或 ('table', 表格資料)
+        """
+        style_names, default_style = self._read_paragraph_styles(package)
+        body_tag = W + 'body'
+
+        with package.open(DOCUMENT_PART) as stream:
+            context = etree.iterparse(stream, events=('end',), tag=(W + 'p', W + 'tbl'))
+
+            for _, element in context:
+                parent = element.getparent()
+                if parent is None or parent.tag != body_tag:
+                    continue
+
+                if element.tag == W + 'p':
+                    record = self._read_paragraph_element(element, style_names, default_style)
+                    if record is not None:
+                        yield 'paragraph', record
+                elif include_tables:
+                    yield 'table', self._read_table_element(element)
+
+                # 釋放已處理的元素及其前面的兄弟節點
+                element.clear()
+                while element.getprevious() is not None:
+                    del parent[0]
+
+            del context
+
+    def _read_paragraph_element(self, p_element, style_names: Dict[str, str],
+                                default_style: Optional[str]) -> Optional[Dict[str, Any]]:
+        """讀取段落元素（空白段落返回 None）"""
+        text_parts = []
+        formatting = []
+
+        for child in p_element:
+            if child.tag == W + 'r':
+                run_text = self._run_text(child)
+                text_parts.append(run_text)
+                formatting.append(self._run_formatting(child, run_text))
+            elif child.tag == W + 'hyperlink':
+                for run in child.iterchildren(W + 'r'):
+                    text_parts.append(self._run_text(run))
+
+        raw_text = ''.join(text_parts)
+        text = raw_text.strip()
+        if not text:
+            return None
+
+        p_style = p_element.find(f'{W}pPr/{W}pStyle')
+        style_id = p_style.get(W + 'val') if p_style is not None else None
+        style = style_names.get(style_id, default_style) if style_id else default_style
+
+        return {
+            'raw_text': raw_text,
+            'text': text,
+            'style': style,
+            'formatting': formatting
+        }
+
+    def _run_text(self, r_element) -> str:
+        """取得運行文本（與 python-docx 的 Run.text 轉換規則一致）"""
+        parts = []
+        for child in r_element:
+            tag = child.tag
+            if tag == W + 't':
+                parts.append(child.text or '')
+            elif tag in (W + 'tab', W + 'ptab'):
+                parts.append('\t')
+            elif tag == W + 'cr':
+                parts.append('\n')
+            elif tag == W + 'br':
+                if child.get(W + 'type', 'textWrapping') == 'textWrapping':
+                    parts.append('\n')
+            elif tag == W + 'noBreakHyphen':
+                parts.append('-')
+        return ''.join(parts)
+
+    def _run_formatting(self, r_element, run_text: str) -> Dict[str, Any]:
+        """提取運行的直接格式（與 FormatHandler.extract_word_formatting 相同的鍵）"""
+        rPr = r_element.find(W + 'rPr')
+        # 相同 w:rPr 內容的運行共用同一份格式（鍵加上前綴，與 python-docx 後端的項目分開）
+        key = ('stream', None if rPr is None else etree.tostring(rPr))
+        style = self.format_handler.word_styles.intern(key, lambda: self._rPr_style(rPr))
+        return {'text': run_text, **style}
+
+    def _rPr_style(self, rPr) -> Dict[str, Any]:
+        """解析 w:rPr 為運行格式（不含文本）"""
+        style = {
+            'font_name': None,
+            'font_size': None,
+            'font_bold': None,
+            'font_italic': None,
+            'font_underline': None,
+            'font_color': None
+        }
+
+        if rPr is None:
+            return style
+
+        for child in rPr:
+            tag = child.tag
+            val = child.get(W + 'val')
+            try:
+                if tag == W + 'rFonts':
+                    style['font_name'] = child.get(W + 'ascii')
+                elif tag == W + 'sz' and val is not None:
+                    style['font_size'] = self._pt(int(val) / 2.0)
+                elif tag == W + 'b':
+                    style['font_bold'] = val not in _OFF_VALUES
+                elif tag == W + 'i':
+                    style['font_italic'] = val not in _OFF_VALUES
+                elif tag == W + 'u' and val is not None:
+                    style['font_underline'] = self._convert_underline(val)
+                elif tag == W + 'color':
+                    if val and val != 'auto':
+                        style['font_color'] = self._rgb_color.from_string(val)
+                    elif child.get(W + 'themeColor'):
+                        style['font_color'] = 'theme_color'
+            except ValueError as e:
+                self.logger.warning(f"解析運行格式失敗: {e}")
+
+        return style
+
+    def _convert_underline(self, val: str):
+        """轉換底線值（True=單線、False=無、其他為 WD_UNDERLINE 成員）"""
+        if val == 'single':
+            return True
+        if val == 'none':
+            return False
+        try:
+            return self._underline.from_xml(val)
+        except (KeyError, ValueError):
+            return True
+
+    def _read_table_element(self, tbl_element) -> List[List[str]]:
+        """讀取表格元素為二維文本陣列"""
+        table_data = []
+        for tr in tbl_element.iterchildren(W + 'tr'):
+            row_data = []
+            for tc in tr.iterchildren(W + 'tc'):
+                paragraphs = []
+                for p in tc.iterchildren(W + 'p'):
+                    paragraphs.append(''.join(
+                        self._run_text(r) for r in p.iter(W + 'r')))
+                cell_text = '\n'.join(paragraphs).strip()
+
+                # 合併儲存格與 python-docx 一樣重複出現
+                span = tc.find(f'{W}tcPr/{W}gridSpan')
+                repeat = int(span.get(W + 'val', '1')) if span is not None else 1
+                row_data.extend([cell_text] * repeat)
+            table_data.append(row_data)
+        return table_data
+
+    def _read_paragraph_styles(self, package: zipfile.ZipFile) -> Tuple[Dict[str, str], Optional[str]]:
+        """讀取段落樣式 ID 到名稱的對照表及預設段落樣式"""
+        style_names = {}
+        default_style = None
+
+        try:
+            with package.open(STYLES_PART) as stream:
+                styles_root = etree.parse(stream).getroot()
+        except KeyError:
+            return style_names, default_style
+
+        for style in styles_root.iterchildren(W + 'style'):
+            if style.get(W + 'type') != 'paragraph':
+                continue
+            name_element = style.find(W + 'name')
+            if name_element is None:
+                continue
+            name = name_element.get(W + 'val')
+            name = _UI_STYLE_NAMES.get(name, name)
+            style_names[style.get(W + 'styleId')] = name
+            if style.get(W + 'default') in ('1', 'true', 'on'):
+                default_style = name
+
+        return style_names, default_style
+
+    def _read_core_properties(self, package: zipfile.ZipFile) -> Dict[str, Any]:
+        """提取元數據（鍵與 WordDocumentParser._extract_metadata 相同）"""
+        try:
+            with package.open(CORE_PROPS_PART) as stream:
+                root = etree.parse(stream).getroot()
+        except KeyError:
+            return {}
+        except Exception as e:
+            self.logger.warning(f"提取元數據失敗: {e}")
+            return {}
+
+        def text_of(path: str) -> str:
+            return root.findtext(path, default='', namespaces=CORE_PROPS_NS) or ''
+
+        return {
+            'title': text_of('dc:title'),
+            'author': text_of('dc:creator'),
+            'subject': text_of('dc:subject'),
+            'created': self._parse_w3cdtf(text_of('dcterms:created')),
+            'modified': self._parse_w3cdtf(text_of('dcterms:modified')),
+            'category': text_of('cp:category'),
+            'comments': text_of('dc:description')
+        }
+
+    @staticmethod
+    def _parse_w3cdtf(value: str) -> Optional[datetime]:
+        """解析 W3CDTF 日期字串"""
+        if not value:
+            return None
+        is_utc = value.endswith('Z')
+        value = value.rstrip('Z')[:19]
+        for fmt in ('%Y-%m-%dT%H:%M:%S', '%Y-%m-%d'):
+            try:
+                parsed = datetime.strptime(value, fmt)
+                return parsed.replace(tzinfo=timezone.utc) if is_utc else parsed
+            except ValueError:
+                continue
+        return None
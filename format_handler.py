@@ -3,12 +3,72 @@
 負責處理 Word 和 PowerPoint 之間的格式轉換邏輯
 """
 
-from typing import Dict, Any, Optional, List
-from pptx.enum.dml import MSO_FILL_TYPE
-from pptx.util import Pt
+from typing import Dict, Any, Optional, List, Callable
+import copy
 import logging
 
 
+# 建立投影片運行格式範本失敗的標記（之後的相同格式直接使用屬性設定）
+_TEMPLATE_FAILED = object()
+
+
+class StyleTable:
+    """
+    格式享元表 - 相同的格式只建立一次，之後遇到的運行共用同一份
+
+    鍵由呼叫端決定（例如 Word 運行的 w:rPr 內容），值在第一次遇到時由 factory 建立。
+    共用的值不可修改。
+    """
+
+    def __init__(self):
+        """初始化格式享元表"""
+        self._entries: Dict[Any, Any] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def intern(self, key, factory: Callable[[], Any]) -> Any:
+        """
+        取得鍵對應的共用值（不存在時以 factory 建立）
+
+        Args:
+            key: 格式鍵（必須可雜湊）
+            factory: 建立值的函數
+
+        Returns:
+            Any: 共用值
+        """
+        try:
+            value = self._entries[key]
+        except KeyError:
+            value = self._entries[key] = factory()
+            self.misses += 1
+            return value
+        self.hits += 1
+        return value
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self):
+        """清除所有格式（統計保留）"""
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        獲取享元表統計
+
+        Returns:
+            Dict: 命中、未命中次數、命中率與不同格式數
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'styles': len(self._entries)
+        }
+
+
 class FormatHandler:
     """格式處理器 - 負責統一處理格式轉換"""
     
@@ -20,6 +80,18 @@ class FormatHandler:
             logger: 日誌記錄器
         """
         self.logger = logger or logging.getLogger(__name__)
+        # Word 運行格式（鍵為 w:rPr 內容）與投影片運行的 a:rPr 範本（鍵為格式值）
+        self.word_styles = StyleTable()
+        self.ppt_styles = StyleTable()
+    
+    def get_style_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        獲取格式享元表統計
+        
+        Returns:
+            Dict: word_runs（提取 Word 格式）與 ppt_runs（應用到投影片）的統計
+        """
+        return {'word_runs': self.word_styles.get_stats(), 'ppt_runs': self.ppt_styles.get_stats()}
     
     def extract_word_formatting(self, paragraph) -> List[Dict[str, Any]]:
         """
@@ -31,41 +103,17 @@ class FormatHandler:
         Returns:
             List[Dict]: 格式資訊列表
         """
+        from lxml import etree
+        
         formatting_data = []
         
         try:
             for run in paragraph.runs:
-                run_format = {
-                    'text': run.text,
-                    'font_name': None,
-                    'font_size': None,
-                    'font_bold': None,
-                    'font_italic': None,
-                    'font_underline': None,
-                    'font_color': None
-                }
-                
-                if hasattr(run, 'font'):
-                    font = run.font
-                    run_format.update({
-                        'font_name': font.name,
-                        'font_size': font.size,
-                        'font_bold': font.bold,
-                        'font_italic': font.italic,
-                        'font_underline': font.underline
-                    })
-                    
-                    # 提取顏色信息
-                    try:
-                        if hasattr(font, 'color') and font.color:
-                            if hasattr(font.color, 'rgb') and font.color.rgb:
-                                run_format['font_color'] = font.color.rgb
-                            elif hasattr(font.color, 'theme_color') and font.color.theme_color:
-                                run_format['font_color'] = 'theme_color'
-                    except Exception as e:
-                        self.logger.warning(f"提取字體顏色失敗: {e}")
-                
-                formatting_data.append(run_format)
+                # 格式只取決於運行的直接格式 w:rPr，相同內容的運行共用同一份格式
+                rPr = run._r.rPr
+                key = None if rPr is None else etree.tostring(rPr)
+                style = self.word_styles.intern(key, lambda: self._extract_word_run_style(run))
+                formatting_data.append({'text': run.text, **style})
                 
         except Exception as e:
             self.logger.error(f"提取 Word 格式失敗: {e}")
@@ -205,24 +253,20 @@ class FormatHandler:
             bool: 是否成功應用
         """
         try:
-            if word_format.get('font_name'):
-                ppt_run.font.name = word_format['font_name']
-            if word_format.get('font_size'):
-                ppt_run.font.size = word_format['font_size']
-            if word_format.get('font_bold') is not None:
-                ppt_run.font.bold = word_format['font_bold']
-            if word_format.get('font_italic') is not None:
-                ppt_run.font.italic = word_format['font_italic']
-            if word_format.get('font_underline') is not None:
-                ppt_run.font.underline = word_format['font_underline']
-            
-            # 應用顏色
-            if word_format.get('font_color') and word_format['font_color'] != 'theme_color':
-                try:
-                    ppt_run.font.color.rgb = word_format['font_color']
-                except Exception as e:
-                    self.logger.warning(f"應用字體顏色失敗: {e}")
+            r = ppt_run._r
+            rPr = r.rPr
+            if rPr is None or (len(rPr) == 0 and not rPr.attrib):
+                # 新運行：複製同一格式第一次建立的 a:rPr
+                template = self.ppt_styles.intern(self._ppt_style_key(word_format),
+                                                  lambda: self._build_ppt_rPr(word_format))
+                if template is not _TEMPLATE_FAILED:
+                    if template is not None:
+                        if rPr is not None:
+                            r.remove(rPr)
+                        r.insert(0, copy.deepcopy(template))
+                    return True
             
+            self._set_ppt_font(ppt_run, word_format)
             return True
             
         except Exception as e:
@@ -274,6 +318,100 @@ class FormatHandler:
             return False
     
     # 私有方法
+    def _extract_word_run_style(self, run) -> Dict[str, Any]:
+        """提取 Word 運行的格式（不含文本）"""
+        style = {
+            'font_name': None,
+            'font_size': None,
+            'font_bold': None,
+            'font_italic': None,
+            'font_underline': None,
+            'font_color': None
+        }
+        
+        if hasattr(run, 'font'):
+            font = run.font
+            style.update({
+                'font_name': font.name,
+                'font_size': font.size,
+                'font_bold': font.bold,
+                'font_italic': font.italic,
+                'font_underline': font.underline
+            })
+            
+            # 提取顏色信息
+            try:
+                if hasattr(font, 'color') and font.color:
+                    if hasattr(font.color, 'rgb') and font.color.rgb:
+                        style['font_color'] = font.color.rgb
+                    elif hasattr(font.color, 'theme_color') and font.color.theme_color:
+                        style['font_color'] = 'theme_color'
+            except Exception as e:
+                self.logger.warning(f"提取字體顏色失敗: {e}")
+        
+        return style
+    
+    @staticmethod
+    def _ppt_style_key(word_format: Dict[str, Any]) -> tuple:
+        """
+        投影片運行格式鍵：只包含會被應用的值
+        
+        值連同型別一起比較，避免 True、1 與 WD_UNDERLINE.SINGLE 被視為相同格式。
+        """
+        color = word_format.get('font_color')
+        values = (
+            word_format.get('font_name') or None,
+            word_format.get('font_size') or None,
+            word_format.get('font_bold'),
+            word_format.get('font_italic'),
+            word_format.get('font_underline'),
+            color if color and color != 'theme_color' else None
+        )
+        return tuple((type(value), value) for value in values)
+    
+    def _build_ppt_rPr(self, word_format: Dict[str, Any]):
+        """
+        在暫用的運行上應用格式，取出 a:rPr 作為範本
+        
+        Returns:
+            a:rPr 元素（格式沒有任何值時為 None）；設定失敗時返回 _TEMPLATE_FAILED
+        """
+        from pptx.oxml import parse_xml
+        from pptx.oxml.ns import nsdecls
+        from pptx.text.text import _Run
+        
+        r = parse_xml(f'<a:r {nsdecls("a")}><a:t/></a:r>')
+        try:
+            self._set_ppt_font(_Run(r, None), word_format)
+        except Exception as e:
+            self.logger.debug(f"建立運行格式範本失敗，改為逐一設定屬性: {e}")
+            return _TEMPLATE_FAILED
+        
+        rPr = r.rPr
+        if rPr is not None:
+            r.remove(rPr)
+        return rPr
+    
+    def _set_ppt_font(self, ppt_run, word_format: Dict[str, Any]):
+        """以 python-pptx 屬性逐一設定運行格式"""
+        if word_format.get('font_name'):
+            ppt_run.font.name = word_format['font_name']
+        if word_format.get('font_size'):
+            ppt_run.font.size = word_format['font_size']
+        if word_format.get('font_bold') is not None:
+            ppt_run.font.bold = word_format['font_bold']
+        if word_format.get('font_italic') is not None:
+            ppt_run.font.italic = word_format['font_italic']
+        if word_format.get('font_underline') is not None:
+            ppt_run.font.underline = word_format['font_underline']
+        
+        # 應用顏色
+        if word_format.get('font_color') and word_format['font_color'] != 'theme_color':
+            try:
+                ppt_run.font.color.rgb = word_format['font_color']
+            except Exception as e:
+                self.logger.warning(f"應用字體顏色失敗: {e}")
+    
     def _extract_run_format(self, run, paragraph) -> Dict[str, Any]:
         """提取運行格式信息"""
         format_info = {
@@ -297,6 +435,8 @@ class FormatHandler:
     
     def _get_default_formats(self) -> Dict[str, Any]:
         """獲取預設格式"""
+        from pptx.util import Pt
+        
         basic_format = {
             'font_name': 'Arial',
             'font_size': Pt(24),
@@ -325,6 +465,8 @@ class FormatHandler:
         """複製填充格式"""
         if not (hasattr(source_shape, 'fill') and hasattr(target_shape, 'fill')):
             return
+        
+        from pptx.enum.dml import MSO_FILL_TYPE
             
         try:
             if hasattr(source_shape.fill, 'type'):
@@ -349,6 +491,8 @@ class FormatHandler:
         """複製線條格式"""
         if not (hasattr(source_shape, 'line') and hasattr(target_shape, 'line')):
             return
+        
+        from pptx.util import Pt
             
         try:
             line_width_pt = 0
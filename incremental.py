@@ -0,0 +1,522 @@
+"""
+增量轉換模組 - 以輸出檔旁的清單（manifest）記錄每個章節的內容雜湊與對應投影片
+重新轉換時只渲染內容變更或新增的章節，未變更的投影片部件與媒體直接從上次的輸出複製
+"""
+
+from typing import Dict, List, Any, Optional, Tuple
+import hashlib
+import io
+import json
+import logging
+import os
+import posixpath
+import re
+import tempfile
+import zipfile
+from section_store import encode_run
+from package_writer import PassthroughZipWriter, PackageWriteError, ZipSource
+
+
+MANIFEST_SUFFIX = '.manifest.json'
+MANIFEST_VERSION = 2
+
+CT_NS = 'http://schemas.openxmlformats.org/package/2006/content-types'
+PR_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+P_NS = 'http://schemas.openxmlformats.org/presentationml/2006/main'
+R_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+
+RT_OFFICE_DOCUMENT = R_NS + '/officeDocument'
+RT_SLIDE = R_NS + '/slide'
+
+CT_SLIDE = 'application/vnd.openxmlformats-officedocument.presentationml.slide+xml'
+CT_NOTES_SLIDE = 'application/vnd.openxmlformats-officedocument.presentationml.notesSlide+xml'
+
+CONTENT_TYPES_NAME = '[Content_Types].xml'
+ROOT_RELS_NAME = '_rels/.rels'
+MIN_SLIDE_ID = 256
+MAX_SLIDE_ID = 2147483647
+
+
+class IncrementalUpdateError(Exception):
+    """增量更新錯誤"""
+    pass
+
+
+def get_manifest_path(output_file: str) -> str:
+    """輸出檔的清單路徑（<輸出檔>.manifest.json）"""
+    return output_file + MANIFEST_SUFFIX
+
+
+def hash_section(section: Dict[str, Any]) -> str:
+    """
+    章節內容雜湊（編號、標題、段落文字與運行格式）
+
+    編號會顯示在投影片上（「編號. 標題」），自動編號的章節在前面插入或刪除章節後也必須重新渲染。
+
+    Args:
+        section: 章節資料
+
+    Returns:
+        str: SHA-256 十六進位字串
+    """
+    payload = [
+        section.get('number'),
+        section.get('title', ''),
+        section.get('content', []),
+        [[encode_run(run) for run in runs] for runs in section.get('formatting', [])]
+    ]
+    encoded = json.dumps(payload, ensure_ascii=False, separators=(',', ':'), default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def hash_file(file_path: str) -> str:
+    """檔案內容的 SHA-256"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ConversionManifest:
+    """轉換清單 - 記錄輸出檔每張投影片對應的章節雜湊、部件名稱與投影片 ID"""
+
+    def __init__(self, template_hash: str, options: str, output_hash: str,
+                 slides: List[Dict[str, Any]]):
+        """
+        初始化轉換清單
+
+        Args:
+            template_hash: 模板內容雜湊
+            options: 影響渲染結果的轉換選項（例如投影片複製方式）
+            output_hash: 輸出檔內容雜湊（輸出檔被其他程式修改時不做增量更新）
+            slides: 依順序每張投影片的 {'hash', 'partname', 'slide_id'}；
+                hash 為 None 表示該章節上次轉換失敗，下次必定重新渲染
+        """
+        self.template_hash = template_hash
+        self.options = options
+        self.output_hash = output_hash
+        self.slides = slides
+
+    @classmethod
+    def load(cls, output_file: str) -> Optional['ConversionManifest']:
+        """
+        讀取輸出檔的清單
+
+        Returns:
+            Optional[ConversionManifest]: 清單不存在、無法解析或版本不同時返回 None
+        """
+        try:
+            with open(get_manifest_path(output_file), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != MANIFEST_VERSION:
+                return None
+            return cls(data['template_hash'], data['options'], data['output_hash'], data['slides'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save(self, output_file: str):
+        """寫入清單（先寫暫存檔再取代，避免留下不完整的清單）"""
+        manifest_path = get_manifest_path(output_file)
+        temp_path = f"{manifest_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, manifest_path)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """轉為可序列化的字典"""
+        return {
+            'version': MANIFEST_VERSION,
+            'template_hash': self.template_hash,
+            'options': self.options,
+            'output_hash': self.output_hash,
+            'slides': self.slides
+        }
+
+    def is_compatible(self, template_hash: str, options: str, output_file: str) -> bool:
+        """
+        是否可以用此清單對輸出檔做增量更新
+
+        模板或轉換選項改變、輸出檔不存在或已被修改時都必須完整轉換。
+        """
+        return (bool(self.slides) and
+                self.template_hash == template_hash and
+                self.options == options and
+                os.path.exists(output_file) and
+                hash_file(output_file) == self.output_hash)
+
+
+def plan_incremental_update(previous_slides: List[Dict[str, Any]],
+                            section_hashes: List[str]) -> Dict[str, Any]:
+    """
+    比較上次的投影片與本次的章節雜湊，決定每個章節沿用或重新渲染
+
+    相同雜湊的章節依序沿用上次的投影片（章節順序改變時只需重排投影片）。
+
+    Args:
+        previous_slides: 清單中的投影片記錄
+        section_hashes: 本次每個章節的雜湊
+
+    Returns:
+        Dict: 規劃，包含：
+            - order: 依新順序每個章節的 {'index', 'partname'}（partname 為 None 表示需重新渲染）
+            - render: 需重新渲染的章節索引
+            - unused: 不再使用的舊投影片部件名稱
+            - replaced: 不再使用的舊投影片中由重新渲染的章節取代的張數（章節內容變更）
+            - removed: 其餘不再使用的舊投影片張數（章節已刪除）
+            - unchanged: 輸出檔是否完全不需修改
+    """
+    available: Dict[str, List[str]] = {}
+    for slide in previous_slides:
+        if slide.get('hash'):
+            available.setdefault(slide['hash'], []).append(slide['partname'])
+
+    order = []
+    render = []
+    for index, digest in enumerate(section_hashes):
+        candidates = available.get(digest)
+        partname = candidates.pop(0) if candidates else None
+        order.append({'index': index, 'partname': partname})
+        if partname is None:
+            render.append(index)
+
+    reused = {entry['partname'] for entry in order if entry['partname'] is not None}
+    unused = [slide['partname'] for slide in previous_slides if slide['partname'] not in reused]
+    # 編輯過的章節雜湊改變，無法逐一對應；以張數配對，多出的舊投影片才是被刪除的章節
+    replaced = min(len(unused), len(render))
+
+    unchanged = (not render and not unused and
+                 [entry['partname'] for entry in order] ==
+                 [slide['partname'] for slide in previous_slides])
+
+    return {'order': order, 'render': render, 'unused': unused, 'replaced': replaced,
+            'removed': len(unused) - replaced, 'unchanged': unchanged}
+
+
+class SlidePackageSplicer:
+    """
+    投影片套件拼接器 - 在 ZIP/部件層級更新上次的輸出檔
+
+    沿用的投影片、版面配置與媒體部件原封不動地複製；重新渲染的投影片從另一份
+    只含變更章節的演示文稿（delta）匯入，再依新順序重建 p:sldIdLst。
+    每次拼接使用一個新的實例。
+    """
+
+    def __init__(self, base_file: str, logger: Optional[logging.Logger] = None):
+        """
+        初始化投影片套件拼接器
+
+        Args:
+            base_file: 上次的輸出檔
+            logger: 日誌記錄器
+        """
+        self.base_file = base_file
+        self.logger = logger or logging.getLogger(__name__)
+
+        self._parts: Dict[str, bytes] = {}
+        self._infos: Dict[str, zipfile.ZipInfo] = {}
+        self._source: Optional[ZipSource] = None
+        self._base_parts: Dict[str, bytes] = {}
+        self._delta: Optional[zipfile.ZipFile] = None
+        self._delta_types: Tuple[Dict[str, str], Dict[str, str]] = ({}, {})
+        self._content_types = None
+        self._imported: Dict[str, str] = {}
+        self._next_index: Dict[Tuple[str, str], int] = {}
+        self._rels_targets: Dict[str, Tuple[bytes, List[str]]] = {}
+
+    def splice(self, order: List[Tuple[str, str]], output_file: str,
+               delta_blob: Optional[bytes] = None) -> List[Dict[str, Any]]:
+        """
+        依新順序組合投影片並寫入輸出檔
+
+        Args:
+            order: 依新順序的 (來源, 部件名稱)；來源為 'base'（沿用上次的投影片）
+                或 'delta'（從 delta 匯入）
+            output_file: 輸出路徑（可與 base_file 相同）
+            delta_blob: 只含重新渲染投影片的演示文稿內容
+
+        Returns:
+            List[Dict]: 依新順序每張投影片的 {'partname', 'slide_id'}
+
+        Raises:
+            IncrementalUpdateError: 套件結構不符合預期時拋出
+        """
+        from lxml import etree
+
+        with open(self.base_file, 'rb') as f:
+            base_blob = f.read()
+        self._source = ZipSource(base_blob)
+        with zipfile.ZipFile(io.BytesIO(base_blob)) as base:
+            for info in base.infolist():
+                self._infos[info.filename] = info
+                self._parts[info.filename] = base.read(info)
+        # 內容未被取代的部件寫入時直接複製原本的壓縮資料
+        self._base_parts = dict(self._parts)
+
+        if delta_blob is not None:
+            self._delta = zipfile.ZipFile(io.BytesIO(delta_blob))
+            self._delta_types = self._parse_content_types(
+                etree.fromstring(self._delta.read(CONTENT_TYPES_NAME)))
+
+        try:
+            self._content_types = etree.fromstring(self._parts[CONTENT_TYPES_NAME])
+            reachable_before = self._reachable_parts()
+            slides = self._rebuild_slide_list(order)
+            self._remove_unreachable(reachable_before - self._reachable_parts())
+            self._parts[CONTENT_TYPES_NAME] = self._serialize(self._content_types)
+            self._write(output_file)
+        except KeyError as e:
+            raise IncrementalUpdateError(f"輸出檔缺少必要的部件: {e}")
+        except PackageWriteError as e:
+            raise IncrementalUpdateError(f"寫入輸出檔失敗: {e}")
+        finally:
+            if self._delta is not None:
+                self._delta.close()
+
+        self.logger.debug(f"已拼接 {len(slides)} 張投影片，匯入 {len(self._imported)} 個部件")
+        return slides
+
+    def _rebuild_slide_list(self, order: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """更新 presentation.xml 的 p:sldIdLst 與投影片關聯"""
+        from lxml import etree
+
+        presentation = self._main_document_partname()
+        presentation_rels_name = _rels_name(presentation)
+        rels_root = etree.fromstring(self._parts[presentation_rels_name])
+        presentation_root = etree.fromstring(self._parts[_zip_name(presentation)])
+
+        sld_id_lst = presentation_root.find(f'{{{P_NS}}}sldIdLst')
+        if sld_id_lst is None:
+            raise IncrementalUpdateError("輸出檔沒有投影片清單")
+
+        slide_rels = {rel.get('Id'): rel for rel in rels_root.iterchildren(f'{{{PR_NS}}}Relationship')
+                      if rel.get('Type') == RT_SLIDE}
+        existing = {}
+        for sld_id in sld_id_lst.iterchildren(f'{{{P_NS}}}sldId'):
+            rId = sld_id.get(f'{{{R_NS}}}id')
+            partname = _resolve_target(presentation, slide_rels[rId].get('Target'))
+            existing[partname] = (int(sld_id.get('id')), rId)
+
+        used_ids = {rel.get('Id') for rel in rels_root}
+        next_rId = max((int(rId[3:]) for rId in used_ids if re.fullmatch(r'rId\d+', rId)), default=0) + 1
+        next_slide_id = max([MIN_SLIDE_ID - 1] + [slide_id for slide_id, _ in existing.values()]) + 1
+
+        slides = []
+        kept_rIds = set()
+        for source, partname in order:
+            if source == 'base':
+                slide_id, rId = existing[partname]
+            else:
+                partname = self._import_part(partname)
+                while f'rId{next_rId}' in used_ids:
+                    next_rId += 1
+                rId = f'rId{next_rId}'
+                used_ids.add(rId)
+                if next_slide_id > MAX_SLIDE_ID:
+                    raise IncrementalUpdateError("投影片 ID 已用盡")
+                slide_id = next_slide_id
+                next_slide_id += 1
+                etree.SubElement(rels_root, f'{{{PR_NS}}}Relationship', {
+                    'Id': rId, 'Type': RT_SLIDE, 'Target': _relative_target(presentation, partname)})
+            kept_rIds.add(rId)
+            slides.append({'partname': partname, 'slide_id': slide_id, 'rId': rId})
+
+        for rId, rel in slide_rels.items():
+            if rId not in kept_rIds:
+                rels_root.remove(rel)
+
+        for sld_id in list(sld_id_lst):
+            sld_id_lst.remove(sld_id)
+        for slide in slides:
+            etree.SubElement(sld_id_lst, f'{{{P_NS}}}sldId',
+                             {'id': str(slide['slide_id']), f'{{{R_NS}}}id': slide['rId']})
+
+        self._parts[presentation_rels_name] = self._serialize(rels_root)
+        self._parts[_zip_name(presentation)] = self._serialize(presentation_root)
+        return [{'partname': slide['partname'], 'slide_id': slide['slide_id']} for slide in slides]
+
+    def _import_part(self, delta_partname: str) -> str:
+        """
+        從 delta 匯入部件（連同其關聯指向的部件），返回在輸出檔中的部件名稱
+
+        與上次輸出內容完全相同的部件（版面配置、母片、媒體等）直接沿用；
+        投影片與備忘稿一律以新的部件名稱加入。
+        """
+        if delta_partname in self._imported:
+            return self._imported[delta_partname]
+
+        data = self._delta.read(_zip_name(delta_partname))
+        rels_name = _rels_name(delta_partname)
+        rels_data = self._delta.read(rels_name) if rels_name in self._delta.NameToInfo else None
+        content_type = self._delta_content_type(delta_partname)
+
+        if (content_type not in (CT_SLIDE, CT_NOTES_SLIDE) and
+                self._parts.get(_zip_name(delta_partname)) == data and
+                self._parts.get(rels_name) == rels_data):
+            self._imported[delta_partname] = delta_partname
+            return delta_partname
+
+        partname = self._fresh_partname(delta_partname)
+        # 先登記再處理關聯，投影片與備忘稿互相指向時不會無限遞迴
+        self._imported[delta_partname] = partname
+        self._parts[_zip_name(partname)] = data
+        if rels_data is not None:
+            self._parts[_rels_name(partname)] = self._remap_rels(rels_data, delta_partname, partname)
+        self._register_content_type(partname, delta_partname, content_type)
+        return partname
+
+    def _remap_rels(self, rels_data: bytes, delta_partname: str, partname: str) -> bytes:
+        """匯入部件的關聯：目標部件一併匯入並改寫為新的相對路徑"""
+        from lxml import etree
+
+        rels_root = etree.fromstring(rels_data)
+        for rel in rels_root.iterchildren(f'{{{PR_NS}}}Relationship'):
+            if rel.get('TargetMode') == 'External':
+                continue
+            target = self._import_part(_resolve_target(delta_partname, rel.get('Target')))
+            rel.set('Target', _relative_target(partname, target))
+        return self._serialize(rels_root)
+
+    def _fresh_partname(self, partname: str) -> str:
+        """輸出檔中尚未使用的部件名稱（例如 /ppt/slides/slide12.xml）"""
+        match = re.match(r'^(.*?)(\d*)(\.[^./]+)$', partname)
+        prefix, extension = (match.group(1), match.group(3)) if match else (partname, '')
+        index = self._next_index.get((prefix, extension), 1)
+        while _zip_name(f"{prefix}{index}{extension}") in self._parts:
+            index += 1
+        self._next_index[(prefix, extension)] = index + 1
+        return f"{prefix}{index}{extension}"
+
+    def _delta_content_type(self, partname: str) -> Optional[str]:
+        """delta 中部件的內容類型"""
+        defaults, overrides = self._delta_types
+        if partname in overrides:
+            return overrides[partname]
+        return defaults.get(posixpath.splitext(partname)[1][1:].lower())
+
+    def _register_content_type(self, partname: str, delta_partname: str, content_type: Optional[str]):
+        """為匯入的部件加入內容類型"""
+        from lxml import etree
+
+        defaults, overrides = self._delta_types
+        extension = posixpath.splitext(partname)[1][1:].lower()
+        if delta_partname in overrides:
+            etree.SubElement(self._content_types, f'{{{CT_NS}}}Override',
+                             {'PartName': partname, 'ContentType': content_type})
+            return
+
+        base_defaults, _ = self._parse_content_types(self._content_types)
+        if extension not in base_defaults and content_type is not None:
+            default = etree.Element(f'{{{CT_NS}}}Default',
+                                    {'Extension': extension, 'ContentType': content_type})
+            # Default 元素必須排在 Override 之前
+            self._content_types.insert(0, default)
+
+    def _remove_unreachable(self, partnames):
+        """移除因刪除投影片而不再被引用的部件（及其關聯與內容類型）"""
+        for partname in partnames:
+            self._parts.pop(_zip_name(partname), None)
+            self._parts.pop(_rels_name(partname), None)
+        for override in list(self._content_types.iterchildren(f'{{{CT_NS}}}Override')):
+            if override.get('PartName') in partnames:
+                self._content_types.remove(override)
+
+    def _reachable_parts(self) -> set:
+        """從套件根關聯出發可到達的所有部件"""
+        from lxml import etree
+
+        reachable = set()
+        pending = [('/', ROOT_RELS_NAME)]
+        while pending:
+            source, rels_name = pending.pop()
+            rels_data = self._parts.get(rels_name)
+            if rels_data is None:
+                continue
+
+            # 關聯內容未改變時沿用上次解析的目標
+            cached = self._rels_targets.get(rels_name)
+            if cached is None or cached[0] is not rels_data:
+                targets = [_resolve_target(source, rel.get('Target'))
+                           for rel in etree.fromstring(rels_data).iterchildren(f'{{{PR_NS}}}Relationship')
+                           if rel.get('TargetMode') != 'External']
+                cached = self._rels_targets[rels_name] = (rels_data, targets)
+
+            for target in cached[1]:
+                if target not in reachable:
+                    reachable.add(target)
+                    pending.append((target, _rels_name(target)))
+        return reachable
+
+    def _main_document_partname(self) -> str:
+        """主文件（presentation.xml）的部件名稱"""
+        from lxml import etree
+
+        for rel in etree.fromstring(self._parts[ROOT_RELS_NAME]).iterchildren(f'{{{PR_NS}}}Relationship'):
+            if rel.get('Type') == RT_OFFICE_DOCUMENT:
+                return _resolve_target('/', rel.get('Target'))
+        raise IncrementalUpdateError("輸出檔缺少主文件關聯")
+
+    def _write(self, output_file: str):
+        """寫入暫存檔後取代輸出檔（未修改的部件直接複製壓縮資料）"""
+        directory = os.path.dirname(os.path.abspath(output_file))
+        fd, temp_path = tempfile.mkstemp(prefix='.incremental_', suffix='.pptx', dir=directory)
+        try:
+            names = [CONTENT_TYPES_NAME] + [name for name in self._parts if name != CONTENT_TYPES_NAME]
+            with os.fdopen(fd, 'wb') as f:
+                writer = PassthroughZipWriter(f)
+                for name in names:
+                    data = self._parts[name]
+                    info = self._infos.get(name)
+                    if self._base_parts.get(name) is data and name in self._source.entries:
+                        writer.copy(self._source, self._source.entries[name])
+                    else:
+                        writer.write(name, data, info.date_time if info is not None else (1980, 1, 1, 0, 0, 0))
+                writer.close()
+            self.logger.debug(f"直接複製 {writer.stats['copied_parts']} 個部件，"
+                              f"重新壓縮 {writer.stats['compressed_parts']} 個部件")
+            if os.path.exists(output_file):
+                # mkstemp 建立的檔案只有擁有者可讀寫，沿用原輸出檔的權限
+                os.chmod(temp_path, os.stat(output_file).st_mode & 0o7777)
+            os.replace(temp_path, output_file)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    @staticmethod
+    def _parse_content_types(root) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """解析 [Content_Types].xml 為 (副檔名 → 類型, 部件名稱 → 類型)"""
+        defaults = {element.get('Extension').lower(): element.get('ContentType')
+                    for element in root.iterchildren(f'{{{CT_NS}}}Default')}
+        overrides = {element.get('PartName'): element.get('ContentType')
+                     for element in root.iterchildren(f'{{{CT_NS}}}Override')}
+        return defaults, overrides
+
+    @staticmethod
+    def _serialize(element) -> bytes:
+        """序列化 XML 部件"""
+        from lxml import etree
+        return etree.tostring(element, xml_declaration=True, encoding='UTF-8', standalone=True)
+
+
+def _zip_name(partname: str) -> str:
+    """部件名稱轉為 ZIP 項目名稱"""
+    return partname.lstrip('/')
+
+
+def _rels_name(partname: str) -> str:
+    """部件的關聯 ZIP 項目名稱（例如 ppt/slides/_rels/slide1.xml.rels）"""
+    directory, filename = posixpath.split(partname)
+    return _zip_name(posixpath.join(directory, '_rels', f"{filename}.rels"))
+
+
+def _resolve_target(source_partname: str, target: str) -> str:
+    """關聯目標轉為絕對部件名稱"""
+    if target.startswith('/'):
+        return posixpath.normpath(target)
+    return posixpath.normpath(posixpath.join(posixpath.dirname(source_partname), target))
+
+
+def _relative_target(source_partname: str, target_partname: str) -> str:
+    """絕對部件名稱轉為相對於來源部件的關聯目標"""
+    return posixpath.relpath(target_partname, posixpath.dirname(source_partname))
@@ -5,10 +5,12 @@
 
 import logging
 import sys
-from typing import Optional, Any, Dict
+import threading
+from typing import Optional, Any, Dict, Tuple
 from pathlib import Path
 from datetime import datetime
 from enum import Enum
+from tracing import Tracer
 
 
 class LogLevel(Enum):
@@ -47,6 +49,18 @@ class SlideError(ConversionError):
 class LoggerConfig:
     """日誌配置管理器"""
     
+    # 每個日誌記錄器目前的配置：名稱 -> (配置簽章, setup_logger 參數)
+    _configured: Dict[str, Tuple[tuple, Dict[str, Any]]] = {}
+    # 共用的處理器：同一個日誌檔只開啟一次，同一個輸出串流只建立一個處理器
+    _file_handlers: Dict[str, logging.Handler] = {}
+    _console_handlers: Dict[int, logging.Handler] = {}
+    # 佇列模式：記錄經 QueueHandler 交給背景 QueueListener 寫出
+    _log_queue = None
+    _queue_handler: Optional[logging.Handler] = None
+    _queue_listener = None
+    _queue_multiprocess = False
+    _lock = threading.RLock()
+    
     @staticmethod
     def setup_logger(
         name: str = "document_converter",
@@ -58,6 +72,9 @@ class LoggerConfig:
         """
         設置日誌記錄器
         
+        以相同參數重複呼叫時直接返回已配置的記錄器，不會重建處理器或重新開啟日誌檔；
+        啟用佇列模式時，記錄器只掛上共用的 QueueHandler。
+        
         Args:
             name: 日誌記錄器名稱
             level: 日誌級別
@@ -68,40 +85,175 @@ class LoggerConfig:
         Returns:
             logging.Logger: 配置好的日誌記錄器
         """
-        logger = logging.getLogger(name)
-        logger.setLevel(level.value)
+        if file_output and log_file is None:
+            log_file = LoggerConfig._get_default_log_file()
         
-        # 清除現有的處理器
-        logger.handlers.clear()
+        with LoggerConfig._lock:
+            queue_handler = LoggerConfig._queue_handler
+            signature = (
+                level.value,
+                str(Path(log_file).resolve()) if file_output else None,
+                id(sys.stdout) if console_output else None,
+                id(queue_handler) if queue_handler is not None else None
+            )
+            
+            logger = logging.getLogger(name)
+            configured = LoggerConfig._configured.get(name)
+            if configured is not None and configured[0] == signature and logger.handlers:
+                return logger
+            
+            logger.setLevel(level.value)
+            
+            # 移除現有的處理器（共用處理器不關閉）
+            logger.handlers.clear()
+            
+            if queue_handler is not None:
+                logger.addHandler(queue_handler)
+            else:
+                # 控制台處理器
+                if console_output:
+                    logger.addHandler(LoggerConfig._get_console_handler())
+                
+                # 檔案處理器
+                if file_output:
+                    logger.addHandler(LoggerConfig._get_file_handler(log_file))
+            
+            # 避免重複記錄
+            logger.propagate = False
+            
+            LoggerConfig._configured[name] = (signature, {
+                'level': level,
+                'log_file': log_file,
+                'console_output': console_output,
+                'file_output': file_output
+            })
         
-        # 設置格式器
-        formatter = LoggerConfig._get_formatter()
+        return logger
+    
+    @staticmethod
+    def is_configured(name: str) -> bool:
+        """日誌記錄器是否已由 setup_logger 配置"""
+        with LoggerConfig._lock:
+            return name in LoggerConfig._configured
+    
+    @staticmethod
+    def enable_queue_logging(log_file: Optional[str] = None, console_output: bool = True,
+                             file_output: bool = True, multiprocess: bool = False):
+        """
+        啟用佇列日誌：所有記錄器改掛 QueueHandler，由單一背景 QueueListener 寫出
         
-        # 控制台處理器
-        if console_output:
-            console_handler = logging.StreamHandler(sys.stdout)
-            console_handler.setLevel(level.value)
-            console_handler.setFormatter(formatter)
-            logger.addHandler(console_handler)
+        Args:
+            log_file: 日誌檔案路徑（None 則使用預設）
+            console_output: 是否輸出到控制台
+            file_output: 是否輸出到檔案
+            multiprocess: 是否使用跨程序佇列（工作程序的記錄也交由此監聽器寫出）
+        """
+        import logging.handlers
         
-        # 檔案處理器
-        if file_output:
-            if log_file is None:
-                log_file = LoggerConfig._get_default_log_file()
+        with LoggerConfig._lock:
+            if LoggerConfig._queue_listener is not None:
+                return
             
-            # 確保日誌目錄存在
-            log_path = Path(log_file)
-            log_path.parent.mkdir(parents=True, exist_ok=True)
+            if multiprocess:
+                import multiprocessing
+                log_queue = multiprocessing.Queue(-1)
+            else:
+                import queue
+                log_queue = queue.SimpleQueue()
             
-            file_handler = logging.FileHandler(log_file, encoding='utf-8')
-            file_handler.setLevel(level.value)
-            file_handler.setFormatter(formatter)
-            logger.addHandler(file_handler)
+            handlers = []
+            if console_output:
+                handlers.append(LoggerConfig._get_console_handler())
+            if file_output:
+                handlers.append(LoggerConfig._get_file_handler(
+                    log_file or LoggerConfig._get_default_log_file()))
+            
+            listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+            listener.start()
+            
+            LoggerConfig._log_queue = log_queue
+            LoggerConfig._queue_multiprocess = multiprocess
+            LoggerConfig._queue_listener = listener
+            LoggerConfig._queue_handler = logging.handlers.QueueHandler(log_queue)
+            LoggerConfig._reconfigure_all()
+    
+    @staticmethod
+    def disable_queue_logging():
+        """停用佇列日誌：寫出佇列中剩餘的記錄，並讓記錄器改回直接寫出"""
+        with LoggerConfig._lock:
+            listener = LoggerConfig._queue_listener
+            LoggerConfig._queue_handler = None
+            LoggerConfig._reconfigure_all()
+            
+            if listener is not None:
+                listener.stop()
+            LoggerConfig._queue_listener = None
+            LoggerConfig._log_queue = None
+            LoggerConfig._queue_multiprocess = False
+    
+    @staticmethod
+    def get_worker_log_queue():
+        """
+        獲取可傳給工作程序的日誌佇列
+        
+        Returns:
+            跨程序佇列（未以 multiprocess=True 啟用佇列日誌時返回 None）
+        """
+        with LoggerConfig._lock:
+            return LoggerConfig._log_queue if LoggerConfig._queue_multiprocess else None
+    
+    @staticmethod
+    def configure_worker_logging(log_queue=None):
+        """
+        配置工作程序的日誌
         
-        # 避免重複記錄
-        logger.propagate = False
+        有佇列時記錄交由主程序的監聽器寫出；沒有佇列時改為直接寫出，
+        並捨棄 fork 時從主程序繼承、但在工作程序中沒有監聽器的佇列設定。
         
-        return logger
+        Args:
+            log_queue: get_worker_log_queue 返回的佇列（None 則直接寫出）
+        """
+        import logging.handlers
+        
+        with LoggerConfig._lock:
+            LoggerConfig._queue_listener = None
+            LoggerConfig._log_queue = log_queue
+            LoggerConfig._queue_multiprocess = log_queue is not None
+            LoggerConfig._queue_handler = (logging.handlers.QueueHandler(log_queue)
+                                           if log_queue is not None else None)
+            LoggerConfig._reconfigure_all()
+    
+    @staticmethod
+    def _reconfigure_all():
+        """以原本的參數重新配置所有記錄器（切換佇列模式時使用）"""
+        for name, (_, kwargs) in list(LoggerConfig._configured.items()):
+            LoggerConfig.setup_logger(name, **kwargs)
+    
+    @staticmethod
+    def _get_console_handler() -> logging.Handler:
+        """獲取目前 sys.stdout 的共用控制台處理器"""
+        stream = sys.stdout
+        handler = LoggerConfig._console_handlers.get(id(stream))
+        if handler is None or getattr(handler, 'stream', None) is not stream:
+            handler = logging.StreamHandler(stream)
+            handler.setFormatter(LoggerConfig._get_formatter())
+            LoggerConfig._console_handlers[id(stream)] = handler
+        return handler
+    
+    @staticmethod
+    def _get_file_handler(log_file: str) -> logging.Handler:
+        """獲取日誌檔的共用檔案處理器（首次寫入時才開啟檔案）"""
+        log_path = Path(log_file).resolve()
+        key = str(log_path)
+        handler = LoggerConfig._file_handlers.get(key)
+        if handler is None:
+            # 確保日誌目錄存在
+            log_path.parent.mkdir(parents=True, exist_ok=True)
+            
+            handler = logging.FileHandler(key, encoding='utf-8', delay=True)
+            handler.setFormatter(LoggerConfig._get_formatter())
+            LoggerConfig._file_handlers[key] = handler
+        return handler
     
     @staticmethod
     def _get_formatter() -> logging.Formatter:
@@ -203,33 +355,79 @@ class ErrorHandler:
 class PerformanceMonitor:
     """性能監控器"""
     
-    def __init__(self, logger: Optional[logging.Logger] = None):
+    def __init__(self, logger: Optional[logging.Logger] = None, tracer: Optional[Tracer] = None,
+                 tracing: bool = False):
         """
         初始化性能監控器
         
         Args:
             logger: 日誌記錄器
+            tracer: 區段追蹤器（None 則自動建立）
+            tracing: 自動建立的追蹤器是否保留區段（供 export_chrome_trace 匯出）
         """
         self.logger = logger or LoggerConfig.setup_logger()
-        self.start_times = {}
+        self.tracer = tracer or Tracer(enabled=tracing)
+        # 每個執行緒各自的進行中操作：操作名稱 -> (開始時間, 區段) 堆疊
+        self._local = threading.local()
+    
+    @property
+    def start_times(self) -> Dict[str, datetime]:
+        """目前執行緒進行中操作的開始時間"""
+        return {operation: entries[-1][0]
+                for operation, entries in self._open_spans().items() if entries}
     
-    def start_timing(self, operation: str):
-        """開始計時"""
-        self.start_times[operation] = datetime.now()
+    def start_timing(self, operation: str, **attributes):
+        """開始計時（同名操作可巢狀，且各執行緒互不干擾）"""
+        span = self.tracer.start_span(operation, **attributes)
+        self._open_spans().setdefault(operation, []).append((datetime.now(), span))
         self.logger.debug(f"開始計時: {operation}")
     
     def end_timing(self, operation: str) -> float:
         """結束計時並返回耗時（秒）"""
-        if operation not in self.start_times:
+        entries = self._open_spans().get(operation)
+        if not entries:
             self.logger.warning(f"未找到操作的開始時間: {operation}")
             return 0.0
         
-        start_time = self.start_times.pop(operation)
-        duration = (datetime.now() - start_time).total_seconds()
+        _, span = entries.pop()
+        duration = self.tracer.end_span(span)
         
         self.logger.info(f"操作完成: {operation} (耗時: {duration:.2f}秒)")
         return duration
     
+    def span(self, name: str, **attributes):
+        """
+        記錄子區段（with 陳述式）
+        
+        Args:
+            name: 區段名稱
+            **attributes: 區段屬性
+        """
+        return self.tracer.span(name, **attributes)
+    
+    def export_chrome_trace(self, file_path: str) -> str:
+        """
+        匯出 Chrome trace-event JSON 檔案
+        
+        Args:
+            file_path: 輸出檔案路徑
+            
+        Returns:
+            str: 輸出檔案路徑
+        """
+        if not self.tracer.enabled:
+            self.logger.warning("追蹤未啟用，匯出的追蹤資料沒有區段（請以 tracing=True 建立）")
+        path = self.tracer.export_chrome_trace(file_path)
+        self.logger.info(f"追蹤資料已匯出: {path}")
+        return path
+    
+    def _open_spans(self) -> Dict[str, list]:
+        """目前執行緒進行中的操作"""
+        open_spans = getattr(self._local, 'open_spans', None)
+        if open_spans is None:
+            open_spans = self._local.open_spans = {}
+        return open_spans
+    
     def log_memory_usage(self, operation: str = ""):
         """記錄記憶體使用情況（如果可用）"""
         try:
@@ -273,20 +471,40 @@ def create_result_dict(success: bool = True, error: Optional[str] = None,
     return result
 
 
-# 全域日誌記錄器實例
-default_logger = LoggerConfig.setup_logger()
-default_error_handler = ErrorHandler(default_logger)
-default_performance_monitor = PerformanceMonitor(default_logger)
+# 全域實例於首次存取時才建立（PEP 562），匯入本模組不會開啟日誌檔或建立 logs/ 目錄
+_DEFAULT_INSTANCES = ('default_logger', 'default_error_handler', 'default_performance_monitor')
+_default_instances_lock = threading.RLock()
+
+
+def __getattr__(name: str) -> Any:
+    """延遲建立 default_logger、default_error_handler 與 default_performance_monitor"""
+    if name not in _DEFAULT_INSTANCES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    with _default_instances_lock:
+        if name not in globals():
+            if name == 'default_logger':
+                value = LoggerConfig.setup_logger()
+            elif name == 'default_error_handler':
+                value = ErrorHandler(__getattr__('default_logger'))
+            else:
+                value = PerformanceMonitor(__getattr__('default_logger'))
+            globals()[name] = value
+        return globals()[name]
 
 
 def get_logger(name: str = "document_converter") -> logging.Logger:
     """
     獲取日誌記錄器（便利函數）
     
+    已配置的記錄器直接返回（保留原本的級別與輸出），否則以預設參數配置。
+    
     Args:
         name: 日誌記錄器名稱
         
     Returns:
         logging.Logger: 日誌記錄器
     """
+    if LoggerConfig.is_configured(name):
+        return logging.getLogger(name)
     return LoggerConfig.setup_logger(name)
\ No newline at end of file
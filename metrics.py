@@ -0,0 +1,254 @@
+"""
+轉換指標模組 - 各階段耗時、CPU 時間、記憶體峰值與投影片耗時分佈
+提供單次轉換的 metrics 區塊建立、批次彙總與文字格式化
+"""
+
+from typing import Dict, List, Any, Optional, Sequence
+import math
+import sys
+
+
+# 轉換階段（依執行順序）與顯示名稱
+STAGES = ('parse', 'template_load', 'template_analysis', 'slide_clone', 'content_replace', 'save')
+STAGE_LABELS = {
+    'parse': '解析 Word',
+    'template_load': '載入模板',
+    'template_analysis': '分析模板',
+    'slide_clone': '複製投影片',
+    'content_replace': '替換內容',
+    'save': '保存檔案'
+}
+
+SLIDE_PERCENTILES = (50, 90, 99)
+
+# 格式享元表（見 FormatHandler.get_style_stats）與顯示名稱
+STYLE_TABLES = ('word_runs', 'ppt_runs')
+STYLE_TABLE_LABELS = {
+    'word_runs': 'Word 運行',
+    'ppt_runs': '投影片運行'
+}
+
+
+def get_peak_rss_bytes() -> Optional[int]:
+    """
+    獲取目前程序的記憶體峰值（RSS）
+
+    Returns:
+        Optional[int]: 位元組數（平台不支援 resource 模組時返回 None）
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 以 KB 回報，macOS 以位元組回報
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def compute_percentiles(values: Sequence[float],
+                        percentiles: Sequence[int] = SLIDE_PERCENTILES) -> Dict[str, float]:
+    """
+    計算百分位數（線性內插）
+
+    Args:
+        values: 數值列表
+        percentiles: 要計算的百分位
+
+    Returns:
+        Dict: 'p50' 等鍵對應的數值（沒有數值時為 0.0）
+    """
+    ordered = sorted(values)
+    result = {}
+    for percentile in percentiles:
+        if not ordered:
+            result[f'p{percentile}'] = 0.0
+            continue
+        position = (len(ordered) - 1) * percentile / 100.0
+        lower = math.floor(position)
+        upper = math.ceil(position)
+        result[f'p{percentile}'] = (ordered[lower] +
+                                    (ordered[upper] - ordered[lower]) * (position - lower))
+    return result
+
+
+def build_slide_stats(slide_times: Sequence[float]) -> Dict[str, Any]:
+    """
+    建立每張投影片耗時的統計
+
+    Args:
+        slide_times: 每張投影片的耗時（秒）
+
+    Returns:
+        Dict: count、mean、max 與百分位數
+    """
+    stats = {
+        'count': len(slide_times),
+        'mean': sum(slide_times) / len(slide_times) if slide_times else 0.0,
+        'max': max(slide_times) if slide_times else 0.0
+    }
+    stats.update(compute_percentiles(slide_times))
+    return stats
+
+
+def build_style_interning_stats(before: Dict[str, Dict[str, Any]],
+                                after: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    由轉換前後的格式享元表統計計算本次轉換的命中率
+
+    Args:
+        before: 轉換前的 FormatHandler.get_style_stats()
+        after: 轉換後的 FormatHandler.get_style_stats()
+
+    Returns:
+        Dict: 每個享元表本次的 hits、misses、hit_rate 與目前的不同格式數 styles
+    """
+    stats = {}
+    for table in STYLE_TABLES:
+        hits = after[table]['hits'] - before[table]['hits']
+        misses = after[table]['misses'] - before[table]['misses']
+        stats[table] = _interning_entry(hits, misses, after[table]['styles'])
+    return stats
+
+
+def _interning_entry(hits: int, misses: int, styles: int) -> Dict[str, Any]:
+    """單一享元表的統計"""
+    lookups = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': hits / lookups if lookups else 0.0,
+        'styles': styles
+    }
+
+
+def build_conversion_metrics(stage_times: Dict[str, float], wall_time: float, cpu_time: float,
+                             slide_times: Sequence[float],
+                             output_bytes: Optional[int] = None,
+                             style_interning: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """
+    建立單次轉換的 metrics 區塊
+
+    Args:
+        stage_times: 各階段耗時（秒，鍵見 STAGES）
+        wall_time: 總耗時（秒）
+        cpu_time: CPU 時間（秒）
+        slide_times: 每張投影片的耗時（秒）
+        output_bytes: 輸出檔案大小
+        style_interning: 格式享元表統計（見 build_style_interning_stats）
+
+    Returns:
+        Dict: metrics 區塊
+    """
+    return {
+        'stages': {stage: stage_times.get(stage, 0.0) for stage in STAGES},
+        'wall_time': wall_time,
+        'cpu_time': cpu_time,
+        'peak_rss_bytes': get_peak_rss_bytes(),
+        'output_bytes': output_bytes,
+        'slides': build_slide_stats(slide_times),
+        'slide_times': list(slide_times),
+        'style_interning': style_interning
+    }
+
+
+def aggregate_metrics(metrics_list: List[Dict[str, Any]],
+                      wall_time: Optional[float] = None) -> Dict[str, Any]:
+    """
+    彙總多次轉換的 metrics（批次轉換使用）
+
+    階段耗時、CPU 時間與輸出大小相加；記憶體峰值取最大值；
+    投影片百分位數以所有檔案的投影片耗時重新計算；格式享元表的命中次數相加，
+    不同格式數取最大值（各檔案可能共用同一個享元表）。
+    並行轉換時各檔案的耗時互相重疊，總耗時應由呼叫端在主程序量測後傳入。
+
+    Args:
+        metrics_list: 各次轉換的 metrics 區塊
+        wall_time: 批次實際總耗時（秒，None 則以各次轉換的耗時相加）
+
+    Returns:
+        Dict: 彙總後的 metrics（另含 files 檔案數）
+    """
+    slide_times: List[float] = []
+    peak_rss = [m['peak_rss_bytes'] for m in metrics_list if m.get('peak_rss_bytes') is not None]
+    output_bytes = [m['output_bytes'] for m in metrics_list if m.get('output_bytes') is not None]
+
+    for metrics in metrics_list:
+        slide_times.extend(metrics.get('slide_times', []))
+
+    interning = [m['style_interning'] for m in metrics_list if m.get('style_interning')]
+    style_interning = None
+    if interning:
+        style_interning = {
+            table: _interning_entry(sum(stats[table]['hits'] for stats in interning),
+                                    sum(stats[table]['misses'] for stats in interning),
+                                    max(stats[table]['styles'] for stats in interning))
+            for table in STYLE_TABLES
+        }
+
+    return {
+        'files': len(metrics_list),
+        'stages': {stage: sum(m['stages'].get(stage, 0.0) for m in metrics_list) for stage in STAGES},
+        'wall_time': wall_time if wall_time is not None else sum(m['wall_time'] for m in metrics_list),
+        'cpu_time': sum(m['cpu_time'] for m in metrics_list),
+        'peak_rss_bytes': max(peak_rss) if peak_rss else None,
+        'output_bytes': sum(output_bytes) if output_bytes else None,
+        'slides': build_slide_stats(slide_times),
+        'slide_times': slide_times,
+        'style_interning': style_interning
+    }
+
+
+def metrics_for_log(metrics: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    去除每張投影片耗時列表的 metrics（寫入日誌用，避免每張投影片一個數值）
+
+    Args:
+        metrics: metrics 區塊
+
+    Returns:
+        Optional[Dict]: 不含 slide_times 的 metrics
+    """
+    if not metrics:
+        return metrics
+    return {key: value for key, value in metrics.items() if key != 'slide_times'}
+
+
+def format_metrics(metrics: Dict[str, Any], indent: str = '   ') -> List[str]:
+    """
+    將 metrics 格式化為文字行
+
+    Args:
+        metrics: metrics 區塊
+        indent: 每行的縮排
+
+    Returns:
+        List[str]: 文字行
+    """
+    lines = []
+    for stage in STAGES:
+        lines.append(f"{indent}{STAGE_LABELS[stage]}: {metrics['stages'][stage] * 1000:.1f} ms")
+
+    lines.append(f"{indent}總耗時: {metrics['wall_time']:.2f} 秒, CPU 時間: {metrics['cpu_time']:.2f} 秒")
+
+    if metrics.get('peak_rss_bytes') is not None:
+        lines.append(f"{indent}記憶體峰值: {metrics['peak_rss_bytes'] / 1024 / 1024:.1f} MB")
+    if metrics.get('output_bytes') is not None:
+        lines.append(f"{indent}輸出大小: {metrics['output_bytes'] / 1024:.1f} KB")
+
+    slides = metrics['slides']
+    if slides['count']:
+        percentiles = ', '.join(f"p{p}={slides[f'p{p}'] * 1000:.2f}"
+                                for p in SLIDE_PERCENTILES)
+        lines.append(f"{indent}每張投影片 ({slides['count']} 張, ms): {percentiles}, "
+                     f"max={slides['max'] * 1000:.2f}")
+
+    interning = metrics.get('style_interning')
+    if interning:
+        rates = ', '.join(f"{STYLE_TABLE_LABELS[table]} {interning[table]['hit_rate']:.1%} "
+                          f"({interning[table]['styles']} 種)"
+                          for table in STYLE_TABLES
+                          if interning[table]['hits'] + interning[table]['misses'])
+        if rates:
+            lines.append(f"{indent}格式享元命中率: {rates}")
+    return lines
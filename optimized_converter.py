@@ -12,6 +12,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from document_converter import convert_word_to_ppt, analyze_document_structure, ConverterFactory
 from logger_config import get_logger, LogLevel
+from metrics import format_metrics
 
 
 def main():
@@ -80,7 +81,9 @@ def main():
         
         # 3. 執行轉換
         print(f"\n🚀 開始轉換...")
-        result = convert_word_to_ppt(word_file, ppt_file, progress_callback=progress_callback)
+        # 增量轉換：只重新渲染與上次輸出相比有變更的段落
+        result = convert_word_to_ppt(word_file, ppt_file, progress_callback=progress_callback,
+                                     incremental=True)
         
         # 4. 顯示結果
         print(f"\n" + "="*60)
@@ -89,9 +92,20 @@ def main():
             print(f"📊 處理統計:")
             print(f"   📄 處理段落數: {result['total_sections']}")
             print(f"   📈 創建投影片數: {result['slides_created']}")
+            if result.get('incremental'):
+                incremental = result['incremental']
+                print(f"   ♻️  增量轉換: 沿用 {incremental['reused']} 張, "
+                      f"重新渲染 {incremental['rendered']} 張 (取代 {incremental['replaced']} 張), "
+                      f"移除 {incremental['removed']} 張")
             print(f"   ⏱️  處理時間: {result.get('processing_time', 0):.2f} 秒")
             print(f"   💾 輸出檔案: {result['output_file']}")
             
+            # 顯示各階段指標
+            if result.get('metrics'):
+                print(f"\n⏱️  效能指標:")
+                for line in format_metrics(result['metrics']):
+                    print(line)
+            
             # 顯示警告信息
             if result.get('skipped_sections'):
                 print(f"\n⚠️  跳過的段落:")
@@ -158,6 +172,11 @@ def demo_batch_conversion():
             print(f"✅ 檔案 {i+1}: 成功 - {result.get('output_file', 'N/A')}")
         else:
             print(f"❌ 檔案 {i+1}: 失敗 - {result['error']}")
+    
+    if batch_converter.last_metrics:
+        print(f"\n⏱️  批次效能指標 ({batch_converter.last_metrics['files']} 個檔案):")
+        for line in format_metrics(batch_converter.last_metrics):
+            print(line)
 
 
 def demo_advanced_features():
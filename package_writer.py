@@ -0,0 +1,475 @@
+"""
+套件寫入模組 - 保存演示文稿時直接複製模板中未變更部件的壓縮資料
+母片、版面配置、佈景主題與媒體等未修改的部件不再重新序列化與壓縮，
+只有新增或修改的部件（投影片、[Content_Types].xml 與關聯）需要壓縮
+串流模式下每張投影片完成後立即寫入輸出檔，其餘部件於最後寫入
+"""
+
+from typing import Dict, List, Optional, Tuple, BinaryIO
+import hashlib
+import io
+import logging
+import os
+import struct
+import time
+import zipfile
+import zlib
+
+
+# ZIP 結構（與 zipfile 模組相同的格式）
+LOCAL_HEADER = struct.Struct('<4s2B4HL2L2H')
+CENTRAL_HEADER = struct.Struct('<4s4B4HL2L5H2L')
+END_OF_CENTRAL_DIR = struct.Struct('<4s4H2LH')
+LOCAL_HEADER_SIGNATURE = b'PK\x03\x04'
+CENTRAL_HEADER_SIGNATURE = b'PK\x01\x02'
+END_OF_CENTRAL_DIR_SIGNATURE = b'PK\x05\x06'
+
+ZIP_VERSION = 20
+ZIP_SYSTEM_UNIX = 3
+ZIP_MAX_SIZE = 0xFFFFFFFF
+ZIP_MAX_ENTRIES = 0xFFFF
+
+FLAG_ENCRYPTED = 0x0001
+FLAG_UTF8 = 0x0800
+# 複製時保留的旗標：壓縮選項（位元 1-2）；大小已寫入本地檔頭，不使用資料描述元（位元 3）
+PRESERVED_FLAGS = 0x0006
+
+PASSTHROUGH_METHODS = (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED)
+
+
+class PackageWriteError(Exception):
+    """套件寫入錯誤"""
+    pass
+
+
+# 使用 python-pptx 內部 API（PackageWriter、_Relationship、_Relationships._rels）時，
+# 版本不相容可能出現的例外；轉為 PackageWriteError 後退回 prs.save()
+_INTERNAL_API_ERRORS = (ImportError, AttributeError, TypeError)
+
+
+def empty_write_stats() -> Dict[str, int]:
+    """套件寫入統計的初始值"""
+    return {'copied_parts': 0, 'copied_bytes': 0, 'compressed_parts': 0, 'compressed_bytes': 0}
+
+
+def content_digest(data: bytes) -> Tuple[int, bytes]:
+    """部件內容指紋（長度與雜湊）"""
+    return len(data), hashlib.blake2b(data, digest_size=16).digest()
+
+
+class ZipSource:
+    """來源 ZIP - 讀取項目的原始（未解壓縮）資料"""
+
+    def __init__(self, blob: bytes):
+        """
+        初始化來源 ZIP
+
+        Args:
+            blob: ZIP 檔案內容
+        """
+        self.blob = blob
+        self._view = memoryview(blob)
+        with zipfile.ZipFile(io.BytesIO(blob)) as archive:
+            # 加密或使用其他壓縮方式的項目無法直接複製
+            self.entries: Dict[str, zipfile.ZipInfo] = {
+                info.filename: info for info in archive.infolist()
+                if not info.flag_bits & FLAG_ENCRYPTED and info.compress_type in PASSTHROUGH_METHODS
+            }
+
+    def raw_data(self, info: zipfile.ZipInfo) -> memoryview:
+        """
+        項目的壓縮資料
+
+        Raises:
+            PackageWriteError: 本地檔頭損壞時拋出
+        """
+        offset = info.header_offset
+        header = LOCAL_HEADER.unpack_from(self.blob, offset)
+        if header[0] != LOCAL_HEADER_SIGNATURE:
+            raise PackageWriteError(f"ZIP 項目檔頭損壞: {info.filename}")
+        start = offset + LOCAL_HEADER.size + header[10] + header[11]
+        return self._view[start:start + info.compress_size]
+
+
+class PassthroughZipWriter:
+    """
+    ZIP 寫入器 - 可直接寫入其他 ZIP 項目的壓縮資料
+
+    新內容以與 zipfile.ZIP_DEFLATED 相同的設定壓縮；循序寫入，不需可 seek 的檔案。
+    """
+
+    def __init__(self, fileobj: BinaryIO):
+        """
+        初始化 ZIP 寫入器
+
+        Args:
+            fileobj: 以二進位寫入模式開啟的檔案物件
+        """
+        self.fileobj = fileobj
+        self._offset = 0
+        self._central: List[bytes] = []
+        self._names = set()
+        self.stats = empty_write_stats()
+
+    def copy(self, source: ZipSource, info: zipfile.ZipInfo, name: Optional[str] = None):
+        """
+        直接複製來源項目的壓縮資料（不解壓縮、不重新壓縮）
+
+        Args:
+            source: 來源 ZIP
+            info: 來源項目
+            name: 寫入的項目名稱（None 則與來源相同）
+        """
+        raw = source.raw_data(info)
+        self._write_entry(name or info.filename, raw, info.flag_bits & PRESERVED_FLAGS,
+                          info.compress_type, info.date_time, info.CRC, info.file_size,
+                          info.create_system, info.external_attr)
+        self.stats['copied_parts'] += 1
+        self.stats['copied_bytes'] += info.file_size
+
+    def write(self, name: str, data: bytes, date_time: Optional[Tuple[int, ...]] = None):
+        """
+        壓縮並寫入新內容
+
+        Args:
+            name: 項目名稱
+            data: 內容
+            date_time: 修改時間（None 則使用目前時間，與 zipfile.writestr 相同）
+        """
+        compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+        compressed = compressor.compress(data) + compressor.flush()
+        self._write_entry(name, compressed, 0, zipfile.ZIP_DEFLATED,
+                          date_time or time.localtime(time.time())[:6],
+                          zlib.crc32(data), len(data), ZIP_SYSTEM_UNIX, 0o600 << 16)
+        self.stats['compressed_parts'] += 1
+        self.stats['compressed_bytes'] += len(data)
+
+    def close(self):
+        """
+        寫入中央目錄
+
+        Raises:
+            PackageWriteError: 項目數或大小超過 ZIP（非 ZIP64）上限時拋出
+        """
+        if len(self._central) > ZIP_MAX_ENTRIES:
+            raise PackageWriteError(f"ZIP 項目過多: {len(self._central)}")
+
+        central_offset = self._offset
+        central = b''.join(self._central)
+        self._check_size(central_offset + len(central))
+        self.fileobj.write(central)
+        self.fileobj.write(END_OF_CENTRAL_DIR.pack(
+            END_OF_CENTRAL_DIR_SIGNATURE, 0, 0, len(self._central), len(self._central),
+            len(central), central_offset, 0))
+
+    def _write_entry(self, name: str, data, flags: int, method: int, date_time: Tuple[int, ...],
+                     crc: int, file_size: int, create_system: int, external_attr: int):
+        """寫入本地檔頭與資料，並記錄中央目錄項目"""
+        if name in self._names:
+            raise PackageWriteError(f"重複的 ZIP 項目: {name}")
+        self._names.add(name)
+
+        try:
+            encoded_name = name.encode('ascii')
+        except UnicodeEncodeError:
+            encoded_name = name.encode('utf-8')
+            flags |= FLAG_UTF8
+
+        header_offset = self._offset
+        self._check_size(header_offset + LOCAL_HEADER.size + len(encoded_name) + len(data), file_size)
+
+        dos_time, dos_date = _dos_date_time(date_time)
+        self.fileobj.write(LOCAL_HEADER.pack(
+            LOCAL_HEADER_SIGNATURE, ZIP_VERSION, 0, flags, method, dos_time, dos_date,
+            crc, len(data), file_size, len(encoded_name), 0))
+        self.fileobj.write(encoded_name)
+        self.fileobj.write(data)
+        self._offset += LOCAL_HEADER.size + len(encoded_name) + len(data)
+
+        self._central.append(CENTRAL_HEADER.pack(
+            CENTRAL_HEADER_SIGNATURE, ZIP_VERSION, create_system, ZIP_VERSION, 0, flags, method,
+            dos_time, dos_date, crc, len(data), file_size, len(encoded_name), 0, 0, 0, 0,
+            external_attr, header_offset) + encoded_name)
+
+    @staticmethod
+    def _check_size(*sizes: int):
+        """ZIP（非 ZIP64）的大小與位移上限"""
+        if any(size > ZIP_MAX_SIZE for size in sizes):
+            raise PackageWriteError("套件超過 4GB，需要 ZIP64")
+
+
+def _dos_date_time(date_time: Tuple[int, ...]) -> Tuple[int, int]:
+    """(年, 月, 日, 時, 分, 秒) 轉為 DOS 時間與日期"""
+    year, month, day, hour, minute, second = date_time[:6]
+    year = max(year, 1980)
+    return ((hour << 11) | (minute << 5) | (second // 2),
+            ((year - 1980) << 9) | (month << 5) | day)
+
+
+class TemplatePackage:
+    """
+    模板套件 - 記錄模板以 python-pptx 序列化後每個項目的指紋
+
+    保存時，內容與指紋相同的項目直接複製模板 ZIP 中的壓縮資料。
+    """
+
+    def __init__(self, blob: bytes, fingerprints: Dict[str, Tuple[int, bytes]]):
+        """
+        初始化模板套件
+
+        Args:
+            blob: 模板檔案內容
+            fingerprints: ZIP 項目名稱 → python-pptx 序列化內容的指紋
+        """
+        self.source = ZipSource(blob)
+        self.fingerprints = fingerprints
+
+    @classmethod
+    def from_presentation(cls, blob: bytes, prs) -> 'TemplatePackage':
+        """
+        由剛載入、尚未修改的模板演示文稿建立
+
+        Args:
+            blob: 模板檔案內容
+            prs: 以 blob 載入的演示文稿
+        """
+        recorder = _FingerprintRecorder()
+        _write_package(prs, recorder)
+        return cls(blob, recorder.fingerprints)
+
+    def unchanged_entry(self, name: str, data: bytes) -> Optional[zipfile.ZipInfo]:
+        """內容與模板相同時返回模板的 ZIP 項目，否則返回 None"""
+        fingerprint = self.fingerprints.get(name)
+        if fingerprint is None or fingerprint[0] != len(data):
+            return None
+        if content_digest(data) != fingerprint:
+            return None
+        return self.source.entries.get(name)
+
+
+def save_presentation(prs, output, template: Optional[TemplatePackage] = None,
+                      logger: Optional[logging.Logger] = None) -> Dict[str, int]:
+    """
+    保存演示文稿，未變更的模板部件直接複製壓縮資料
+
+    部件順序、[Content_Types].xml 與關聯內容都與 prs.save() 相同。
+
+    Args:
+        prs: 演示文稿
+        output: 輸出路徑或可寫入的二進位檔案物件（需可 seek，無法直接複製時才會改用 prs.save()）
+        template: 載入 prs 的模板套件（None 則使用 prs.save()）
+        logger: 日誌記錄器
+
+    Returns:
+        Dict: copied_parts / copied_bytes（直接複製）與 compressed_parts / compressed_bytes（重新壓縮）
+    """
+    logger = logger or logging.getLogger(__name__)
+    if template is None:
+        prs.save(output)
+        return empty_write_stats()
+
+    if isinstance(output, str):
+        with open(output, 'wb') as f:
+            stats = _save_with_fallback(prs, f, template, logger)
+    else:
+        stats = _save_with_fallback(prs, output, template, logger)
+
+    logger.debug(f"已保存套件: 直接複製 {stats['copied_parts']} 個部件 "
+                 f"({stats['copied_bytes'] / 1024:.1f} KB)，壓縮 {stats['compressed_parts']} 個部件 "
+                 f"({stats['compressed_bytes'] / 1024:.1f} KB)")
+    return stats
+
+
+def _save_with_fallback(prs, fileobj: BinaryIO, template: TemplatePackage,
+                        logger: logging.Logger) -> Dict[str, int]:
+    """寫入套件；無法直接複製時（例如需要 ZIP64 或 python-pptx 版本不相容）改用 prs.save()"""
+    start = fileobj.tell()
+    writer = PassthroughZipWriter(fileobj)
+    try:
+        _write_package(prs, _TemplatePhysWriter(writer, template))
+        writer.close()
+        return writer.stats
+    except PackageWriteError as e:
+        logger.warning(f"無法直接複製模板部件，改為完整保存: {e}")
+        fileobj.seek(start)
+        fileobj.truncate()
+        prs.save(fileobj)
+        return empty_write_stats()
+
+
+class StreamingPackageWriter:
+    """
+    串流套件寫入器 - 投影片完成後立即寫入輸出檔，並從演示文稿中釋放其 XML 樹
+
+    已寫入的投影片在套件中以只有部件名稱與內容類型的輕量部件取代，投影片清單與關聯 ID 不變；
+    finish() 時再以與 save_presentation 相同的方式寫入其餘部件、presentation.xml、
+    [Content_Types].xml 與關聯。記憶體中只保留每張投影片的部件名稱與 ZIP 中央目錄項目。
+
+    輸出先寫入同目錄的暫存檔，finish() 成功後才取代輸出檔；失敗時呼叫 abort() 刪除暫存檔。
+    """
+
+    def __init__(self, output_file: str, prs, template: Optional[TemplatePackage] = None,
+                 logger: Optional[logging.Logger] = None):
+        """
+        初始化串流套件寫入器
+
+        Args:
+            output_file: 輸出路徑
+            prs: 要寫入的演示文稿（須在加入新投影片前建立）
+            template: 載入 prs 的模板套件（None 則所有部件都重新壓縮）
+            logger: 日誌記錄器
+        """
+        self.output_file = output_file
+        self.template = template
+        self.logger = logger or logging.getLogger(__name__)
+        self.slides_written = 0
+
+        # 建立時已在套件中的部件；投影片指向其他（新加入的）部件時，這些部件保留到 finish() 才寫入
+        self._resident = set(prs.part.package.iter_parts())
+
+        self._temp_path = f"{output_file}.{os.getpid()}.tmp"
+        self._file = open(self._temp_path, 'wb')
+        self.writer = PassthroughZipWriter(self._file)
+
+    @staticmethod
+    def is_supported(prs) -> bool:
+        """
+        目前的 python-pptx 是否提供串流寫入需要的內部 API
+
+        Args:
+            prs: 要寫入的演示文稿
+
+        Returns:
+            bool: 不支援時應改用 save_presentation（最終仍會退回 prs.save()）
+        """
+        try:
+            from pptx.opc.package import Part, _Relationship  # noqa: F401
+            from pptx.opc.serialized import PackageWriter
+        except ImportError:
+            return False
+        rels = prs.part.rels
+        return (hasattr(rels, '_rels') and hasattr(rels, '_base_uri') and
+                all(hasattr(PackageWriter, name) for name in _PACKAGE_WRITER_METHODS))
+
+    def write_slide(self, presentation_part, rId: str, slide_part):
+        """
+        寫入完成的投影片，並以輕量部件取代演示文稿中的投影片部件
+
+        Args:
+            presentation_part: 演示文稿部件
+            rId: 投影片在演示文稿部件中的關聯 ID
+            slide_part: 投影片部件（寫入後不可再使用）
+
+        Raises:
+            PackageWriteError: 超過 ZIP 上限或 python-pptx 內部 API 不相容時拋出
+        """
+        try:
+            from pptx.opc.constants import RELATIONSHIP_TARGET_MODE as RTM
+            from pptx.opc.package import Part, _Relationship
+
+            partname = slide_part.partname
+            self.writer.write(partname.membername, slide_part.blob)
+
+            stub = Part(partname, slide_part.content_type, slide_part.package)
+            slide_rels = slide_part.rels
+            if len(slide_rels):
+                self.writer.write(partname.rels_uri.membername, slide_rels.xml)
+                for rel in slide_rels.values():
+                    if not rel.is_external and rel.target_part not in self._resident:
+                        stub.rels._rels[rel.rId] = rel
+
+            rels = presentation_part.rels
+            rels._rels[rId] = _Relationship(rels._base_uri, rId, rels[rId].reltype, RTM.INTERNAL, stub)
+        except _INTERNAL_API_ERRORS as e:
+            raise PackageWriteError(f"python-pptx 內部 API 不相容，無法串流寫入: {e}")
+        self.slides_written += 1
+
+    def finish(self, prs) -> Dict[str, int]:
+        """
+        寫入其餘部件並取代輸出檔
+
+        Args:
+            prs: 演示文稿
+
+        Returns:
+            Dict: 寫入統計（與 save_presentation 相同的鍵）
+
+        Raises:
+            PackageWriteError: 超過 ZIP 上限時拋出（已刪除暫存檔）
+        """
+        try:
+            _write_package(prs, _TemplatePhysWriter(self.writer, self.template,
+                                                    frozenset(self.writer._names)))
+            self.writer.close()
+            self._file.close()
+            if os.path.exists(self.output_file):
+                # 與直接覆寫相同，沿用原輸出檔的權限
+                os.chmod(self._temp_path, os.stat(self.output_file).st_mode & 0o7777)
+            os.replace(self._temp_path, self.output_file)
+        except BaseException:
+            self.abort()
+            raise
+
+        stats = self.writer.stats
+        self.logger.debug(f"已串流保存 {self.slides_written} 張投影片: 直接複製 {stats['copied_parts']} 個部件，"
+                          f"壓縮 {stats['compressed_parts']} 個部件 ({stats['compressed_bytes'] / 1024:.1f} KB)")
+        return stats
+
+    def abort(self):
+        """放棄寫入並刪除暫存檔"""
+        self._file.close()
+        if os.path.exists(self._temp_path):
+            os.remove(self._temp_path)
+
+
+_PACKAGE_WRITER_METHODS = ('_write_content_types_stream', '_write_pkg_rels', '_write_parts')
+
+
+def _write_package(prs, phys_writer):
+    """
+    以 python-pptx 的 PackageWriter 順序序列化套件，交給 phys_writer 寫入
+
+    Raises:
+        PackageWriteError: python-pptx 內部 API 不相容（需要 python-pptx 1.0.x）時拋出
+    """
+    try:
+        from pptx.opc.serialized import PackageWriter
+
+        package = prs.part.package
+        package_writer = PackageWriter(None, package._rels, tuple(package.iter_parts()))
+        write_steps = [getattr(package_writer, name) for name in _PACKAGE_WRITER_METHODS]
+    except _INTERNAL_API_ERRORS as e:
+        raise PackageWriteError(f"python-pptx 內部 API 不相容: {e}")
+
+    for write_step in write_steps:
+        write_step(phys_writer)
+
+
+class _FingerprintRecorder:
+    """記錄每個 ZIP 項目內容指紋的實體寫入器"""
+
+    def __init__(self):
+        self.fingerprints: Dict[str, Tuple[int, bytes]] = {}
+
+    def write(self, pack_uri, blob: bytes):
+        self.fingerprints[pack_uri.membername] = content_digest(blob)
+
+
+class _TemplatePhysWriter:
+    """python-pptx 實體寫入器介面：未變更的項目複製模板資料，其餘壓縮寫入"""
+
+    def __init__(self, writer: PassthroughZipWriter, template: Optional[TemplatePackage],
+                 skip: frozenset = frozenset()):
+        self.writer = writer
+        self.template = template
+        self.skip = skip
+
+    def write(self, pack_uri, blob: bytes):
+        name = pack_uri.membername
+        if name in self.skip:
+            return
+        info = self.template.unchanged_entry(name, blob) if self.template is not None else None
+        if info is not None:
+            self.writer.copy(self.template.source, info, name)
+        else:
+            self.writer.write(name, blob)
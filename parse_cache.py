@@ -0,0 +1,414 @@
+"""
+解析快取模組 - 將 Word 解析結果持久化到磁碟
+以檔案內容雜湊、檔案大小與解析器版本為鍵，避免同一份文件被重複解析
+"""
+
+from typing import Dict, List, Any, Optional
+import hashlib
+import hmac
+import logging
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import zlib
+from pathlib import Path
+from section_store import SectionList, encode_run, decode_run
+
+
+CACHE_FILE_SUFFIX = '.parse'
+CACHE_APP_NAME = 'GeneratePowerpoint'
+CACHE_KEY_FILE = 'parse_cache.key'
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+CACHE_DIR_ENV = 'DOC_CONVERTER_CACHE_DIR'
+
+# 快取檔案格式：檔頭 + HMAC-SHA256(壓縮資料) + 壓縮資料
+ENTRY_MAGIC = b'GPPC'
+ENTRY_DIGEST_SIZE = hashlib.sha256().digest_size
+
+# 序列化格式版本，變更 encode/decode 時遞增
+SERIALIZATION_VERSION = 3
+
+
+def get_user_cache_root() -> Path:
+    """
+    獲取目前使用者的快取根目錄（與工作目錄無關）
+
+    Windows 使用 %LOCALAPPDATA%，macOS 使用 ~/Library/Caches，
+    其他平台使用 $XDG_CACHE_HOME 或 ~/.cache。
+
+    Returns:
+        Path: 本程式的快取根目錄
+    """
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), 'AppData', 'Local')
+    elif sys.platform == 'darwin':
+        base = os.path.join(os.path.expanduser('~'), 'Library', 'Caches')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return Path(base) / CACHE_APP_NAME
+
+
+def get_default_cache_dir() -> Path:
+    """預設的解析快取目錄"""
+    return get_user_cache_root() / 'parse_cache'
+
+
+def load_cache_secret(logger: Optional[logging.Logger] = None) -> bytes:
+    """
+    讀取（不存在時建立）驗證快取項目用的使用者金鑰
+
+    金鑰存放於使用者快取根目錄、僅擁有者可讀寫，與快取目錄分開；
+    即使快取目錄可被他人寫入，沒有金鑰也無法偽造會被載入的項目。
+    無法寫入時使用僅限本程序的隨機金鑰（快取只在本程序內有效）。
+
+    Args:
+        logger: 日誌記錄器
+
+    Returns:
+        bytes: 金鑰
+    """
+    key_path = get_user_cache_root() / CACHE_KEY_FILE
+    try:
+        key_path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            secret = key_path.read_bytes()
+            if len(secret) >= 32:
+                return secret
+            raise ValueError(f"快取金鑰長度不足: {key_path}")
+        secret = os.urandom(32)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(secret)
+        return secret
+    except (OSError, ValueError) as e:
+        (logger or logging.getLogger(__name__)).warning(f"無法使用快取金鑰，解析快取僅於本程序內有效: {e}")
+        return os.urandom(32)
+
+
+class ParseCache:
+    """磁碟解析快取 - 壓縮二進位序列化、HMAC 驗證並以大小上限做 LRU 淘汰"""
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES,
+                 logger: Optional[logging.Logger] = None, secret: Optional[bytes] = None):
+        """
+        初始化解析快取
+
+        Args:
+            cache_dir: 快取目錄（None 則使用環境變數 DOC_CONVERTER_CACHE_DIR 或使用者快取目錄）
+            max_bytes: 快取總大小上限（位元組）
+            logger: 日誌記錄器
+            secret: 驗證快取項目的金鑰（None 則使用使用者金鑰，見 load_cache_secret）
+        """
+        self.cache_dir = Path(cache_dir or os.environ.get(CACHE_DIR_ENV) or get_default_cache_dir())
+        self.max_bytes = max_bytes
+        self.logger = logger or logging.getLogger(__name__)
+        self.secret = secret or load_cache_secret(self.logger)
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0, 'errors': 0}
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """序列化時略過鎖（供傳遞到工作程序）"""
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        """還原時重新建立鎖"""
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def make_key(self, file_path: str, parser_id: str) -> str:
+        """
+        根據檔案內容建立快取鍵
+
+        Args:
+            file_path: 檔案路徑
+            parser_id: 解析器識別（類別、版本與切分規則）
+
+        Returns:
+            str: 快取鍵
+        """
+        digest = hashlib.sha256()
+        size = 0
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+                size += len(chunk)
+        return self._compose_key(digest, size, parser_id)
+
+    def make_data_key(self, data: bytes, parser_id: str) -> str:
+        """
+        根據記憶體中的文件內容建立快取鍵（與相同內容的檔案鍵相同）
+
+        Args:
+            data: 文件內容
+            parser_id: 解析器識別（類別、版本與切分規則）
+
+        Returns:
+            str: 快取鍵
+        """
+        return self._compose_key(hashlib.sha256(data), len(data), parser_id)
+
+    @staticmethod
+    def _compose_key(digest, size: int, parser_id: str) -> str:
+        """內容雜湊、大小與解析器識別組成快取鍵"""
+        parser_id = f"{parser_id}:serialization={SERIALIZATION_VERSION}"
+        parser_digest = hashlib.sha256(parser_id.encode('utf-8')).hexdigest()[:16]
+        return f"{digest.hexdigest()}-{size}-{parser_digest}"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        讀取快取
+
+        Args:
+            key: 快取鍵
+
+        Returns:
+            Optional[Dict]: 快取的解析結果，未命中時返回 None
+        """
+        entry_path = self._entry_path(key)
+
+        try:
+            with open(entry_path, 'rb') as f:
+                payload = self._verify(f.read())
+            data = decode_parse_result(pickle.loads(zlib.decompress(payload)))
+            # 更新存取時間供 LRU 使用
+            os.utime(entry_path)
+        except FileNotFoundError:
+            self._count('misses')
+            return None
+        except Exception as e:
+            self.logger.warning(f"讀取解析快取失敗，將重新解析: {e}")
+            self._count('errors')
+            self._count('misses')
+            self._remove(entry_path)
+            return None
+
+        self._count('hits')
+        self.logger.debug(f"解析快取命中: {key[:16]}")
+        return data
+
+    def put(self, key: str, data: Dict[str, Any]) -> bool:
+        """
+        寫入快取
+
+        Args:
+            key: 快取鍵
+            data: 解析結果
+
+        Returns:
+            bool: 是否成功寫入
+        """
+        try:
+            encoded = encode_parse_result(data)
+            payload = zlib.compress(pickle.dumps(encoded, protocol=pickle.HIGHEST_PROTOCOL))
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+            # 先寫入暫存檔再原子替換，避免多程序讀到半寫入的檔案
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(ENTRY_MAGIC + self._sign(payload) + payload)
+            os.replace(temp_path, self._entry_path(key))
+        except Exception as e:
+            self.logger.warning(f"寫入解析快取失敗: {e}")
+            self._count('errors')
+            return False
+
+        self._count('writes')
+        self._evict()
+        return True
+
+    def clear(self):
+        """清除所有快取項目"""
+        for entry in self._scan_entries():
+            self._remove(entry.path)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        獲取快取統計
+
+        Returns:
+            Dict: 命中、未命中、寫入、淘汰次數與目前大小
+        """
+        entries = self._scan_entries()
+        with self._lock:
+            stats = dict(self.stats)
+        lookups = stats['hits'] + stats['misses']
+        stats.update({
+            'hit_rate': stats['hits'] / lookups if lookups else 0.0,
+            'entries': len(entries),
+            'total_bytes': sum(entry.stat().st_size for entry in entries),
+            'max_bytes': self.max_bytes,
+            'cache_dir': str(self.cache_dir)
+        })
+        return stats
+
+    def _sign(self, payload: bytes) -> bytes:
+        """計算壓縮資料的 HMAC"""
+        return hmac.new(self.secret, payload, hashlib.sha256).digest()
+
+    def _verify(self, blob: bytes) -> bytes:
+        """
+        驗證快取檔案並返回壓縮資料（驗證通過才會反序列化）
+
+        Raises:
+            ValueError: 檔頭或 HMAC 不符時拋出
+        """
+        header_size = len(ENTRY_MAGIC) + ENTRY_DIGEST_SIZE
+        if len(blob) < header_size or not blob.startswith(ENTRY_MAGIC):
+            raise ValueError("快取項目格式不符")
+        digest = blob[len(ENTRY_MAGIC):header_size]
+        payload = blob[header_size:]
+        if not hmac.compare_digest(digest, self._sign(payload)):
+            raise ValueError("快取項目驗證失敗")
+        return payload
+
+    def _evict(self):
+        """依最後存取時間淘汰項目，直到總大小低於上限"""
+        entries = []
+        for entry in self._scan_entries():
+            try:
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+            except FileNotFoundError:
+                continue
+
+        total_bytes = sum(size for _, size, _ in entries)
+        if total_bytes <= self.max_bytes:
+            return
+
+        entries.sort()
+        for _, size, path in entries:
+            if total_bytes <= self.max_bytes:
+                break
+            if self._remove(path):
+                total_bytes -= size
+                self._count('evictions')
+
+    def _scan_entries(self) -> list:
+        """列出快取項目"""
+        try:
+            return [entry for entry in os.scandir(self.cache_dir)
+                    if entry.is_file() and entry.name.endswith(CACHE_FILE_SUFFIX)]
+        except FileNotFoundError:
+            return []
+
+    def _entry_path(self, key: str) -> Path:
+        """快取項目路徑"""
+        return self.cache_dir / f"{key}{CACHE_FILE_SUFFIX}"
+
+    def _remove(self, path) -> bool:
+        """刪除快取項目"""
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+    def _count(self, stat_name: str):
+        """更新統計"""
+        with self._lock:
+            self.stats[stat_name] += 1
+
+
+def encode_parse_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    將解析結果轉為精簡的純資料結構
+
+    每個段落的運行格式轉為元組，共用的格式列表只儲存一次並以索引引用；
+    python-docx 的 Length、RGBColor、WD_UNDERLINE 轉為整數。
+
+    以 DocumentStore 保存的解析結果直接序列化欄式陣列。
+
+    Args:
+        result: WordDocumentParser.parse_document 的結果
+
+    Returns:
+        Dict: 可序列化的精簡結構
+    """
+    basic_content = result['basic_content']
+    if isinstance(result['sections'], SectionList):
+        encoded = {key: value for key, value in result.items()
+                   if key not in ('file_path', 'basic_content', 'sections')}
+        encoded['basic_content'] = {**basic_content, 'paragraphs': None}
+        encoded['document_store'] = result['sections'].store
+        return encoded
+
+    paragraph_formats = []
+    memo = {}
+
+    def ref(formatting: List[Dict[str, Any]]) -> int:
+        key = id(formatting)
+        if key not in memo:
+            memo[key] = len(paragraph_formats)
+            paragraph_formats.append([encode_run(run) for run in formatting])
+        return memo[key]
+
+    encoded = {key: value for key, value in result.items()
+               if key not in ('file_path', 'basic_content', 'sections')}
+    encoded.update({
+        'paragraph_formats': paragraph_formats,
+        'basic_content': {
+            **basic_content,
+            'paragraphs': [{**paragraph, 'formatting': ref(paragraph['formatting'])}
+                           for paragraph in basic_content['paragraphs']]
+        },
+        'sections': [{**section, 'formatting': [ref(f) for f in section.get('formatting', [])]}
+                     for section in result['sections']]
+    })
+    return encoded
+
+
+def decode_parse_result(encoded: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    將精簡結構還原為解析結果
+
+    Args:
+        encoded: encode_parse_result 的輸出
+
+    Returns:
+        Dict: 解析結果（不含 file_path）
+    """
+    store = encoded.pop('document_store', None)
+    if store is not None:
+        encoded['basic_content']['paragraphs'] = store.paragraphs
+        encoded['sections'] = store.sections
+        return encoded
+
+    from docx.shared import Length, RGBColor
+    from docx.enum.text import WD_UNDERLINE
+
+    paragraph_formats = [[decode_run(run, Length, RGBColor, WD_UNDERLINE) for run in runs]
+                         for runs in encoded.pop('paragraph_formats')]
+
+    basic_content = encoded['basic_content']
+    basic_content['paragraphs'] = [
+        {**paragraph, 'formatting': paragraph_formats[paragraph['formatting']]}
+        for paragraph in basic_content['paragraphs']
+    ]
+    encoded['sections'] = [
+        {**section, 'formatting': [paragraph_formats[index] for index in section['formatting']]}
+        for section in encoded['sections']
+    ]
+    return encoded
+
+
+_default_cache: Optional[ParseCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_parse_cache() -> ParseCache:
+    """
+    獲取程序共用的解析快取（便利函數）
+
+    Returns:
+        ParseCache: 共用的解析快取實例
+    """
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ParseCache()
+        return _default_cache
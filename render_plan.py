@@ -0,0 +1,137 @@
+"""
+渲染規劃模組 - 在修改任何 XML 之前決定每張投影片的形狀處理方式
+規劃結果為純資料（dict/list），可用於乾跑檢視或交給投影片管理器執行
+"""
+
+from typing import Dict, List, Any, Optional
+import logging
+
+
+# 形狀處理方式
+ACTION_KEEP = 'keep'        # 原樣保留（圖片、背景、裝飾形狀）
+ACTION_REPLACE = 'replace'  # 主文本框，內容由章節取代
+ACTION_BLANK = 'blank'      # 其他文本框，清空文字
+
+# 投影片來源
+SOURCE_TEMPLATE = 'template'  # 直接使用模板投影片
+SOURCE_CLONE = 'clone'        # 從模板原型複製
+
+
+class RenderPlanner:
+    """渲染規劃器"""
+
+    def __init__(self, logger: Optional[logging.Logger] = None):
+        """
+        初始化渲染規劃器
+
+        Args:
+            logger: 日誌記錄器
+        """
+        self.logger = logger or logging.getLogger(__name__)
+
+    def build_plan(self, template_slide, sections: List[Dict[str, Any]],
+                   compiled_template=None) -> Dict[str, Any]:
+        """
+        建立渲染規劃
+
+        Args:
+            template_slide: 模板投影片
+            sections: 章節資料列表
+            compiled_template: 編譯後的模板（提供主文本框 ID）
+
+        Returns:
+            Dict: 渲染規劃，包含：
+                - shapes: 模板形狀及其處理方式
+                - main_shape_id: 主文本框的形狀 ID（沒有文本框時為 None）
+                - create_text_box: 是否需要新建文本框
+                - slides: 每張投影片的來源、段落編號與內容替換方式
+        """
+        shapes = self._plan_shapes(template_slide, compiled_template)
+        main_shape_id = next((shape['shape_id'] for shape in shapes
+                              if shape['action'] == ACTION_REPLACE), None)
+
+        slides = []
+        for index, section in enumerate(sections):
+            slides.append({
+                'slide_index': index,
+                'source': SOURCE_TEMPLATE if index == 0 else SOURCE_CLONE,
+                'section_number': section['number'],
+                'title': section.get('title', ''),
+                'paragraph_count': len(section.get('content', [])),
+                'content_mode': 'formatting' if section.get('formatting') else 'basic'
+            })
+
+        plan = {
+            'shapes': shapes,
+            'main_shape_id': main_shape_id,
+            'create_text_box': main_shape_id is None,
+            'slides': slides,
+            'summary': self._summarize(shapes, slides)
+        }
+
+        self.logger.debug(f"渲染規劃: {plan['summary']}")
+        return plan
+
+    @staticmethod
+    def get_shape_ids(plan: Dict[str, Any], action: str) -> List[int]:
+        """
+        獲取指定處理方式的形狀 ID
+
+        Args:
+            plan: 渲染規劃
+            action: 'keep'、'replace' 或 'blank'
+
+        Returns:
+            List[int]: 形狀 ID 列表
+        """
+        return [shape['shape_id'] for shape in plan['shapes'] if shape['action'] == action]
+
+    def _plan_shapes(self, template_slide, compiled_template=None) -> List[Dict[str, Any]]:
+        """決定模板投影片上每個形狀的處理方式"""
+        main_shape_id = None
+        if compiled_template is not None and compiled_template.main_text_shape is not None:
+            main_shape_id = compiled_template.main_text_shape['shape_id']
+
+        planned = []
+        for shape in template_slide.shapes:
+            is_text = hasattr(shape, 'text_frame') and hasattr(shape, 'text')
+
+            if is_text and main_shape_id is None:
+                main_shape_id = shape.shape_id
+
+            if not is_text:
+                action = ACTION_KEEP
+            elif shape.shape_id == main_shape_id:
+                action = ACTION_REPLACE
+            else:
+                action = ACTION_BLANK
+
+            planned.append({
+                'shape_id': shape.shape_id,
+                'name': shape.name,
+                'kind': self._shape_kind(shape, is_text),
+                'action': action
+            })
+
+        return planned
+
+    @staticmethod
+    def _shape_kind(shape, is_text: bool) -> str:
+        """形狀種類（純字串）"""
+        try:
+            shape_type = shape.shape_type
+        except NotImplementedError:
+            shape_type = None
+
+        if shape_type is not None:
+            return shape_type.name.lower()
+        return 'text' if is_text else 'unknown'
+
+    @staticmethod
+    def _summarize(shapes: List[Dict[str, Any]], slides: List[Dict[str, Any]]) -> str:
+        """規劃摘要"""
+        counts = {ACTION_KEEP: 0, ACTION_REPLACE: 0, ACTION_BLANK: 0}
+        for shape in shapes:
+            counts[shape['action']] += 1
+        return (f"{len(slides)}張投影片, 保留{counts[ACTION_KEEP]}個形狀, "
+                f"取代{counts[ACTION_REPLACE]}個, 清空{counts[ACTION_BLANK]}個")
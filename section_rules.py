@@ -0,0 +1,204 @@
+"""
+章節切分規則模組 - 將多種章節標記編譯為單一正則表達式
+支援 1.、一、、(1)、①、◇ 等標記，並可依 Word 段落樣式（例如 Heading 1）切分
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import re
+
+
+CHINESE_DIGITS = {'零': 0, '〇': 0, '一': 1, '二': 2, '兩': 2, '三': 3, '四': 4,
+                  '五': 5, '六': 6, '七': 7, '八': 8, '九': 9}
+CHINESE_UNITS = {'十': 10, '百': 100, '千': 1000}
+
+# 帶圈數字 ①-⑳、㉑-㉟、㊱-㊿
+CIRCLED_RANGES = ((0x2460, 1, 20), (0x3251, 21, 35), (0x32B1, 36, 50))
+
+
+def parse_chinese_number(text: str) -> int:
+    """
+    將中文數字轉為整數（支援到千位，例如 十二、一百零五）
+
+    Args:
+        text: 中文數字
+
+    Returns:
+        int: 整數值
+
+    Raises:
+        ValueError: 含有無法辨識的字元時拋出
+    """
+    total = 0
+    digit = 0
+    for char in text:
+        if char in CHINESE_DIGITS:
+            digit = CHINESE_DIGITS[char]
+        elif char in CHINESE_UNITS:
+            total += (digit or 1) * CHINESE_UNITS[char]
+            digit = 0
+        else:
+            raise ValueError(f"無法辨識的中文數字: {text}")
+    return total + digit
+
+
+def parse_circled_number(text: str) -> int:
+    """
+    將帶圈數字轉為整數
+
+    Raises:
+        ValueError: 不是帶圈數字時拋出
+    """
+    code = ord(text)
+    for start, first, last in CIRCLED_RANGES:
+        if start <= code <= start + (last - first):
+            return first + code - start
+    raise ValueError(f"無法辨識的帶圈數字: {text}")
+
+
+class SectionRule:
+    """章節切分規則"""
+
+    def __init__(self, name: str, pattern: str,
+                 number_parser: Optional[Callable[[str], int]] = None,
+                 leading_chars: Optional[str] = None):
+        """
+        初始化章節切分規則
+
+        Args:
+            name: 規則名稱（英數字與底線，作為具名群組的前綴）
+            pattern: 正則表達式片段（不含 ^），以 (?P<title>...) 標出標題，
+                有編號時以 (?P<number>...) 標出編號
+            number_parser: 編號轉整數的函數（None 則依序自動編號）
+            leading_chars: 章節標題可能的第一個字元（字元類別內容，例如 '0-9'）；
+                所有規則都有設定時，合併的正則表達式會先檢查第一個字元，快速略過內文段落
+        """
+        if not re.fullmatch(r'[A-Za-z_][A-Za-z0-9_]*', name):
+            raise ValueError(f"規則名稱只能包含英數字與底線: {name}")
+        if '(?P<title>' not in pattern:
+            raise ValueError(f"規則 {name} 缺少 (?P<title>...) 群組")
+
+        self.name = name
+        self.pattern = pattern
+        self.number_parser = number_parser
+        self.leading_chars = leading_chars
+
+    def compile_fragment(self) -> str:
+        """以規則名稱為前綴改寫具名群組，作為合併正則表達式的一個分支"""
+        fragment = (self.pattern
+                    .replace('(?P<number>', f'(?P<{self.name}__number>')
+                    .replace('(?P<title>', f'(?P<{self.name}__title>'))
+        return f'(?P<{self.name}>{fragment})'
+
+
+# 內建規則
+BUILTIN_RULES: Dict[str, SectionRule] = {
+    'arabic': SectionRule('arabic', r'(?P<number>\d+)\.\s*(?P<title>.*)', int, r'\d'),
+    'chinese': SectionRule('chinese', r'(?P<number>[一二三四五六七八九十百千零〇兩]+)、\s*(?P<title>.*)',
+                           parse_chinese_number, '一二三四五六七八九十百千零〇兩'),
+    'paren': SectionRule('paren', r'[(（](?P<number>\d+)[)）]\s*(?P<title>.*)', int, '(（'),
+    'circled': SectionRule('circled', r'(?P<number>[①-⑳㉑-㉟㊱-㊿])\s*(?P<title>.*)',
+                           parse_circled_number, '①-⑳㉑-㉟㊱-㊿'),
+    'diamond': SectionRule('diamond', r'◇\s*(?P<title>.*)', leading_chars='◇')
+}
+
+DEFAULT_RULE_NAMES = ('arabic',)
+
+
+class SectionRuleSet:
+    """章節切分規則集 - 所有規則編譯為單一交替正則表達式，每個段落只比對一次"""
+
+    def __init__(self, rules: Optional[Iterable] = None, heading_styles: Iterable[str] = ()):
+        """
+        初始化規則集
+
+        Args:
+            rules: 規則（SectionRule 或內建規則名稱），依序比對；None 則只使用 'arabic'
+            heading_styles: 視為章節標題的 Word 段落樣式名稱（例如 'Heading 1'），
+                段落文字沒有符合任何規則時才依樣式判斷
+        """
+        self.rules: List[SectionRule] = [self._resolve_rule(rule)
+                                         for rule in (rules if rules is not None else DEFAULT_RULE_NAMES)]
+        self.heading_styles = frozenset(heading_styles)
+        self._rules_by_name = {rule.name: rule for rule in self.rules}
+        if len(self._rules_by_name) != len(self.rules):
+            raise ValueError("規則名稱不可重複")
+
+        self.pattern = self._compile(self.rules)
+
+        # 規則名稱 → (規則, 標題群組索引, 編號群組索引)，比對時不必再組合群組名稱
+        group_index = self.pattern.groupindex
+        self._branches: Dict[str, Tuple[SectionRule, int, Optional[int]]] = {
+            rule.name: (rule,
+                        group_index[f'{rule.name}__title'],
+                        group_index.get(f'{rule.name}__number') if rule.number_parser else None)
+            for rule in self.rules
+        }
+
+    @classmethod
+    def all_builtin(cls, heading_styles: Iterable[str] = ()) -> 'SectionRuleSet':
+        """使用所有內建規則的規則集"""
+        return cls(list(BUILTIN_RULES), heading_styles)
+
+    @property
+    def signature(self) -> str:
+        """規則集識別（作為解析快取鍵的一部分）"""
+        return f"{self.pattern.pattern}|styles={','.join(sorted(self.heading_styles))}"
+
+    def match(self, text: str, style: Optional[str] = None) -> Optional[Tuple[Optional[int], str, str]]:
+        """
+        判斷段落是否為章節標題
+
+        Args:
+            text: 去除首尾空白的段落文本
+            style: 段落樣式名稱
+
+        Returns:
+            Optional[Tuple]: (編號（自動編號時為 None）, 標題, 規則名稱)；不是章節標題時返回 None
+        """
+        return self.resolve(self.pattern.match(text), text, style)
+
+    def resolve(self, match: Optional[re.Match], text: str,
+                style: Optional[str] = None) -> Optional[Tuple[Optional[int], str, str]]:
+        """
+        將 pattern.match 的結果轉為章節資訊（供已自行呼叫 pattern.match 的熱迴圈使用）
+
+        Args:
+            match: self.pattern.match(text) 的結果
+            text: 去除首尾空白的段落文本
+            style: 段落樣式名稱
+
+        Returns:
+            Optional[Tuple]: 與 match() 相同
+        """
+        if match is not None:
+            # 外層群組最後結束，lastgroup 即為符合的規則名稱
+            rule, title_group, number_group = self._branches[match.lastgroup]
+            number = None
+            if number_group is not None:
+                number = rule.number_parser(match.group(number_group))
+            return number, match.group(title_group) or '', rule.name
+
+        if style is not None and style in self.heading_styles:
+            return None, text, 'style'
+
+        return None
+
+    @staticmethod
+    def _compile(rules: List[SectionRule]):
+        """將所有規則合併為單一交替正則表達式"""
+        if not rules:
+            # 沒有文字規則（只依樣式切分）時使用永不符合的表達式
+            return re.compile(r'(?!)')
+        guard = ''
+        if len(rules) > 1 and all(rule.leading_chars for rule in rules):
+            guard = '(?=[' + ''.join(rule.leading_chars for rule in rules) + '])'
+        return re.compile('^' + guard + '(?:' + '|'.join(rule.compile_fragment() for rule in rules) + ')')
+
+    @staticmethod
+    def _resolve_rule(rule) -> SectionRule:
+        """規則名稱轉為內建規則"""
+        if isinstance(rule, SectionRule):
+            return rule
+        if rule not in BUILTIN_RULES:
+            raise ValueError(f"未知的章節切分規則: {rule}（可用: {', '.join(BUILTIN_RULES)}）")
+        return BUILTIN_RULES[rule]
@@ -0,0 +1,517 @@
+"""
+欄式章節儲存模組 - 以陣列保存解析結果，降低大量文件常駐時的記憶體用量
+所有段落與運行文字集中在單一字串緩衝區，以位移/長度陣列定位；運行格式以樣式表索引表示。
+透過 SectionList / ParagraphList 提供與原本 dict 結構相容的唯讀檢視。
+"""
+
+from array import array
+from collections.abc import Mapping, Sequence
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+
+
+# 運行格式欄位（不含文字）
+RUN_STYLE_KEYS = ('font_name', 'font_size', 'font_bold', 'font_italic', 'font_underline', 'font_color')
+
+# text_only 的組成方式
+TEXT_ONLY_TITLE_FIRST = 0   # 標題 + 其餘段落（SectionBuilder 的編號章節）
+TEXT_ONLY_JOINED = 1        # 所有段落以換行連接（前言、純文字章節）
+TEXT_ONLY_EXPLICIT = 2      # 另存於緩衝區
+
+SECTION_KEYS = ('number', 'title', 'content', 'text_only', 'formatting')
+PARAGRAPH_KEYS = ('text', 'style', 'formatting')
+
+
+class DocumentStore:
+    """
+    欄式文件內容
+
+    段落表：原始文字（位移/長度）、去除首尾空白後的範圍、樣式索引、運行範圍
+    運行表：文字（位移/長度）、樣式索引
+    章節表：編號、標題（位移/長度）、段落範圍、text_only 組成方式
+    章節為段落表中連續的區段（每個非空段落恰好屬於一個章節）。
+    """
+
+    def __init__(self):
+        """初始化空的文件內容"""
+        self._chunks: List[str] = []
+        self._length = 0
+        self._buffer: Optional[str] = None
+
+        self.paragraph_offset = array('I')
+        self.paragraph_length = array('I')
+        self.paragraph_strip_start = array('I')
+        self.paragraph_strip_length = array('I')
+        self.paragraph_style = array('I')
+        self.paragraph_run_start = array('I', [0])
+
+        self.run_offset = array('I')
+        self.run_length = array('I')
+        self.run_style = array('I')
+
+        self.section_number = array('q')
+        self.section_title_offset = array('I')
+        self.section_title_length = array('I')
+        self.section_text_offset = array('I')
+        self.section_text_length = array('I')
+        self.section_text_mode = array('B')
+        self.section_paragraph_start = array('I', [0])
+
+        # 樣式表：段落樣式名稱與運行格式（格式值保留原本的物件，例如 Length、RGBColor）
+        self.paragraph_styles: List[Optional[str]] = []
+        self.run_styles: List[Dict[str, Any]] = []
+        self._paragraph_style_index: Dict[Optional[str], int] = {}
+        self._run_style_index: Dict[Tuple, int] = {}
+
+    @classmethod
+    def build(cls, paragraphs: Iterable[Dict[str, Any]],
+              sections: Iterable[Dict[str, Any]]) -> 'DocumentStore':
+        """
+        由段落記錄與章節建立
+
+        Args:
+            paragraphs: 非空段落記錄 {'text'（原始文字）, 'style', 'formatting'}
+            sections: 依序涵蓋所有段落的章節（SectionBuilder 的輸出）
+
+        Returns:
+            DocumentStore: 欄式文件內容
+
+        Raises:
+            ValueError: 章節內容與段落不一致時拋出
+        """
+        store = cls()
+        for paragraph in paragraphs:
+            store._append_paragraph(paragraph['text'], paragraph.get('style'), paragraph['formatting'])
+        store._freeze()
+
+        start = 0
+        for section in sections:
+            count = len(section['content'])
+            for index, text in enumerate(section['content']):
+                if start + index >= len(store.paragraph_offset) or \
+                        store.paragraph_stripped_text(start + index) != text:
+                    raise ValueError(f"章節 {section['number']} 的內容與段落不一致")
+            store._append_section(section, start, count)
+            start += count
+
+        if start != len(store.paragraph_offset):
+            raise ValueError("章節沒有涵蓋所有段落")
+        store._freeze()
+        return store
+
+    @classmethod
+    def from_sections(cls, sections: Iterable[Dict[str, Any]]) -> 'DocumentStore':
+        """
+        只由章節建立（沒有段落記錄時，例如純文字章節）
+
+        Args:
+            sections: 章節資料
+
+        Returns:
+            DocumentStore: 欄式文件內容
+        """
+        store = cls()
+        start = 0
+        for section in sections:
+            formatting = section.get('formatting') or []
+            for index, text in enumerate(section['content']):
+                store._append_paragraph(text, None, formatting[index] if index < len(formatting) else [])
+            store._append_section(section, start, len(section['content']))
+            start += len(section['content'])
+        store._freeze()
+        return store
+
+    @property
+    def sections(self) -> 'SectionList':
+        """章節的相容檢視"""
+        return SectionList(self)
+
+    @property
+    def paragraphs(self) -> 'ParagraphList':
+        """段落的相容檢視（basic_content['paragraphs']）"""
+        return ParagraphList(self)
+
+    @property
+    def text(self) -> str:
+        """文字緩衝區"""
+        return self._buffer
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        獲取儲存統計
+
+        Returns:
+            Dict: 章節、段落、運行與樣式數，以及陣列與文字緩衝區的大小（位元組）
+        """
+        arrays = [value for value in vars(self).values() if isinstance(value, array)]
+        return {
+            'sections': len(self.section_number),
+            'paragraphs': len(self.paragraph_offset),
+            'runs': len(self.run_offset),
+            'run_styles': len(self.run_styles),
+            'paragraph_styles': len(self.paragraph_styles),
+            'text_chars': len(self._buffer),
+            'array_bytes': sum(a.itemsize * len(a) for a in arrays)
+        }
+
+    # 章節存取
+
+    def section_count(self) -> int:
+        """章節數"""
+        return len(self.section_number)
+
+    def section_content(self, index: int) -> List[str]:
+        """章節的段落文字（去除首尾空白）"""
+        start, end = self.section_paragraph_start[index], self.section_paragraph_start[index + 1]
+        return [self.paragraph_stripped_text(p) for p in range(start, end)]
+
+    def section_title(self, index: int) -> str:
+        """章節標題"""
+        offset = self.section_title_offset[index]
+        return self._buffer[offset:offset + self.section_title_length[index]]
+
+    def section_text_only(self, index: int) -> str:
+        """章節的純文字（與 SectionBuilder 的 text_only 相同）"""
+        mode = self.section_text_mode[index]
+        if mode == TEXT_ONLY_EXPLICIT:
+            offset = self.section_text_offset[index]
+            return self._buffer[offset:offset + self.section_text_length[index]]
+
+        content = self.section_content(index)
+        if mode == TEXT_ONLY_JOINED:
+            return '\n'.join(content)
+        return _title_first_text(self.section_title(index), content)
+
+    def section_formatting(self, index: int) -> List[List[Dict[str, Any]]]:
+        """章節每個段落的運行格式"""
+        start, end = self.section_paragraph_start[index], self.section_paragraph_start[index + 1]
+        return [self.paragraph_formatting(p) for p in range(start, end)]
+
+    # 段落存取
+
+    def paragraph_text(self, index: int) -> str:
+        """段落原始文字"""
+        offset = self.paragraph_offset[index]
+        return self._buffer[offset:offset + self.paragraph_length[index]]
+
+    def paragraph_stripped_text(self, index: int) -> str:
+        """段落去除首尾空白後的文字"""
+        offset = self.paragraph_offset[index] + self.paragraph_strip_start[index]
+        return self._buffer[offset:offset + self.paragraph_strip_length[index]]
+
+    def paragraph_style_name(self, index: int) -> Optional[str]:
+        """段落樣式名稱"""
+        return self.paragraph_styles[self.paragraph_style[index]]
+
+    def paragraph_formatting(self, index: int) -> List[Dict[str, Any]]:
+        """段落的運行格式（每次呼叫建立新的 dict）"""
+        buffer = self._buffer
+        runs = []
+        for run in range(self.paragraph_run_start[index], self.paragraph_run_start[index + 1]):
+            offset = self.run_offset[run]
+            formatting = {'text': buffer[offset:offset + self.run_length[run]]}
+            formatting.update(self.run_styles[self.run_style[run]])
+            runs.append(formatting)
+        return runs
+
+    # 建立
+
+    def _append_text(self, text: str) -> int:
+        """加入文字並返回位移"""
+        offset = self._length
+        self._chunks.append(text)
+        self._length += len(text)
+        return offset
+
+    def _append_paragraph(self, raw_text: str, style: Optional[str], formatting: List[Dict[str, Any]]):
+        """加入段落與其運行"""
+        offset = self._append_text(raw_text)
+        stripped = raw_text.strip()
+        self.paragraph_offset.append(offset)
+        self.paragraph_length.append(len(raw_text))
+        self.paragraph_strip_start.append(len(raw_text) - len(raw_text.lstrip()) if stripped else 0)
+        self.paragraph_strip_length.append(len(stripped))
+        self.paragraph_style.append(self._intern_paragraph_style(style))
+
+        # 運行文字連接起來通常就是段落文字，此時直接指向段落文字，不重複保存
+        run_texts = [run['text'] for run in formatting]
+        shared = ''.join(run_texts) == raw_text
+        position = offset
+        for run, run_text in zip(formatting, run_texts):
+            if shared:
+                self.run_offset.append(position)
+                position += len(run_text)
+            else:
+                self.run_offset.append(self._append_text(run_text))
+            self.run_length.append(len(run_text))
+            self.run_style.append(self._intern_run_style(run))
+        self.paragraph_run_start.append(len(self.run_offset))
+
+    def _append_section(self, section: Dict[str, Any], start: int, count: int):
+        """加入章節（涵蓋段落 start 起的 count 個段落）"""
+        content = section['content']
+        title = section.get('title', '') or ''
+        text_only = section.get('text_only', '')
+
+        # 標題通常是第一個段落的結尾（「N. 標題」），此時指向段落文字
+        title_offset = None
+        if count and title:
+            first_end = (self.paragraph_offset[start] + self.paragraph_strip_start[start] +
+                         self.paragraph_strip_length[start])
+            if content[0].endswith(title):
+                title_offset = first_end - len(title)
+        if title_offset is None:
+            title_offset = self._append_text(title)
+
+        if text_only == _title_first_text(title, content):
+            mode, text_offset, text_length = TEXT_ONLY_TITLE_FIRST, 0, 0
+        elif text_only == '\n'.join(content):
+            mode, text_offset, text_length = TEXT_ONLY_JOINED, 0, 0
+        else:
+            mode, text_offset, text_length = TEXT_ONLY_EXPLICIT, self._append_text(text_only), len(text_only)
+
+        self.section_number.append(section['number'])
+        self.section_title_offset.append(title_offset)
+        self.section_title_length.append(len(title))
+        self.section_text_offset.append(text_offset)
+        self.section_text_length.append(text_length)
+        self.section_text_mode.append(mode)
+        self.section_paragraph_start.append(start + count)
+
+    def _freeze(self):
+        """合併文字緩衝區（之後仍可繼續加入文字，已有的位移不變）"""
+        self._buffer = ''.join(self._chunks)
+        self._chunks = [self._buffer]
+
+    def _intern_paragraph_style(self, style: Optional[str]) -> int:
+        """段落樣式名稱轉為索引"""
+        index = self._paragraph_style_index.get(style)
+        if index is None:
+            index = self._paragraph_style_index[style] = len(self.paragraph_styles)
+            self.paragraph_styles.append(style)
+        return index
+
+    def _intern_run_style(self, run: Dict[str, Any]) -> int:
+        """運行格式轉為樣式表索引（相同格式共用一個項目）"""
+        values = tuple(run.get(key) for key in RUN_STYLE_KEYS)
+        # 連同型別比較，避免 True 與 WD_UNDERLINE.SINGLE (== 1) 被視為相同
+        key = tuple((value.__class__, value) for value in values)
+        index = self._run_style_index.get(key)
+        if index is None:
+            index = self._run_style_index[key] = len(self.run_styles)
+            self.run_styles.append(dict(zip(RUN_STYLE_KEYS, values)))
+        return index
+
+    # 序列化（解析快取）
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """序列化時略過建立期間的索引與暫存文字"""
+        state = {key: value for key, value in self.__dict__.items()
+                 if key not in ('_chunks', '_paragraph_style_index', '_run_style_index', 'run_styles')}
+        state['run_styles'] = [encode_run({'text': '', **style})[1:] for style in self.run_styles]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        """還原樣式表（格式值轉回 python-docx 類型）"""
+        from docx.shared import Length, RGBColor
+        from docx.enum.text import WD_UNDERLINE
+
+        run_styles = state.pop('run_styles')
+        self.__dict__.update(state)
+        self._chunks = [self._buffer]
+        self.run_styles = []
+        for encoded in run_styles:
+            decoded = decode_run(('',) + tuple(encoded), Length, RGBColor, WD_UNDERLINE)
+            del decoded['text']
+            self.run_styles.append(decoded)
+        self._paragraph_style_index = {style: index for index, style in enumerate(self.paragraph_styles)}
+        self._run_style_index = {}
+
+
+class SectionView(Mapping):
+    """單一章節的唯讀 dict 檢視（欄位於存取時才建立）"""
+
+    __slots__ = ('_store', '_index')
+
+    def __init__(self, store: DocumentStore, index: int):
+        self._store = store
+        self._index = index
+
+    def __getitem__(self, key: str) -> Any:
+        store, index = self._store, self._index
+        if key == 'number':
+            return store.section_number[index]
+        if key == 'title':
+            return store.section_title(index)
+        if key == 'content':
+            return store.section_content(index)
+        if key == 'text_only':
+            return store.section_text_only(index)
+        if key == 'formatting':
+            return store.section_formatting(index)
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(SECTION_KEYS)
+
+    def __len__(self) -> int:
+        return len(SECTION_KEYS)
+
+    def __repr__(self) -> str:
+        return f"SectionView({self.to_dict()!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """轉為一般的 dict"""
+        return {key: self[key] for key in SECTION_KEYS}
+
+
+class ParagraphView(Mapping):
+    """單一段落的唯讀 dict 檢視"""
+
+    __slots__ = ('_store', '_index')
+
+    def __init__(self, store: DocumentStore, index: int):
+        self._store = store
+        self._index = index
+
+    def __getitem__(self, key: str) -> Any:
+        if key == 'text':
+            return self._store.paragraph_text(self._index)
+        if key == 'style':
+            return self._store.paragraph_style_name(self._index)
+        if key == 'formatting':
+            return self._store.paragraph_formatting(self._index)
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(PARAGRAPH_KEYS)
+
+    def __len__(self) -> int:
+        return len(PARAGRAPH_KEYS)
+
+    def __repr__(self) -> str:
+        return f"ParagraphView({dict(self)!r})"
+
+
+class _StoreList(Sequence):
+    """欄式儲存的序列檢視"""
+
+    __slots__ = ('store',)
+    view_class = SectionView
+
+    def __init__(self, store: DocumentStore):
+        self.store = store
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.view_class(self.store, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self.view_class(self.store, index)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Sequence) or len(self) != len(other):
+            return False
+        return all(a == b for a, b in zip(self, other))
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """轉為一般的 dict 列表"""
+        return [dict(view) for view in self]
+
+
+class SectionList(_StoreList):
+    """章節序列（與 List[Dict] 相容的唯讀檢視）"""
+
+    __slots__ = ()
+    view_class = SectionView
+
+    def __len__(self) -> int:
+        return len(self.store.section_number)
+
+    def __repr__(self) -> str:
+        return f"SectionList({len(self)} sections)"
+
+
+class ParagraphList(_StoreList):
+    """段落序列（與 List[Dict] 相容的唯讀檢視）"""
+
+    __slots__ = ()
+    view_class = ParagraphView
+
+    def __len__(self) -> int:
+        return len(self.store.paragraph_offset)
+
+    def __repr__(self) -> str:
+        return f"ParagraphList({len(self)} paragraphs)"
+
+
+def _title_first_text(title: str, content: List[str]) -> str:
+    """SectionBuilder 的 text_only：由標題開始，依序以換行加入其餘段落"""
+    text = title
+    for line in content[1:]:
+        text = text + '\n' + line if text else line
+    return text
+
+
+def encode_run(run: Dict[str, Any]) -> Tuple:
+    """
+    運行格式字典轉為純資料元組（解析快取與增量轉換雜湊使用）
+
+    python-docx 的 Length、RGBColor、WD_UNDERLINE 轉為整數。
+
+    Args:
+        run: 運行格式（含 text）
+
+    Returns:
+        Tuple: (text, font_name, font_size, bold, italic, underline, color)
+    """
+    underline = run.get('font_underline')
+    if underline is not None and not isinstance(underline, bool):
+        underline = int(underline)
+
+    color = run.get('font_color')
+    if color is not None and color != 'theme_color':
+        color = (color[0] << 16) | (color[1] << 8) | color[2]
+
+    font_size = run.get('font_size')
+    return (
+        run['text'],
+        run.get('font_name'),
+        int(font_size) if font_size is not None else None,
+        run.get('font_bold'),
+        run.get('font_italic'),
+        underline,
+        color
+    )
+
+
+def decode_run(run: Tuple, length_type, rgb_type, underline_type) -> Dict[str, Any]:
+    """
+    encode_run 的元組還原為運行格式字典
+
+    Args:
+        run: encode_run 的輸出
+        length_type: 字體大小類型（docx.shared.Length）
+        rgb_type: 顏色類型（docx.shared.RGBColor）
+        underline_type: 底線類型（WD_UNDERLINE）
+
+    Returns:
+        Dict: 運行格式
+    """
+    text, font_name, font_size, bold, italic, underline, color = run
+
+    if underline is not None and not isinstance(underline, bool):
+        underline = underline_type(underline)
+    if isinstance(color, int):
+        color = rgb_type((color >> 16) & 0xFF, (color >> 8) & 0xFF, color & 0xFF)
+
+    return {
+        'text': text,
+        'font_name': font_name,
+        'font_size': length_type(font_size) if font_size is not None else None,
+        'font_bold': bold,
+        'font_italic': italic,
+        'font_underline': underline,
+        'font_color': color
+    }
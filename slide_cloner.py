@@ -0,0 +1,217 @@
+"""
+投影片複製引擎模組 - 在 XML/部件層級複製投影片
+直接深度複製原型投影片的 spTree 並重建關聯，取代逐一形狀重建的方式
+"""
+
+from typing import Dict, Optional, Tuple, Any
+import copy
+import logging
+import weakref
+
+
+# 直接使用 Clark 記號，避免載入模組時匯入 python-pptx
+P_NS = 'http://schemas.openxmlformats.org/presentationml/2006/main'
+A_NS = 'http://schemas.openxmlformats.org/drawingml/2006/main'
+R_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+P = '{%s}' % P_NS
+A = '{%s}' % A_NS
+R_ATTR_PREFIX = '{%s}' % R_NS
+
+# spTree 中屬於群組本身（而非形狀）的子元素
+GROUP_PROPERTY_TAGS = (P + 'nvGrpSpPr', P + 'grpSpPr')
+
+
+class SlideCloneError(Exception):
+    """投影片複製錯誤"""
+    pass
+
+
+class XmlSlideCloner:
+    """XML 層級投影片複製器"""
+
+    name = 'xml'
+
+    def __init__(self, logger: Optional[logging.Logger] = None):
+        """
+        初始化 XML 投影片複製器
+
+        Args:
+            logger: 日誌記錄器
+        """
+        self.logger = logger or logging.getLogger(__name__)
+        # 每個源部件的關聯只解析一次：rId -> (reltype, 目標部件或網址, 是否外部)
+        self._resolved_rels = weakref.WeakKeyDictionary()
+
+    def clone(self, source_slide, target_slide):
+        """
+        將源投影片的背景與全部形狀複製到目標投影片
+
+        目標投影片原有的形狀（例如版面配置帶入的占位符）會被移除，
+        形狀 XML 原樣複製，圖片與超連結的關聯指向相同的部件或網址。
+
+        Args:
+            source_slide: 源（原型）投影片
+            target_slide: 目標投影片
+
+        Raises:
+            SlideCloneError: 複製失敗時拋出
+        """
+        self.clone_prepared(self.prepare(source_slide), target_slide)
+
+    def prepare(self, source_slide, blank_shape_ids=()) -> Dict[str, Any]:
+        """
+        預先準備原型，供多次 clone_prepared 使用
+
+        指定的形狀只保留文本框架的結構（bodyPr、lstStyle 與第一個段落的段落屬性），
+        其文字與運行格式不會被複製到新投影片。
+
+        Args:
+            source_slide: 源（原型）投影片
+            blank_shape_ids: 要清空文字的形狀 ID
+
+        Returns:
+            Dict: 原型（源部件、背景與形狀元素）
+        """
+        blank_shape_ids = set(blank_shape_ids)
+        shapes = []
+        for child in source_slide.shapes._spTree:
+            if child.tag in GROUP_PROPERTY_TAGS:
+                continue
+            element = copy.deepcopy(child)
+            if self._shape_id_of(element) in blank_shape_ids:
+                self._strip_text(element)
+            shapes.append(element)
+
+        source_bg = source_slide._element.cSld.find(P + 'bg')
+        return {
+            'source_part': source_slide.part,
+            'background': copy.deepcopy(source_bg) if source_bg is not None else None,
+            'shapes': shapes
+        }
+
+    def clone_prepared(self, prototype: Dict[str, Any], target_slide):
+        """
+        從預先準備的原型複製投影片
+
+        Args:
+            prototype: prepare 返回的原型
+            target_slide: 目標投影片
+
+        Raises:
+            SlideCloneError: 複製失敗時拋出
+        """
+        try:
+            rId_map: Dict[str, str] = {}
+            source_part = prototype['source_part']
+            target_part = target_slide.part
+
+            target_cSld = target_slide._element.cSld
+            target_bg = target_cSld.find(P + 'bg')
+            if target_bg is not None:
+                target_cSld.remove(target_bg)
+            if prototype['background'] is not None:
+                new_bg = copy.deepcopy(prototype['background'])
+                self._remap_relationships(new_bg, source_part, target_part, rId_map)
+                # p:bg 必須是 p:cSld 的第一個子元素
+                target_cSld.insert(0, new_bg)
+
+            target_tree = target_slide.shapes._spTree
+            for child in list(target_tree):
+                if child.tag not in GROUP_PROPERTY_TAGS:
+                    target_tree.remove(child)
+
+            for element in prototype['shapes']:
+                new_element = copy.deepcopy(element)
+                self._remap_relationships(new_element, source_part, target_part, rId_map)
+                target_tree.append(new_element)
+
+        except Exception as e:
+            self.logger.error(f"XML 複製投影片失敗: {e}")
+            raise SlideCloneError(f"XML 複製投影片失敗: {e}")
+
+    def clone_shape(self, source_shape, target_slide):
+        """
+        將單一形狀的 XML 複製到目標投影片
+
+        圖片形狀會以新的關聯引用模板中既有的圖片部件，不會重新讀取或雜湊圖片內容。
+
+        Args:
+            source_shape: 源形狀
+            target_slide: 目標投影片
+
+        Returns:
+            目標投影片上新增的形狀物件
+
+        Raises:
+            SlideCloneError: 複製失敗時拋出
+        """
+        try:
+            new_element = copy.deepcopy(source_shape._element)
+            self._remap_relationships(new_element, source_shape.part, target_slide.part, {})
+
+            # 與 add_picture 等方法一致，使用目標投影片下一個可用的形狀 ID
+            cNvPr = new_element.find('.//' + P + 'cNvPr')
+            if cNvPr is not None:
+                cNvPr.set('id', str(target_slide.shapes._next_shape_id))
+
+            target_tree = target_slide.shapes._spTree
+            target_tree.append(new_element)
+            return target_slide.shapes[-1]
+        except Exception as e:
+            self.logger.error(f"XML 複製形狀失敗: {e}")
+            raise SlideCloneError(f"XML 複製形狀失敗: {e}")
+
+    @staticmethod
+    def _shape_id_of(element) -> Optional[int]:
+        """形狀元素的 ID（cNvPr/@id）"""
+        cNvPr = element.find('.//' + P + 'cNvPr')
+        if cNvPr is None:
+            return None
+        try:
+            return int(cNvPr.get('id'))
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _strip_text(element):
+        """清空形狀文字，結果與 TextFrame.clear() 相同"""
+        txBody = element.find(P + 'txBody')
+        if txBody is None:
+            return
+        paragraphs = txBody.findall(A + 'p')
+        for paragraph in paragraphs[1:]:
+            txBody.remove(paragraph)
+        if paragraphs:
+            for child in list(paragraphs[0]):
+                if child.tag in (A + 'r', A + 'br', A + 'fld'):
+                    paragraphs[0].remove(child)
+
+    def _remap_relationships(self, element, source_part, target_part, rId_map: Dict[str, str]):
+        """將複製元素中的 r:embed / r:link / r:id 等屬性改指向目標部件的關聯"""
+        for node in element.iter():
+            for attr_name, rId in node.attrib.items():
+                if not attr_name.startswith(R_ATTR_PREFIX):
+                    continue
+                if rId not in rId_map:
+                    rId_map[rId] = self._relate(source_part, target_part, rId)
+                node.set(attr_name, rId_map[rId])
+
+    def _relate(self, source_part, target_part, rId: str) -> str:
+        """在目標部件建立與源關聯相同目標的關聯（共用同一個目標部件）"""
+        reltype, target, is_external = self._resolve_relationship(source_part, rId)
+        return target_part.relate_to(target, reltype, is_external=is_external)
+
+    def _resolve_relationship(self, source_part, rId: str) -> Tuple[str, Any, bool]:
+        """解析源部件的關聯目標，結果依源部件快取"""
+        resolved = self._resolved_rels.get(source_part)
+        if resolved is None:
+            resolved = {}
+            self._resolved_rels[source_part] = resolved
+
+        if rId not in resolved:
+            rel = source_part.rels[rId]
+            if rel.is_external:
+                resolved[rId] = (rel.reltype, rel.target_ref, True)
+            else:
+                resolved[rId] = (rel.reltype, rel.target_part, False)
+        return resolved[rId]
@@ -3,14 +3,17 @@
 提供投影片複製、內容替換、格式處理等功能
 """
 
-from typing import Dict, List, Any, Optional, Callable
-from pptx import Presentation
-from pptx.enum.shapes import MSO_SHAPE_TYPE
-from pptx.util import Inches
+from typing import Dict, List, Any, Optional, Callable, Tuple, TYPE_CHECKING
 import os
-import io
 import logging
+import time
 from format_handler import FormatHandler
+from slide_cloner import XmlSlideCloner, SlideCloneError
+from render_plan import RenderPlanner, ACTION_REPLACE, ACTION_BLANK, SOURCE_TEMPLATE
+from tracing import Tracer
+
+if TYPE_CHECKING:
+    from pptx.presentation import Presentation
 
 
 class SlideOperationError(Exception):
@@ -18,19 +21,49 @@ class SlideOperationError(Exception):
     pass
 
 
+SLIDE_PARTNAME_TEMPLATE = '/ppt/slides/slide%d.xml'
+MIN_SLIDE_ID = 256
+MAX_SLIDE_ID = 2147483647
+
+
 class SlideManager:
     """投影片管理器"""
     
-    def __init__(self, format_handler: FormatHandler, logger: Optional[logging.Logger] = None):
+    # 'xml': 在 XML/部件層級複製投影片；'shape': 逐一形狀透過 python-pptx 重建
+    CLONE_MODES = ('xml', 'shape')
+    
+    def __init__(self, format_handler: FormatHandler, logger: Optional[logging.Logger] = None,
+                 clone_mode: str = 'xml', tracer: Optional[Tracer] = None):
         """
         初始化投影片管理器
         
         Args:
             format_handler: 格式處理器
             logger: 日誌記錄器
+            clone_mode: 投影片複製方式（'xml' 或 'shape'）
+            tracer: 區段追蹤器（None 則不記錄區段）
         """
         self.format_handler = format_handler
         self.logger = logger or logging.getLogger(__name__)
+        self.tracer = tracer or Tracer(enabled=False)
+        self.xml_cloner = XmlSlideCloner(self.logger)
+        self.render_planner = RenderPlanner(self.logger)
+        self.clone_mode = 'xml'
+        self.set_clone_mode(clone_mode)
+    
+    def set_clone_mode(self, clone_mode: str):
+        """
+        設置投影片複製方式
+        
+        Args:
+            clone_mode: 'xml' 或 'shape'
+            
+        Raises:
+            ValueError: 不支持的複製方式
+        """
+        if clone_mode not in self.CLONE_MODES:
+            raise ValueError(f"不支持的投影片複製方式: {clone_mode}")
+        self.clone_mode = clone_mode
     
     def duplicate_slide(self, ppt_file_path: str, source_slide_number: int, 
                        copy_count: int = 1, output_file: Optional[str] = None) -> Dict[str, Any]:
@@ -49,6 +82,8 @@ class SlideManager:
         Raises:
             SlideOperationError: 操作失敗時拋出
         """
+        from pptx import Presentation
+        
         try:
             if not os.path.exists(ppt_file_path):
                 raise SlideOperationError(f"檔案不存在: {ppt_file_path}")
@@ -87,8 +122,26 @@ class SlideManager:
             self.logger.error(error_msg)
             raise SlideOperationError(error_msg)
     
-    def replace_slides_with_sections(self, prs: Presentation, sections: List[Dict[str, Any]], 
-                                   template_slide, progress_callback: Optional[Callable] = None) -> Dict[str, Any]:
+    def build_render_plan(self, template_slide, sections: List[Dict[str, Any]],
+                          compiled_template=None) -> Dict[str, Any]:
+        """
+        建立渲染規劃（不修改任何投影片，可用於乾跑）
+        
+        Args:
+            template_slide: 模板投影片
+            sections: 章節資料列表
+            compiled_template: 編譯後的模板
+            
+        Returns:
+            Dict: 渲染規劃（純資料）
+        """
+        return self.render_planner.build_plan(template_slide, sections, compiled_template)
+    
+    def replace_slides_with_sections(self, prs: 'Presentation', sections: List[Dict[str, Any]], 
+                                   template_slide, progress_callback: Optional[Callable] = None,
+                                   compiled_template=None,
+                                   render_plan: Optional[Dict[str, Any]] = None,
+                                   slide_writer=None) -> Dict[str, Any]:
         """
         用章節內容替換投影片
         
@@ -97,17 +150,23 @@ class SlideManager:
             sections: 章節資料列表
             template_slide: 模板投影片
             progress_callback: 進度回調函數
+            compiled_template: 編譯後的模板（CompiledTemplate，提供主文本框資訊）
+            render_plan: 渲染規劃（None 則自動建立）
+            slide_writer: 串流套件寫入器（StreamingPackageWriter）；提供時每張新投影片
+                在渲染時才建立，完成後立即寫入輸出檔並釋放，第一張投影片留待 finish() 寫入
             
         Returns:
-            Dict: 操作結果
+            Dict: 操作結果（timings 含複製、替換與串流寫入的總耗時及每張投影片耗時，單位秒）
         """
         result = {
             'success': False,
             'slides_created': 0,
             'skipped_sections': [],
             'format_issues': [],
+            'timings': {'clone': 0.0, 'replace': 0.0, 'write': 0.0, 'slides': []},
             'error': None
         }
+        timings = result['timings']
         
         try:
             template_layout = template_slide.slide_layout
@@ -117,31 +176,85 @@ class SlideManager:
             
             slides_created = 0
             
+            if render_plan is None:
+                with self.tracer.span('slides.plan'):
+                    render_plan = self.build_render_plan(template_slide, sections, compiled_template)
+            
+            # 在第一張投影片被修改前準備原型；將被取代或清空的文字不會被複製
+            prototype = None
+            if self.clone_mode == 'xml':
+                with self.tracer.span('slides.prepare_prototype'):
+                    prototype = self.xml_cloner.prepare(
+                        template_slide,
+                        RenderPlanner.get_shape_ids(render_plan, ACTION_REPLACE) +
+                        RenderPlanner.get_shape_ids(render_plan, ACTION_BLANK))
+            
+            # 一次配置所有新投影片（第一個段落使用第一張投影片）；
+            # 串流輸出時只預留部件名稱與 ID，投影片在渲染時才建立
+            clone_placeholders = (self.clone_mode != 'xml')
+            new_slides = []
+            slots = None
+            with self.tracer.span('slides.allocate', count=max(len(sections) - 1, 0)):
+                if slide_writer is not None:
+                    slots = self._reserve_slide_slots(prs, max(len(sections) - 1, 0))
+                    if slots is None:
+                        raise SlideOperationError("投影片 ID 不足，無法串流輸出")
+                else:
+                    new_slides = self.allocate_slides(
+                        prs, template_layout, len(sections) - 1, clone_placeholders=clone_placeholders)
+            
             for i, section in enumerate(sections):
+                target_slide = None
                 try:
                     if progress_callback:
                         progress_callback(i + 1, len(sections), f"處理段落 {section['number']}")
                     
                     if i == 0:
                         target_slide = prs.slides[0]  # 使用第一張投影片
+                    elif slots is not None:
+                        target_slide = self._create_slide(prs, template_layout, slots[i - 1], clone_placeholders)
                     else:
-                        target_slide = prs.slides.add_slide(template_layout)
-                        self._copy_slide_completely(template_slide, target_slide)
+                        target_slide = new_slides[i - 1]
+                    
+                    slide_start = time.perf_counter()
+                    if i > 0:
+                        with self.tracer.span('slide.clone', slide_index=i, mode=self.clone_mode):
+                            if prototype is not None:
+                                self._clone_from_prototype(prototype, target_slide)
+                            else:
+                                self._copy_slide_completely(template_slide, target_slide)
+                    clone_end = time.perf_counter()
                     
                     # 替換內容
-                    self._replace_slide_content(target_slide, section, template_slide)
+                    with self.tracer.span('slide.replace', slide_index=i, section=section['number'],
+                                          content_mode=render_plan['slides'][i]['content_mode']):
+                        self._replace_slide_content(target_slide, section, template_slide, compiled_template,
+                                                    render_plan, render_plan['slides'][i])
+                    slide_end = time.perf_counter()
+                    
+                    timings['clone'] += clone_end - slide_start
+                    timings['replace'] += slide_end - clone_end
+                    timings['slides'].append(slide_end - slide_start)
                     slides_created += 1
                     
                     self.logger.debug(f"成功處理段落 {section['number']}")
                     
                 except Exception as e:
                     error_info = {
+                        'index': i,
                         'number': section['number'],
                         'title': section.get('title', ''),
                         'error': str(e)
                     }
                     result['skipped_sections'].append(error_info)
                     self.logger.warning(f"跳過段落 {section['number']}: {e}")
+                
+                # 寫入失敗時無法繼續串流，例外交由外層處理
+                if slots is not None and i > 0 and target_slide is not None:
+                    write_start = time.perf_counter()
+                    with self.tracer.span('slide.write', slide_index=i):
+                        slide_writer.write_slide(prs.part, slots[i - 1][1], target_slide.part)
+                    timings['write'] += time.perf_counter() - write_start
             
             result.update({
                 'success': True,
@@ -157,6 +270,76 @@ class SlideManager:
         
         return result
     
+    def allocate_slides(self, prs: 'Presentation', slide_layout, count: int,
+                        clone_placeholders: bool = True) -> List:
+        """
+        批次配置投影片
+        
+        一次掃描現有的部件名稱、投影片 ID 與關聯 ID，預留 count 組後再逐一建立。
+        prs.slides.add_slide 每次呼叫都會重新掃描整個套件，建立 N 張投影片需要 O(N²)，
+        此方法為 O(N)。
+        
+        Args:
+            prs: PowerPoint 演示文稿物件
+            slide_layout: 新投影片使用的版面配置
+            count: 投影片數量
+            clone_placeholders: 是否從版面配置複製占位符（與 add_slide 相同）
+            
+        Returns:
+            List: 新建立的投影片（依加入順序）
+        """
+        if count <= 0:
+            return []
+        
+        slots = self._reserve_slide_slots(prs, count)
+        if slots is None:
+            # 投影片 ID 用盡時退回逐張加入（add_slide 會搜尋可重用的 ID）
+            self.logger.debug("投影片 ID 接近上限，改用逐張加入")
+            return [prs.slides.add_slide(slide_layout) for _ in range(count)]
+        
+        slides = [self._create_slide(prs, slide_layout, slot, clone_placeholders) for slot in slots]
+        
+        self.logger.debug(f"批次配置了 {count} 張投影片")
+        return slides
+    
+    def _reserve_slide_slots(self, prs: 'Presentation', count: int) -> Optional[List[Tuple[str, str, int]]]:
+        """
+        一次預留 count 組投影片的 (部件名稱, 關聯 ID, 投影片 ID)
+        
+        Returns:
+            Optional[List[Tuple]]: 預留結果；投影片 ID 不足時返回 None
+        """
+        presentation_part = prs.part
+        used_ids = [int(sldId.get('id')) for sldId in prs.slides._sldIdLst]
+        next_slide_id = max([MIN_SLIDE_ID - 1] + used_ids) + 1
+        if next_slide_id + count - 1 > MAX_SLIDE_ID:
+            return None
+        
+        partnames = self._reserve_numbered_names(
+            {str(part.partname) for part in presentation_part.package.iter_parts()},
+            SLIDE_PARTNAME_TEMPLATE, count)
+        rIds = self._reserve_numbered_names(set(presentation_part.rels.keys()), 'rId%d', count)
+        return [(partname, rId, next_slide_id + offset)
+                for offset, (partname, rId) in enumerate(zip(partnames, rIds))]
+    
+    def _create_slide(self, prs: 'Presentation', slide_layout, slot: Tuple[str, str, int],
+                      clone_placeholders: bool = True):
+        """以預留的部件名稱、關聯 ID 與投影片 ID 建立投影片（加在投影片清單最後）"""
+        from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+        from pptx.opc.packuri import PackURI
+        from pptx.parts.slide import SlidePart
+        
+        partname, rId, slide_id = slot
+        presentation_part = prs.part
+        slide_part = SlidePart.new(PackURI(partname), presentation_part.package, slide_layout.part)
+        self._add_relationship(presentation_part, rId, RT.SLIDE, slide_part)
+        prs.slides._sldIdLst._add_sldId(id=slide_id, rId=rId)
+        
+        slide = slide_part.slide
+        if clone_placeholders:
+            slide.shapes.clone_layout_placeholders(slide_layout)
+        return slide
+    
     def copy_slide_background(self, source_slide, target_slide) -> bool:
         """
         複製投影片背景
@@ -195,17 +378,29 @@ class SlideManager:
     
     def _copy_slide_completely(self, source_slide, target_slide):
         """完整複製投影片內容"""
+        if self.clone_mode == 'xml':
+            try:
+                self.xml_cloner.clone(source_slide, target_slide)
+            except SlideCloneError as e:
+                raise SlideOperationError(f"複製投影片失敗: {e}")
+            return
+        
         try:
             # 複製背景
             self.copy_slide_background(source_slide, target_slide)
             
+            # 目標投影片的占位符索引只建立一次（之後新增的形狀都不是占位符）
+            placeholder_index = self._build_placeholder_index(target_slide)
+            
             # 複製所有形狀
             for shape in source_slide.shapes:
                 try:
-                    if shape.is_placeholder:
-                        self._copy_placeholder_content(shape, target_slide)
-                    else:
-                        self._copy_non_placeholder_shape(shape, target_slide)
+                    with self.tracer.span('shape.copy', shape_id=shape.shape_id,
+                                          shape_type=self._shape_type_name(shape)):
+                        if shape.is_placeholder:
+                            self._copy_placeholder_content(shape, target_slide, placeholder_index)
+                        else:
+                            self._copy_non_placeholder_shape(shape, target_slide)
                 except Exception as e:
                     self.logger.warning(f"複製形狀失敗: {e}")
                     continue
@@ -214,32 +409,72 @@ class SlideManager:
             self.logger.error(f"完整複製投影片失敗: {e}")
             raise SlideOperationError(f"複製投影片失敗: {e}")
     
-    def _copy_placeholder_content(self, source_placeholder, target_slide):
-        """複製占位符內容"""
+    @staticmethod
+    def _shape_type_name(shape) -> Optional[str]:
+        """形狀類型名稱（用於追蹤屬性）"""
         try:
-            for target_shape in target_slide.shapes:
-                if (target_shape.is_placeholder and 
-                    hasattr(source_placeholder, 'placeholder_format') and
-                    hasattr(target_shape, 'placeholder_format') and
-                    target_shape.placeholder_format.idx == source_placeholder.placeholder_format.idx):
-                    
-                    # 複製文本內容
-                    if hasattr(source_placeholder, 'text') and hasattr(target_shape, 'text'):
-                        target_shape.text = source_placeholder.text
-                    
-                    # 複製文本框架內容
-                    if (hasattr(source_placeholder, 'text_frame') and 
-                        hasattr(target_shape, 'text_frame')):
-                        self.format_handler.copy_text_frame(
-                            source_placeholder.text_frame, target_shape.text_frame)
-                    
-                    break
+            return shape.shape_type.name if shape.shape_type is not None else None
+        except NotImplementedError:
+            return None
+    
+    def _clone_from_prototype(self, prototype: Dict[str, Any], target_slide):
+        """從預先準備的原型複製投影片"""
+        try:
+            self.xml_cloner.clone_prepared(prototype, target_slide)
+        except SlideCloneError as e:
+            raise SlideOperationError(f"複製投影片失敗: {e}")
+    
+    @staticmethod
+    def _build_placeholder_index(slide) -> Dict[int, Any]:
+        """
+        建立投影片的占位符索引
+        
+        Returns:
+            Dict[int, Any]: placeholder_format.idx → 占位符形狀（相同 idx 時保留第一個）
+        """
+        index: Dict[int, Any] = {}
+        for shape in slide.shapes:
+            if shape.is_placeholder:
+                index.setdefault(shape.placeholder_format.idx, shape)
+        return index
+    
+    def _copy_placeholder_content(self, source_placeholder, target_slide,
+                                  placeholder_index: Optional[Dict[int, Any]] = None):
+        """
+        複製占位符內容
+        
+        Args:
+            source_placeholder: 源占位符
+            target_slide: 目標投影片
+            placeholder_index: 目標投影片的占位符索引（None 則在此建立）
+        """
+        try:
+            if not hasattr(source_placeholder, 'placeholder_format'):
+                return
+            
+            if placeholder_index is None:
+                placeholder_index = self._build_placeholder_index(target_slide)
+            target_shape = placeholder_index.get(source_placeholder.placeholder_format.idx)
+            if target_shape is None:
+                return
+            
+            # 複製文本內容
+            if hasattr(source_placeholder, 'text') and hasattr(target_shape, 'text'):
+                target_shape.text = source_placeholder.text
+            
+            # 複製文本框架內容
+            if (hasattr(source_placeholder, 'text_frame') and 
+                hasattr(target_shape, 'text_frame')):
+                self.format_handler.copy_text_frame(
+                    source_placeholder.text_frame, target_shape.text_frame)
                     
         except Exception as e:
             self.logger.warning(f"複製占位符內容失敗: {e}")
     
     def _copy_non_placeholder_shape(self, source_shape, target_slide):
         """複製非占位符形狀"""
+        from pptx.enum.shapes import MSO_SHAPE_TYPE
+        
         try:
             left, top, width, height = source_shape.left, source_shape.top, source_shape.width, source_shape.height
             
@@ -251,10 +486,8 @@ class SlideManager:
                 
             elif source_shape.shape_type == MSO_SHAPE_TYPE.PICTURE:
                 try:
-                    image_blob = source_shape.image.blob
-                    image_stream = io.BytesIO(image_blob)
-                    new_picture = target_slide.shapes.add_picture(image_stream, left, top, width, height)
-                    self.format_handler.copy_shape_formatting(source_shape, new_picture)
+                    # 以新關聯引用模板既有的圖片部件，不重新讀取圖片內容
+                    self.xml_cloner.clone_shape(source_shape, target_slide)
                 except Exception as e:
                     self.logger.warning(f"複製圖片失敗: {e}")
                     
@@ -307,8 +540,16 @@ class SlideManager:
         except Exception as e:
             self.logger.warning(f"複製表格內容失敗: {e}")
     
-    def _replace_slide_content(self, slide, section: Dict[str, Any], template_slide=None):
+    def _replace_slide_content(self, slide, section: Dict[str, Any], template_slide=None,
+                               compiled_template=None, render_plan: Optional[Dict[str, Any]] = None,
+                               slide_plan: Optional[Dict[str, Any]] = None):
         """替換投影片內容"""
+        if render_plan is not None and slide_plan is not None:
+            # XML 複製保留了形狀 ID，可直接依規劃定位；模板投影片本身也保有原 ID
+            if self.clone_mode == 'xml' or slide_plan['source'] == SOURCE_TEMPLATE:
+                if self._apply_render_plan(slide, section, render_plan, slide_plan):
+                    return
+        
         try:
             # 查找文本框
             text_shapes = [shape for shape in slide.shapes 
@@ -316,10 +557,11 @@ class SlideManager:
             
             # 如果沒有文本框，從模板創建
             if not text_shapes and template_slide:
-                text_shapes = self._create_text_box_from_template(slide, template_slide)
+                text_shapes = self._create_text_box_from_template(slide, template_slide, compiled_template)
             
             if not text_shapes:
                 # 創建默認文本框
+                from pptx.util import Inches
                 new_textbox = slide.shapes.add_textbox(
                     Inches(0.5), Inches(1), Inches(9), Inches(6.5))
                 text_shapes.append(new_textbox)
@@ -341,14 +583,47 @@ class SlideManager:
             self.logger.error(f"替換投影片內容失敗: {e}")
             raise SlideOperationError(f"替換內容失敗: {e}")
     
-    def _create_text_box_from_template(self, slide, template_slide) -> List:
+    def _apply_render_plan(self, slide, section: Dict[str, Any], render_plan: Dict[str, Any],
+                           slide_plan: Dict[str, Any]) -> bool:
+        """
+        依渲染規劃替換內容
+        
+        Returns:
+            bool: 是否已處理（找不到主文本框時返回 False，改用一般流程）
+        """
+        main_shape_id = render_plan['main_shape_id']
+        if main_shape_id is None:
+            return False
+        
+        shapes_by_id = {shape.shape_id: shape for shape in slide.shapes}
+        main_text_shape = shapes_by_id.get(main_shape_id)
+        if main_text_shape is None:
+            return False
+        
+        try:
+            if slide_plan['content_mode'] == 'formatting':
+                self._replace_content_with_formatting(main_text_shape, section)
+            else:
+                self._replace_content_basic(main_text_shape, section)
+            
+            # 複製的投影片在準備原型時已清空；模板投影片需在此清空
+            if slide_plan['source'] == SOURCE_TEMPLATE:
+                for shape_id in RenderPlanner.get_shape_ids(render_plan, ACTION_BLANK):
+                    if shape_id in shapes_by_id:
+                        shapes_by_id[shape_id].text = ""
+            
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"替換投影片內容失敗: {e}")
+            raise SlideOperationError(f"替換內容失敗: {e}")
+    
+    def _create_text_box_from_template(self, slide, template_slide, compiled_template=None) -> List:
         """從模板創建文本框"""
         text_shapes = []
-        template_text_shapes = [shape for shape in template_slide.shapes 
-                               if hasattr(shape, 'text_frame') and hasattr(shape, 'text')]
+        template_shape = self._find_template_text_shape(template_slide, compiled_template)
         
-        if template_text_shapes:
-            template_shape = template_text_shapes[0]
+        if template_shape is not None:
             new_textbox = slide.shapes.add_textbox(
                 template_shape.left, template_shape.top, 
                 template_shape.width, template_shape.height)
@@ -366,6 +641,21 @@ class SlideManager:
         
         return text_shapes
     
+    def _find_template_text_shape(self, template_slide, compiled_template=None):
+        """查找模板的主文本框（已編譯模板直接以形狀 ID 定位）"""
+        if compiled_template is not None:
+            if compiled_template.main_text_shape is None:
+                return None
+            main_shape_id = compiled_template.main_text_shape['shape_id']
+            for shape in template_slide.shapes:
+                if shape.shape_id == main_shape_id:
+                    return shape
+        
+        for shape in template_slide.shapes:
+            if hasattr(shape, 'text_frame') and hasattr(shape, 'text'):
+                return shape
+        return None
+    
     def _replace_content_with_formatting(self, main_text_shape, section: Dict[str, Any]):
         """使用格式化數據替換內容"""
         try:
@@ -423,7 +713,34 @@ class SlideManager:
             self.logger.error(f"基本內容替換失敗: {e}")
             main_text_shape.text = f"錯誤: 無法顯示內容"
     
-    def _clear_existing_slides(self, prs: Presentation):
+    @staticmethod
+    def _reserve_numbered_names(used_names: set, template: str, count: int) -> List[str]:
+        """從 1 開始預留 count 個未使用的編號名稱"""
+        names = []
+        number = 1
+        while len(names) < count:
+            candidate = template % number
+            if candidate not in used_names:
+                names.append(candidate)
+            number += 1
+        return names
+    
+    @staticmethod
+    def _add_relationship(source_part, rId: str, reltype: str, target_part):
+        """以預留的 rId 加入關聯（不掃描既有關聯）"""
+        rels = source_part.rels
+        try:
+            from pptx.opc.constants import RELATIONSHIP_TARGET_MODE as RTM
+            from pptx.opc.package import _Relationship
+            rels._rels[rId] = _Relationship(
+                rels._base_uri, rId, reltype, RTM.INTERNAL, target_part)
+        except (ImportError, AttributeError, TypeError):
+            # python-pptx 內部結構不同時退回公開 API
+            actual_rId = source_part.relate_to(target_part, reltype)
+            if actual_rId != rId:
+                raise SlideOperationError(f"無法以預留的關聯 ID 加入投影片: {rId}")
+    
+    def _clear_existing_slides(self, prs: 'Presentation'):
         """清除現有投影片（保留第一張）"""
         try:
             for i in range(len(prs.slides) - 1, 0, -1):
@@ -450,18 +767,41 @@ class SlideAnalyzer:
         """
         self.logger = logger or logging.getLogger(__name__)
     
-    def analyze_presentation_structure(self, prs: Presentation) -> Dict[str, Any]:
+    def analyze_presentation_structure(self, prs: 'Presentation') -> Dict[str, Any]:
         """
         分析演示文稿結構
         
         Args:
             prs: PowerPoint 演示文稿物件
             
+        Returns:
+            Dict: 分析結果
+        """
+        from document_parser import PowerPointDocumentParser
+        
+        try:
+            slide_records = [PowerPointDocumentParser.build_slide_record(slide, slide_num)
+                             for slide_num, slide in enumerate(prs.slides, 1)]
+        except Exception as e:
+            self.logger.error(f"分析演示文稿結構失敗: {e}")
+            slide_records = []
+        
+        analysis = self.analyze_slide_records(slide_records)
+        analysis['total_slides'] = len(prs.slides)
+        return analysis
+    
+    def analyze_slide_records(self, slide_records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        由形狀記錄分析演示文稿結構（與文本提取共用同一次走訪）
+        
+        Args:
+            slide_records: PowerPointDocumentParser.read_slide_records 的結果
+            
         Returns:
             Dict: 分析結果
         """
         analysis = {
-            'total_slides': len(prs.slides),
+            'total_slides': len(slide_records),
             'layouts_used': set(),
             'text_shapes_count': 0,
             'image_shapes_count': 0,
@@ -471,8 +811,8 @@ class SlideAnalyzer:
         }
         
         try:
-            for slide_num, slide in enumerate(prs.slides, 1):
-                slide_analysis = self._analyze_single_slide(slide, slide_num)
+            for record in slide_records:
+                slide_analysis = self._analyze_single_slide(record)
                 analysis['slides_analysis'].append(slide_analysis)
                 
                 # 統計信息
@@ -481,18 +821,17 @@ class SlideAnalyzer:
                 analysis['image_shapes_count'] += slide_analysis['image_shapes']
                 analysis['table_shapes_count'] += slide_analysis['table_shapes']
             
-            analysis['layouts_used'] = list(analysis['layouts_used'])
-            
         except Exception as e:
             self.logger.error(f"分析演示文稿結構失敗: {e}")
         
+        analysis['layouts_used'] = list(analysis['layouts_used'])
         return analysis
     
-    def _analyze_single_slide(self, slide, slide_num: int) -> Dict[str, Any]:
+    def _analyze_single_slide(self, slide_record: Dict[str, Any]) -> Dict[str, Any]:
         """分析單張投影片"""
         analysis = {
-            'slide_number': slide_num,
-            'layout_name': slide.slide_layout.name if slide.slide_layout else 'Unknown',
+            'slide_number': slide_record['slide_number'],
+            'layout_name': slide_record['layout_name'],
             'text_shapes': 0,
             'image_shapes': 0,
             'table_shapes': 0,
@@ -501,24 +840,26 @@ class SlideAnalyzer:
             'estimated_word_count': 0
         }
         
+        from pptx.enum.shapes import MSO_SHAPE_TYPE
+        
         word_count = 0
         
-        for shape in slide.shapes:
-            if hasattr(shape, 'text_frame') and hasattr(shape, 'text'):
+        for shape in slide_record['shapes']:
+            if shape['has_text_frame'] and shape['text'] is not None:
                 analysis['text_shapes'] += 1
-                text_content = shape.text.strip()
+                text_content = shape['text'].strip()
                 if text_content:
                     word_count += len(text_content.split())
                     if not analysis['has_title'] and len(text_content) < 100:
                         analysis['has_title'] = True
                         
-            elif hasattr(shape, 'shape_type'):
-                if shape.shape_type == MSO_SHAPE_TYPE.PICTURE:
+            elif shape['has_shape_type']:
+                if shape['shape_type'] == MSO_SHAPE_TYPE.PICTURE:
                     analysis['image_shapes'] += 1
-                elif shape.shape_type == MSO_SHAPE_TYPE.TABLE:
+                elif shape['shape_type'] == MSO_SHAPE_TYPE.TABLE:
                     analysis['table_shapes'] += 1
                 else:
                     analysis['other_shapes'] += 1
         
         analysis['estimated_word_count'] = word_count
-        return analysis
\ No newline at end of file
+        return analysis
@@ -0,0 +1,288 @@
+"""
+模板編譯模組 - 將 PowerPoint 模板預先分析並快取於程序內
+每個模板只載入與分析一次，批次與服務工作負載可重複使用編譯結果
+"""
+
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional
+import copy
+import hashlib
+import io
+import logging
+import os
+import threading
+from format_handler import FormatHandler
+from document_parser import PowerPointDocumentParser
+from logger_config import DocumentError
+from package_writer import TemplatePackage, save_presentation
+from document_io import FORMAT_PPTX, detect_format, load_document_data
+
+
+class CompiledTemplate:
+    """編譯後的模板 - 保存原型投影片與其分析結果"""
+
+    def __init__(self, template_path: str, blob: bytes, content_hash: str,
+                 mtime_ns: int, size: int):
+        """
+        初始化編譯後的模板
+
+        Args:
+            template_path: 模板檔案的絕對路徑（記憶體中的模板為顯示名稱）
+            blob: 模板檔案內容
+            content_hash: 內容雜湊（SHA-256）
+            mtime_ns: 編譯時的修改時間（奈秒）
+            size: 檔案大小
+        """
+        self.template_path = template_path
+        self.blob = blob
+        self.content_hash = content_hash
+        self.mtime_ns = mtime_ns
+        self.size = size
+
+        self.slide_count = 0
+        self.prototype_xml = b''
+        self.relationships: List[Dict[str, Any]] = []
+        self.text_shape_ids: List[int] = []
+        self.main_text_shape: Optional[Dict[str, Any]] = None
+        self.run_defaults: Dict[str, Any] = {'rPr_xml': None, 'formats': None}
+        self.template_analysis: Dict[str, Any] = {}
+        self.package: Optional[TemplatePackage] = None
+
+    def load_presentation(self):
+        """
+        從快取的模板內容建立新的演示文稿（不需再次讀取磁碟）
+
+        Returns:
+            Presentation: 可修改的演示文稿物件
+        """
+        from pptx import Presentation
+        return Presentation(io.BytesIO(self.blob))
+
+    def save_presentation(self, prs, output, logger: Optional[logging.Logger] = None) -> Dict[str, int]:
+        """
+        保存由此模板載入的演示文稿，未變更的模板部件直接複製壓縮資料
+
+        Args:
+            prs: load_presentation() 建立的演示文稿
+            output: 輸出路徑或可寫入的二進位檔案物件
+            logger: 日誌記錄器
+
+        Returns:
+            Dict: 直接複製與重新壓縮的部件數與位元組數
+        """
+        return save_presentation(prs, output, self.package, logger)
+
+    def get_template_analysis(self) -> Dict[str, Any]:
+        """獲取模板分析結果的副本"""
+        return copy.deepcopy(self.template_analysis)
+
+    def is_current(self, mtime_ns: int, size: int) -> bool:
+        """檔案狀態是否與編譯時相同"""
+        return self.mtime_ns == mtime_ns and self.size == size
+
+
+class TemplateCompiler:
+    """模板編譯器 - 以程序共用的 LRU 快取避免重複載入與分析模板"""
+
+    _cache: "OrderedDict[str, CompiledTemplate]" = OrderedDict()
+    _cache_lock = threading.Lock()
+
+    # 快取上限（最近最少使用者先淘汰），避免上傳服務中每個不同模板都常駐記憶體
+    max_cache_entries = 16
+    max_cache_bytes = 64 * 1024 * 1024
+
+    def __init__(self, ppt_parser: PowerPointDocumentParser, format_handler: FormatHandler,
+                 logger: Optional[logging.Logger] = None):
+        """
+        初始化模板編譯器
+
+        Args:
+            ppt_parser: PowerPoint 解析器（用於分析模板投影片）
+            format_handler: 格式處理器（用於提取文本格式）
+            logger: 日誌記錄器
+        """
+        self.ppt_parser = ppt_parser
+        self.format_handler = format_handler
+        self.logger = logger or logging.getLogger(__name__)
+
+    def compile(self, template_file: str) -> CompiledTemplate:
+        """
+        編譯模板（已快取且檔案未變更時直接返回快取結果）
+
+        Args:
+            template_file: PowerPoint 模板路徑
+
+        Returns:
+            CompiledTemplate: 編譯後的模板
+
+        Raises:
+            DocumentError: 模板不存在或無法載入時拋出
+        """
+        if not os.path.exists(template_file):
+            raise DocumentError(f"模板檔案不存在: {template_file}", "TEMPLATE_NOT_FOUND")
+
+        template_path = os.path.abspath(template_file)
+        stat = os.stat(template_path)
+
+        cached = self._cache_get(template_path)
+        if cached is not None and cached.is_current(stat.st_mtime_ns, stat.st_size):
+            self.logger.debug(f"使用已編譯的模板: {template_file}")
+            return cached
+
+        with open(template_path, 'rb') as f:
+            blob = f.read()
+        content_hash = hashlib.sha256(blob).hexdigest()
+
+        # 修改時間變了但內容相同（例如被複製或 touch），沿用編譯結果
+        if cached is not None and cached.content_hash == content_hash:
+            cached.mtime_ns, cached.size = stat.st_mtime_ns, stat.st_size
+            return cached
+
+        self._check_format(blob, template_file)
+        compiled = CompiledTemplate(template_path, blob, content_hash,
+                                    stat.st_mtime_ns, stat.st_size)
+        self._compile_prototype(compiled)
+
+        self._cache_put(template_path, compiled)
+
+        self.logger.info(f"模板已編譯: {template_file} ({compiled.template_analysis.get('summary', '')})")
+        return compiled
+
+    def compile_data(self, source, name: Optional[str] = None) -> CompiledTemplate:
+        """
+        編譯記憶體中的模板（相同內容的模板只編譯一次）
+
+        Args:
+            source: DocumentData、bytes / memoryview 或可讀取的二進位檔案物件
+            name: 顯示名稱
+
+        Returns:
+            CompiledTemplate: 編譯後的模板
+
+        Raises:
+            DocumentError: 內容不是 PowerPoint 演示文稿或無法載入時拋出
+        """
+        document = load_document_data(source, name)
+        content_hash = hashlib.sha256(document.data).hexdigest()
+        # 以內容雜湊為快取鍵，不會與檔案路徑衝突
+        cache_key = f"sha256:{content_hash}"
+
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            self.logger.debug(f"使用已編譯的模板: {document.name}")
+            return cached
+
+        self._check_format(document.data, document.name, document.format)
+        compiled = CompiledTemplate(document.name, document.data, content_hash, 0, len(document.data))
+        self._compile_prototype(compiled)
+
+        self._cache_put(cache_key, compiled)
+
+        self.logger.info(f"模板已編譯: {document.name} ({compiled.template_analysis.get('summary', '')})")
+        return compiled
+
+    @classmethod
+    def _cache_get(cls, key: str) -> Optional[CompiledTemplate]:
+        """讀取快取並標記為最近使用"""
+        with cls._cache_lock:
+            compiled = cls._cache.get(key)
+            if compiled is not None:
+                cls._cache.move_to_end(key)
+            return compiled
+
+    @classmethod
+    def _cache_put(cls, key: str, compiled: CompiledTemplate):
+        """寫入快取，超過項目數或總位元組上限時淘汰最久未使用的模板"""
+        with cls._cache_lock:
+            cls._cache[key] = compiled
+            cls._cache.move_to_end(key)
+            total_bytes = sum(len(entry.blob) for entry in cls._cache.values())
+            while len(cls._cache) > 1 and (len(cls._cache) > cls.max_cache_entries
+                                           or total_bytes > cls.max_cache_bytes):
+                _, evicted = cls._cache.popitem(last=False)
+                total_bytes -= len(evicted.blob)
+
+    @staticmethod
+    def _check_format(blob: bytes, name: str, document_format: Optional[str] = None):
+        """確認內容為 PowerPoint 演示文稿（依內容判斷，不檢查副檔名）"""
+        if (document_format or detect_format(blob)) != FORMAT_PPTX:
+            raise DocumentError(f"不支援的模板格式: {name}", "UNSUPPORTED_TEMPLATE_FORMAT")
+
+    @classmethod
+    def clear_cache(cls):
+        """清除程序共用的模板快取"""
+        with cls._cache_lock:
+            cls._cache.clear()
+
+    @classmethod
+    def get_cached_templates(cls) -> List[str]:
+        """獲取已快取的模板路徑（記憶體中的模板為 sha256:<內容雜湊>）"""
+        with cls._cache_lock:
+            return list(cls._cache.keys())
+
+    def _compile_prototype(self, compiled: CompiledTemplate):
+        """載入模板並提取原型投影片資訊"""
+        from lxml import etree
+        
+        try:
+            prs = compiled.load_presentation()
+        except Exception as e:
+            raise DocumentError(f"載入模板失敗: {str(e)}", "TEMPLATE_LOAD_ERROR")
+
+        if len(prs.slides) == 0:
+            raise DocumentError("模板中沒有投影片", "EMPTY_TEMPLATE")
+
+        # 指紋必須在分析前記錄（分析時讀取 text_frame 可能為形狀加入 txBody）
+        try:
+            compiled.package = TemplatePackage.from_presentation(compiled.blob, prs)
+        except Exception as e:
+            self.logger.warning(f"無法建立模板部件指紋，保存時將重新壓縮所有部件: {e}")
+
+        compiled.slide_count = len(prs.slides)
+        template_slide = prs.slides[0]
+
+        compiled.prototype_xml = etree.tostring(template_slide._element)
+        compiled.relationships = self._collect_relationships(template_slide)
+        compiled.template_analysis = self.ppt_parser.analyze_template_slide(template_slide)
+
+        text_shapes = [shape for shape in template_slide.shapes
+                       if hasattr(shape, 'text_frame') and hasattr(shape, 'text')]
+        compiled.text_shape_ids = [shape.shape_id for shape in text_shapes]
+
+        if text_shapes:
+            main_shape = text_shapes[0]
+            compiled.main_text_shape = {
+                'shape_id': main_shape.shape_id,
+                'name': main_shape.name,
+                'left': main_shape.left,
+                'top': main_shape.top,
+                'width': main_shape.width,
+                'height': main_shape.height
+            }
+            compiled.run_defaults = {
+                'rPr_xml': self._first_run_properties(main_shape),
+                'formats': self.format_handler.extract_ppt_text_formatting(main_shape)
+            }
+
+    def _collect_relationships(self, slide) -> List[Dict[str, Any]]:
+        """收集投影片的關聯（圖片、超連結、版面配置等）"""
+        relationships = []
+        for rId, rel in slide.part.rels.items():
+            relationships.append({
+                'rId': rId,
+                'reltype': rel.reltype,
+                'is_external': rel.is_external,
+                'target_ref': rel.target_ref
+            })
+        return relationships
+
+    def _first_run_properties(self, text_shape) -> Optional[bytes]:
+        """提取主文本框第一個運行的 a:rPr"""
+        from lxml import etree
+        from pptx.oxml.ns import qn
+        
+        for paragraph in text_shape.text_frame.paragraphs:
+            for run in paragraph.runs:
+                rPr = run._r.find(qn('a:rPr'))
+                return etree.tostring(rPr) if rPr is not None else None
+        return None
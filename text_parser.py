@@ -0,0 +1,220 @@
+"""
+純文字解析模組 - 串流讀取以 ◇ 分項的純文字檔（例如 清晨箴言/YYYYMMDD.txt）
+每個 ◇ 項目為一個章節，或依字數合併多個項目，輸出與 Word 解析相同的章節結構
+"""
+
+from typing import Dict, List, Any, Optional, Iterable, Iterator
+from datetime import datetime
+import io
+import logging
+import os
+from document_parser import DocumentParseError
+from document_io import FORMAT_TEXT, load_document_data
+
+
+BULLET = '◇'
+TEXT_ENCODING = 'utf-8-sig'
+
+
+class ProverbTextParser:
+    """◇ 分項純文字解析器 - 逐行讀取，不使用 python-docx"""
+
+    def __init__(self, max_chars_per_slide: Optional[int] = None,
+                 logger: Optional[logging.Logger] = None):
+        """
+        初始化純文字解析器
+
+        Args:
+            max_chars_per_slide: 每張投影片的字數上限（None 則每個 ◇ 項目一張投影片；
+                設定時依序合併項目，直到再加入下一個項目會超過上限）
+            logger: 日誌記錄器
+        """
+        self.max_chars_per_slide = max_chars_per_slide
+        self.logger = logger or logging.getLogger(__name__)
+
+    def parse_document(self, file_path: str) -> Dict[str, Any]:
+        """
+        解析純文字檔
+
+        Args:
+            file_path: 純文字檔路徑
+
+        Returns:
+            Dict: 與 WordDocumentParser.parse_document 相同鍵的解析結果
+
+        Raises:
+            DocumentParseError: 解析失敗時拋出
+        """
+        return self._build_result(file_path, list(self.iter_sections(file_path)))
+
+    def parse_data(self, source, name: Optional[str] = None) -> Dict[str, Any]:
+        """
+        解析記憶體中的純文字內容（不需寫入暫存檔）
+
+        Args:
+            source: DocumentData、bytes / memoryview 或可讀取的二進位檔案物件
+            name: 顯示名稱（作為結果的 file_path，YYYYMMDD 形式時也用於判斷日期）
+
+        Returns:
+            Dict: 與 parse_document 相同的結果
+
+        Raises:
+            DocumentParseError: 內容不是 UTF-8 純文字時拋出
+        """
+        document = load_document_data(source, name)
+        if document.format != FORMAT_TEXT:
+            raise DocumentParseError(f"無效的純文字檔: {document.name}")
+        try:
+            text = document.data.decode(TEXT_ENCODING)
+        except UnicodeDecodeError as e:
+            self.logger.error(f"讀取純文字檔失敗: {e}")
+            raise DocumentParseError(f"讀取純文字檔失敗: {e}")
+
+        sections = list(self._group_items(self._iter_line_items(io.StringIO(text))))
+        return self._build_result(document.name, sections)
+
+    def _build_result(self, file_path: str, sections: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """組成與 WordDocumentParser.parse_document 相同鍵的解析結果"""
+        text = '\n'.join(section['text_only'] for section in sections)
+        return {
+            'file_path': file_path,
+            'basic_content': {'paragraphs': [], 'tables': [], 'text': text},
+            'sections': sections,
+            'metadata': {'title': os.path.splitext(os.path.basename(file_path))[0],
+                         'date': self.parse_date(file_path)},
+            'total_sections': len(sections),
+            'success': True,
+            'error': None
+        }
+
+    def iter_sections(self, file_path: str) -> Iterator[Dict[str, Any]]:
+        """
+        逐一產生章節（依設定的字數上限合併項目）
+
+        Args:
+            file_path: 純文字檔路徑
+
+        Yields:
+            Dict: 章節資料
+
+        Raises:
+            DocumentParseError: 檔案不存在或無法讀取時拋出
+        """
+        return self._group_items(self.iter_items(file_path))
+
+    def _group_items(self, items: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """依設定的字數上限合併項目"""
+        group: List[Dict[str, Any]] = []
+        group_chars = 0
+
+        for item in items:
+            item_chars = sum(len(line) for line in item['content'])
+            if group and (self.max_chars_per_slide is None or
+                          group_chars + item_chars > self.max_chars_per_slide):
+                yield self._merge(group)
+                group, group_chars = [], 0
+            group.append(item)
+            group_chars += item_chars
+
+        if group:
+            yield self._merge(group)
+
+    def iter_items(self, file_path: str) -> Iterator[Dict[str, Any]]:
+        """
+        逐一產生 ◇ 項目（第一個 ◇ 之前的文字為編號 0 的前言）
+
+        Args:
+            file_path: 純文字檔路徑
+
+        Yields:
+            Dict: 項目（與章節相同的結構）
+
+        Raises:
+            DocumentParseError: 檔案不存在或無法讀取時拋出
+        """
+        if not os.path.isfile(file_path):
+            raise DocumentParseError(f"純文字檔不存在: {file_path}")
+
+        try:
+            with open(file_path, 'r', encoding=TEXT_ENCODING) as f:
+                yield from self._iter_line_items(f)
+        except (OSError, UnicodeDecodeError) as e:
+            self.logger.error(f"讀取純文字檔失敗: {e}")
+            raise DocumentParseError(f"讀取純文字檔失敗: {e}")
+
+    def _iter_line_items(self, lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """從文字行逐一產生 ◇ 項目"""
+        current = None
+        number = 0
+
+        for raw_line in lines:
+            line = raw_line.strip()
+            if not line:
+                continue
+
+            if line.startswith(BULLET):
+                if current is not None:
+                    yield current
+                number += 1
+                current = self._new_item(number, line[len(BULLET):].strip(), line)
+            elif current is None:
+                current = self._new_item(0, '前言', line)
+            else:
+                current['content'].append(line)
+                current['formatting'].append(self._plain_formatting(line))
+                current['text_only'] += '\n' + line
+
+        if current is not None:
+            yield current
+
+    @staticmethod
+    def parse_date(file_path: str) -> Optional[str]:
+        """
+        從 YYYYMMDD 檔名取得日期
+
+        Returns:
+            Optional[str]: ISO 日期字串（檔名不是日期時返回 None）
+        """
+        stem = os.path.splitext(os.path.basename(file_path))[0]
+        try:
+            return datetime.strptime(stem, '%Y%m%d').date().isoformat()
+        except ValueError:
+            return None
+
+    def _new_item(self, number: int, title: str, line: str) -> Dict[str, Any]:
+        """建立項目"""
+        return {
+            'number': number,
+            'title': title,
+            'content': [line],
+            'text_only': line,
+            'formatting': [self._plain_formatting(line)]
+        }
+
+    @staticmethod
+    def _plain_formatting(line: str) -> List[Dict[str, Any]]:
+        """無直接格式的運行（沿用模板文字格式）"""
+        return [{
+            'text': line,
+            'font_name': None,
+            'font_size': None,
+            'font_bold': None,
+            'font_italic': None,
+            'font_underline': None,
+            'font_color': None
+        }]
+
+    @staticmethod
+    def _merge(items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """合併多個項目為一個章節"""
+        if len(items) == 1:
+            return items[0]
+
+        first = items[0]
+        return {
+            'number': first['number'],
+            'title': first['title'],
+            'content': [line for item in items for line in item['content']],
+            'text_only': '\n'.join(item['text_only'] for item in items),
+            'formatting': [runs for item in items for runs in item['formatting']]
+        }
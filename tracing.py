@@ -0,0 +1,235 @@
+"""
+追蹤模組 - 階層式計時區段（span）與 Chrome trace-event 匯出
+以 perf_counter_ns 計時，區段依執行緒巢狀，記錄程序與執行緒 ID 及自訂屬性
+"""
+
+from typing import Dict, List, Any, Optional
+from collections import deque
+from contextlib import contextmanager
+import itertools
+import json
+import os
+import threading
+import time
+
+
+TRACE_CATEGORY = 'document_converter'
+
+
+class Span:
+    """計時區段"""
+
+    __slots__ = ('name', 'span_id', 'parent_id', 'start_ns', 'end_ns',
+                 'pid', 'tid', 'attributes')
+
+    def __init__(self, name: str, span_id: int, parent_id: Optional[int],
+                 attributes: Optional[Dict[str, Any]] = None):
+        """
+        初始化計時區段
+
+        Args:
+            name: 區段名稱
+            span_id: 區段 ID
+            parent_id: 父區段 ID（最外層為 None）
+            attributes: 區段屬性（例如段落編號、形狀類型）
+        """
+        self.name = name
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.pid = os.getpid()
+        self.tid = threading.get_ident()
+        self.attributes = attributes or {}
+        self.end_ns: Optional[int] = None
+        self.start_ns = time.perf_counter_ns()
+
+    @property
+    def duration(self) -> float:
+        """耗時（秒，未結束時計算到目前為止）"""
+        end_ns = self.end_ns if self.end_ns is not None else time.perf_counter_ns()
+        return (end_ns - self.start_ns) / 1e9
+
+    def set_attribute(self, key: str, value: Any):
+        """設置區段屬性"""
+        self.attributes[key] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """轉為純資料"""
+        return {
+            'name': self.name,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'start_ns': self.start_ns,
+            'end_ns': self.end_ns,
+            'duration': self.duration,
+            'pid': self.pid,
+            'tid': self.tid,
+            'attributes': dict(self.attributes)
+        }
+
+
+class Tracer:
+    """區段追蹤器 - 每個執行緒各自維護父子堆疊，完成的區段集中保存"""
+
+    def __init__(self, enabled: bool = True, max_spans: int = 100000):
+        """
+        初始化追蹤器
+
+        Args:
+            enabled: 是否記錄區段（停用時 span 幾乎沒有額外成本）
+            max_spans: 保留的已完成區段數上限（超過則捨棄最舊的）
+        """
+        self.enabled = enabled
+        self.max_spans = max_spans
+        # 達上限時 deque 自動捨棄最舊的區段，不需搬移整個列表
+        self._spans: deque = deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._ids = itertools.count(1)
+
+    def start_span(self, name: str, **attributes) -> Span:
+        """
+        開始區段（成為目前執行緒的子區段）
+
+        Args:
+            name: 區段名稱
+            **attributes: 區段屬性
+
+        Returns:
+            Span: 已開始的區段
+        """
+        stack = self._stack()
+        parent_id = stack[-1].span_id if stack else None
+        span = Span(name, next(self._ids), parent_id, attributes)
+        stack.append(span)
+        return span
+
+    def end_span(self, span: Span) -> float:
+        """
+        結束區段
+
+        Args:
+            span: start_span 返回的區段
+
+        Returns:
+            float: 耗時（秒）
+        """
+        span.end_ns = time.perf_counter_ns()
+
+        stack = self._stack()
+        if span in stack:
+            # 一併移除未正常結束的子區段
+            del stack[stack.index(span):]
+
+        if self.enabled:
+            with self._lock:
+                self._spans.append(span)
+
+        return span.duration
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """
+        以 with 陳述式記錄區段
+
+        Args:
+            name: 區段名稱
+            **attributes: 區段屬性
+
+        Yields:
+            Optional[Span]: 區段（停用時為 None）
+        """
+        if not self.enabled:
+            yield None
+            return
+
+        span = self.start_span(name, **attributes)
+        try:
+            yield span
+        finally:
+            self.end_span(span)
+
+    def current_span(self) -> Optional[Span]:
+        """目前執行緒最內層的區段"""
+        stack = self._stack()
+        return stack[-1] if stack else None
+
+    def get_spans(self) -> List[Span]:
+        """獲取已完成的區段（依開始時間排序）"""
+        with self._lock:
+            spans = list(self._spans)
+        return sorted(spans, key=lambda span: span.start_ns)
+
+    def clear(self):
+        """清除已完成的區段"""
+        with self._lock:
+            self._spans.clear()
+
+    def summarize(self) -> Dict[str, Dict[str, Any]]:
+        """
+        依名稱彙總已完成的區段
+
+        Returns:
+            Dict: 名稱 -> {'count', 'total', 'max'}（秒）
+        """
+        summary: Dict[str, Dict[str, Any]] = {}
+        for span in self.get_spans():
+            entry = summary.setdefault(span.name, {'count': 0, 'total': 0.0, 'max': 0.0})
+            duration = span.duration
+            entry['count'] += 1
+            entry['total'] += duration
+            entry['max'] = max(entry['max'], duration)
+        return summary
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """
+        轉為 Chrome trace-event 格式（chrome://tracing 或 Perfetto 可開啟）
+
+        Returns:
+            Dict: {'traceEvents': [...], 'displayTimeUnit': 'ms'}
+        """
+        events = []
+        for span in self.get_spans():
+            args = {key: self._json_value(value) for key, value in span.attributes.items()}
+            args.update({'span_id': span.span_id, 'parent_id': span.parent_id})
+            events.append({
+                'name': span.name,
+                'cat': TRACE_CATEGORY,
+                'ph': 'X',
+                'ts': span.start_ns / 1000.0,
+                'dur': (span.end_ns - span.start_ns) / 1000.0,
+                'pid': span.pid,
+                'tid': span.tid,
+                'args': args
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def export_chrome_trace(self, file_path: str) -> str:
+        """
+        匯出 Chrome trace-event JSON 檔案
+
+        Args:
+            file_path: 輸出檔案路徑
+
+        Returns:
+            str: 輸出檔案路徑
+        """
+        directory = os.path.dirname(file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_chrome_trace(), f, ensure_ascii=False)
+        return file_path
+
+    def _stack(self) -> List[Span]:
+        """目前執行緒的區段堆疊"""
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @staticmethod
+    def _json_value(value: Any) -> Any:
+        """屬性值轉為可序列化的型別"""
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+        return str(value)
@@ -600,12 +600,13 @@ def copy_slide_completely(source_slide, target_slide):
         # 1. 复制幻灯片背景
         copy_slide_background(source_slide, target_slide)
         
-        # 2. 复制所有形状
+        # 2. 复制所有形状（目标幻灯片的占位符索引只建立一次）
+        placeholder_index = build_placeholder_index(target_slide)
         for shape in source_slide.shapes:
             try:
                 if shape.is_placeholder:
                     # 处理占位符
-                    copy_placeholder_content(shape, target_slide)
+                    copy_placeholder_content(shape, target_slide, placeholder_index)
                 else:
                     # 处理非占位符形状
                     copy_non_placeholder_shape(shape, target_slide)
@@ -713,35 +714,54 @@ def copy_slide_background(source_slide, target_slide):
         print(f"   ❌ 複製幻燈片背景時出錯: {str(e)}")
 
 
-def copy_placeholder_content(source_placeholder, target_slide):
+def build_placeholder_index(slide) -> Dict[int, object]:
+    """
+    建立幻灯片的占位符索引
+    
+    Args:
+        slide: 幻灯片
+        
+    Returns:
+        Dict[int, object]: placeholder_format.idx 对应的占位符（相同 idx 时保留第一个）
+    """
+    index = {}
+    for shape in slide.shapes:
+        if shape.is_placeholder:
+            index.setdefault(shape.placeholder_format.idx, shape)
+    return index
+
+
+def copy_placeholder_content(source_placeholder, target_slide, placeholder_index: Optional[Dict[int, object]] = None):
     """
     复制占位符内容
     
     Args:
         source_placeholder: 源占位符
         target_slide: 目标幻灯片
+        placeholder_index: 目标幻灯片的占位符索引（None 则在此建立）
     """
     try:
+        if not hasattr(source_placeholder, 'placeholder_format'):
+            return
+        
         # 找到目标幻灯片中对应的占位符
-        for target_shape in target_slide.shapes:
-            if (target_shape.is_placeholder and 
-                hasattr(source_placeholder, 'placeholder_format') and
-                hasattr(target_shape, 'placeholder_format') and
-                target_shape.placeholder_format.idx == source_placeholder.placeholder_format.idx):
-                
-                # 复制文本内容
-                if hasattr(source_placeholder, 'text') and hasattr(target_shape, 'text'):
-                    target_shape.text = source_placeholder.text
-                
-                # 复制文本框架内容（包括格式）
-                if hasattr(source_placeholder, 'text_frame') and hasattr(target_shape, 'text_frame'):
-                    copy_text_frame(source_placeholder.text_frame, target_shape.text_frame)
-                
-                # 复制表格内容
-                if hasattr(source_placeholder, 'table') and source_placeholder.has_table:
-                    copy_table_content(source_placeholder.table, target_shape)
-                
-                break
+        if placeholder_index is None:
+            placeholder_index = build_placeholder_index(target_slide)
+        target_shape = placeholder_index.get(source_placeholder.placeholder_format.idx)
+        if target_shape is None:
+            return
+        
+        # 复制文本内容
+        if hasattr(source_placeholder, 'text') and hasattr(target_shape, 'text'):
+            target_shape.text = source_placeholder.text
+        
+        # 复制文本框架内容（包括格式）
+        if hasattr(source_placeholder, 'text_frame') and hasattr(target_shape, 'text_frame'):
+            copy_text_frame(source_placeholder.text_frame, target_shape.text_frame)
+        
+        # 复制表格内容
+        if hasattr(source_placeholder, 'table') and source_placeholder.has_table:
+            copy_table_content(source_placeholder.table, target_shape)
     except Exception as e:
         print(f"复制占位符内容时出错: {str(e)}")
 
@@ -1437,7 +1457,8 @@ def copy_slide_with_enhanced_formatting(source_slide, target_slide, template_ana
         # 1. 複製背景（包括背景圖片）
         copy_slide_background(source_slide, target_slide)
         
-        # 2. 按順序複製形狀（保持Z順序）
+        # 2. 按順序複製形狀（保持Z順序，目標幻燈片的占位符索引只建立一次）
+        placeholder_index = build_placeholder_index(target_slide)
         for i, shape in enumerate(source_slide.shapes):
             try:
                 shape_info = f"形狀{i+1}"
@@ -1448,7 +1469,7 @@ def copy_slide_with_enhanced_formatting(source_slide, target_slide, template_ana
                 
                 if shape.is_placeholder:
                     # 處理占位符
-                    copy_placeholder_content(shape, target_slide)
+                    copy_placeholder_content(shape, target_slide, placeholder_index)
                 else:
                     # 處理非占位符形狀
                     copy_non_placeholder_shape(shape, target_slide)